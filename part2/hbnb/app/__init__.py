@@ -22,11 +22,16 @@ def create_app(config_name="default"):
     """
     app = Flask(__name__)
 
-    from app.services import facade
-    facade.reset()
-
     app.config.from_object(config[config_name])
 
+    from app.services import facade
+    facade.reset(
+        thread_safe=app.config.get('THREAD_SAFE_REPOSITORIES', False),
+        persistence_dir=app.config.get('PERSISTENCE_DIR'),
+        fsync_interval=app.config.get('PERSISTENCE_FSYNC_INTERVAL', 1.0),
+        snapshot_interval=app.config.get('PERSISTENCE_SNAPSHOT_INTERVAL', 300),
+    )
+
     # Register API Blueprint
     app.register_blueprint(api_bp)
 
@@ -6,6 +6,7 @@ in the HBnB application. It provides CRUD operations (excluding DELETE)
 and integrates with the business logic layer via the HBnBFacade.
 """
 
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 
@@ -77,20 +78,52 @@ class PlaceList(Resource):
             'owner_id': place.owner.id
         }, 201
 
+    @api.doc(params={
+        'min_price': 'Lowest price per night',
+        'max_price': 'Highest price per night',
+        'limit': 'Maximum number of places (with a price filter)'
+    })
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid filter')
     def get(self):
-        """Retrieve a list of all places."""
-        places = facade.get_all_places()
+        """
+        Retrieve a list of all places.
+
+        With min_price and/or max_price, only the places within the
+        price range are returned, cheapest first.
+        """
+        try:
+            min_price = _get_number_arg('min_price', float)
+            max_price = _get_number_arg('max_price', float)
+            limit = _get_number_arg('limit', int)
+            if min_price is None and max_price is None:
+                places = facade.get_all_places()
+            else:
+                places = facade.get_places_by_price(min_price, max_price, limit)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return [
             {
                 'id': p.id,
                 'title': p.title,
+                'price': p.price,
                 'latitude': p.latitude,
                 'longitude': p.longitude
             }
             for p in places
         ], 200
 
+
+def _get_number_arg(name, cast):
+    """Read an optional numeric query parameter (ValueError if invalid)."""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
 # -----------------------------
 # Single place endpoints
 # -----------------------------
@@ -13,6 +13,8 @@ class Amenity(BaseModel):
         places (list): Places that include this amenity.
     """
 
+    __slots__ = ("name", "description", "places")
+
     def __init__(self, name, description=""):
         """
         Initialize an Amenity instance.
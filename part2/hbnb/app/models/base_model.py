@@ -1,17 +1,86 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch(value):
+    """Convert an aware datetime to integer microseconds since the epoch."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch(value):
+    """Convert integer microseconds since the epoch to a UTC datetime."""
+    return _EPOCH + timedelta(microseconds=value)
 
 
 class BaseModel:
     """
     Base class for all models.
     Handles common attributes: id, created_at, updated_at.
+
+    Models are stored compactly, since the in-memory repositories may
+    hold millions of them: every model declares __slots__ (no
+    per-instance __dict__), and timestamps are kept as integer
+    microseconds since the epoch (created_at and updated_at still read
+    and accept datetimes). Ids are left as UUID4 strings: the
+    repositories key their storage and indexes by that same string,
+    so it is stored once.
     """
 
+    __slots__ = ("id", "_created_at", "_updated_at", "_repositories")
+
     def __init__(self):
+        # Repositories to notify of attribute changes (see watch())
+        object.__setattr__(self, "_repositories", ())
         self.id = str(uuid.uuid4())
-        self.created_at = datetime.now(timezone.utc)
-        self.updated_at = datetime.now(timezone.utc)
+        now = to_epoch(datetime.now(timezone.utc))
+        self._created_at = now
+        self._updated_at = now
+
+    def __setattr__(self, name, value):
+        """
+        Set the attribute, then let the repositories holding this
+        object and watching the attribute refresh their indexes
+        (property setters included).
+        """
+        object.__setattr__(self, name, value)
+        for repository in getattr(self, "_repositories", ()):
+            if repository.watches(name):
+                repository.reindex(self, name)
+
+    @property
+    def created_at(self):
+        """Creation time (UTC datetime)."""
+        return from_epoch(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = to_epoch(value)
+
+    @property
+    def updated_at(self):
+        """Last modification time (UTC datetime)."""
+        return from_epoch(self._updated_at)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated_at = to_epoch(value)
+
+    def watch(self, repository):
+        """Register a repository to notify when an attribute changes."""
+        repositories = getattr(self, "_repositories", ())
+        if repository not in repositories:
+            object.__setattr__(self, "_repositories",
+                               (*repositories, repository))
+
+    def unwatch(self, repository):
+        """Stop notifying repository (object deleted from it)."""
+        repositories = getattr(self, "_repositories", ())
+        if repository in repositories:
+            object.__setattr__(self, "_repositories", tuple(
+                item for item in repositories if item is not repository))
 
     def save(self):
         """
@@ -24,6 +24,9 @@ class Place(BaseModel):
         amenities (list): List of associated Amenity instances.
     """
 
+    __slots__ = ("title", "description", "_price", "_latitude", "_longitude",
+                 "owner", "reviews", "amenities")
+
     def __init__(self, title, description, price,
                  latitude, longitude, owner):
         """
@@ -14,6 +14,8 @@ class Review(BaseModel):
         place (Place): Place being reviewed.
     """
 
+    __slots__ = ("text", "rating", "user", "place")
+
     def __init__(self, text, rating, user, place):
         """
         Initialize a Review instance.
@@ -18,6 +18,9 @@ class User(BaseModel):
         reviews (list): List of Review instances written by the user.
     """
 
+    __slots__ = ("first_name", "last_name", "email", "password_hash", "is_admin",
+                 "places", "reviews")
+
     def __init__(self, first_name, last_name, email, password, is_admin=False):
         """
         Initialize a User instance with required attributes.
@@ -5,6 +5,8 @@ This module exposes repository implementations used
 to handle data storage for the HBnB application.
 """
 
-from app.persistence.repository import InMemoryRepository
+from app.persistence.repository import (
+    ConcurrentInMemoryRepository, InMemoryRepository
+)
 
-__all__ = ["InMemoryRepository"]
+__all__ = ["ConcurrentInMemoryRepository", "InMemoryRepository"]
@@ -0,0 +1,418 @@
+"""
+Durable persistence for the in-memory repositories.
+
+DurableStore keeps the repositories of the facade on disk with a
+write-ahead log (WAL) and periodic snapshots, in one directory:
+
+    snapshot.bin        every object, as of the end of a WAL segment
+    wal.000042.log      changes made since (one file per segment)
+
+- Writes go through JournaledRepository, which wraps a repository and
+  marks the changed objects (add, delete, and any attribute assignment
+  on a stored object, see BaseModel.__setattr__).
+- A flusher thread appends the marked objects to the current WAL
+  segment and fsyncs it every fsync_interval seconds (group commit):
+  an object changed many times in the interval is written once, and
+  a crash loses at most the last interval.
+- A snapshot thread writes snapshot.bin every snapshot_interval
+  seconds in the background, then deletes the WAL segments it covers.
+- open() maps snapshot.bin in memory (mmap), decodes it, replays the
+  WAL segments written after it, and fills the repositories.
+
+Objects are stored as records: their attributes, with references to
+other objects (owner, place.reviews, ...) replaced by ids and
+re-linked after loading. WAL records are full-state upserts, so
+replaying a change twice is harmless.
+"""
+
+import atexit
+import functools
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from app.models.base_model import BaseModel
+from app.persistence.repository import Repository
+
+SNAPSHOT_FILE = "snapshot.bin"
+SNAPSHOT_MAGIC = b"HBNBSNP1"
+WAL_PREFIX = "wal."
+WAL_SUFFIX = ".log"
+
+# WAL frame: payload length, CRC32 of the payload, then the payload:
+# a pickled list of up to FRAME_ENTRIES changes, written as one unit
+_FRAME = struct.Struct("<II")
+FRAME_ENTRIES = 10_000
+# Snapshot header: magic, last WAL segment covered
+_SNAPSHOT_HEADER = struct.Struct("<8sQ")
+
+PUT = "put"
+DELETE = "del"
+
+
+class DurableStore:
+    """
+    Snapshot + write-ahead log persistence of named repositories.
+
+    Example:
+        store = DurableStore("data", {"users": InMemoryRepository()})
+        repos = store.open()      # {"users": JournaledRepository}
+        ...
+        store.close()             # flush the WAL, stop the threads
+    """
+
+    def __init__(self, directory, repositories, fsync_interval=1.0,
+                 snapshot_interval=300.0):
+        """
+        Args:
+            directory (str): Directory of the snapshot and WAL files.
+            repositories (dict): {name: empty repository}.
+            fsync_interval (float): Seconds between two WAL fsyncs.
+            snapshot_interval (float): Seconds between two snapshots
+                (None: only on snapshot() calls).
+        """
+        self.directory = directory
+        self.repositories = repositories
+        self.fsync_interval = fsync_interval
+        self.snapshot_interval = snapshot_interval
+        # WAL file; pending changes; snapshots
+        self._lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._pending = {}
+        self._segment = None
+        self._wal = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    # -------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------
+
+    def open(self):
+        """
+        Load the repositories from disk and start logging changes.
+
+        Returns:
+            dict: {name: JournaledRepository} wrapping the repositories.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        covered, records = self._read_snapshot()
+        for segment in self._segments():
+            if segment > covered:
+                self._replay(segment, records)
+        self._materialize(records)
+
+        self._segment = max([covered, *self._segments()]) + 1
+        self._wal = open(self._wal_path(self._segment), "ab")
+
+        journaled = {
+            name: JournaledRepository(repository, name, self)
+            for name, repository in self.repositories.items()
+        }
+        for name, repository in journaled.items():
+            for obj in repository.get_all():
+                obj.watch(repository)
+
+        self._start(self._flush_loop)
+        if self.snapshot_interval:
+            self._start(self._snapshot_loop)
+        atexit.register(self.close)
+        return journaled
+
+    def close(self):
+        """Write the pending changes and stop the background threads."""
+        if self._wal is None:
+            return
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self.flush()
+        with self._lock:
+            self._wal.close()
+            self._wal = None
+        atexit.unregister(self.close)
+
+    # -------------------------------------------------
+    # Journal (called by JournaledRepository)
+    # -------------------------------------------------
+
+    def put(self, name, obj):
+        """Mark obj as changed: it is logged at the next flush."""
+        with self._pending_lock:
+            self._pending[(name, obj.id)] = obj
+
+    def delete(self, name, obj_id):
+        with self._pending_lock:
+            self._pending[(name, obj_id)] = None
+
+    def flush(self):
+        """Append the pending changes to the WAL and fsync it."""
+        with self._lock:
+            if self._wal is None:
+                return
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            entries = [
+                (DELETE, name, obj_id, None) if obj is None
+                else (PUT, name, obj_id, encode(obj))
+                for (name, obj_id), obj in pending.items()
+            ]
+            for start in range(0, len(entries), FRAME_ENTRIES):
+                payload = pickle.dumps(entries[start:start + FRAME_ENTRIES],
+                                       pickle.HIGHEST_PROTOCOL)
+                self._wal.write(_FRAME.pack(len(payload), zlib.crc32(payload)))
+                self._wal.write(payload)
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+
+    def snapshot(self):
+        """
+        Write snapshot.bin, then delete the WAL segments it covers.
+
+        Writers are only paused while the WAL switches to a new
+        segment; the objects are encoded while they keep writing.
+        Changes made meanwhile are in the new segment and replayed
+        over the snapshot on open().
+        """
+        with self._snapshot_lock:
+            self.flush()
+            with self._lock:
+                covered = self._segment
+                self._wal.close()
+                self._segment += 1
+                self._wal = open(self._wal_path(self._segment), "ab")
+
+            records = {
+                name: [encode(obj) for obj in repository.get_all()]
+                for name, repository in self.repositories.items()
+            }
+            path = os.path.join(self.directory, SNAPSHOT_FILE)
+            with open(path + ".tmp", "wb") as f:
+                f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, covered))
+                pickle.dump(records, f, pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + ".tmp", path)
+            _fsync_directory(self.directory)
+
+            for segment in self._segments():
+                if segment <= covered:
+                    os.remove(self._wal_path(segment))
+
+    # -------------------------------------------------
+    # Background threads
+    # -------------------------------------------------
+
+    def _start(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.fsync_interval):
+            self.flush()
+
+    def _snapshot_loop(self):
+        last = time.monotonic()
+        while not self._stop.wait(min(self.snapshot_interval, 1.0)):
+            if time.monotonic() - last >= self.snapshot_interval:
+                self.snapshot()
+                last = time.monotonic()
+
+    # -------------------------------------------------
+    # Loading
+    # -------------------------------------------------
+
+    def _read_snapshot(self):
+        """Return (last WAL segment covered, {name: {id: record}})."""
+        records = {name: {} for name in self.repositories}
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0, records
+        with open(path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, covered = _SNAPSHOT_HEADER.unpack_from(data)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not an HBnB snapshot")
+            with memoryview(data) as view:
+                body = pickle.loads(view[_SNAPSHOT_HEADER.size:])
+        for name, items in body.items():
+            if name in records:
+                records[name] = {record[1]: record for record in items}
+        return covered, records
+
+    def _replay(self, segment, records):
+        """Apply a WAL segment; a torn last frame (crash) is cut off."""
+        path = self._wal_path(segment)
+        with open(path, "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset < len(data):
+            if offset + _FRAME.size > len(data):
+                break
+            length, crc = _FRAME.unpack_from(data, offset)
+            payload = data[offset + _FRAME.size:offset + _FRAME.size + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            for op, name, obj_id, record in pickle.loads(payload):
+                if name in records:
+                    if op == PUT:
+                        records[name][obj_id] = record
+                    else:
+                        records[name].pop(obj_id, None)
+            offset += _FRAME.size + length
+        if offset < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+
+    def _materialize(self, records):
+        """Rebuild the objects, re-link them and fill the repositories."""
+        classes = _model_classes()
+        # Plain slot assignment: no repository is watching yet
+        set_slot = object.__setattr__
+        objects = {}
+        for items in records.values():
+            for cls_name, obj_id, fields, _, _ in items.values():
+                obj = classes[cls_name].__new__(classes[cls_name])
+                set_slot(obj, "_repositories", ())
+                for attr, value in fields.items():
+                    set_slot(obj, attr, value)
+                objects[obj_id] = obj
+        for items in records.values():
+            for _, obj_id, _, refs, ref_lists in items.values():
+                obj = objects[obj_id]
+                for attr, ref in refs.items():
+                    set_slot(obj, attr, objects.get(ref))
+                for attr, ids in ref_lists.items():
+                    set_slot(obj, attr,
+                             [objects[i] for i in ids if i in objects])
+        for name, items in records.items():
+            if items:
+                self.repositories[name].add_many(
+                    [objects[obj_id] for obj_id in items])
+
+    def _segments(self):
+        return sorted(
+            int(filename[len(WAL_PREFIX):-len(WAL_SUFFIX)])
+            for filename in os.listdir(self.directory)
+            if filename.startswith(WAL_PREFIX) and filename.endswith(WAL_SUFFIX)
+        )
+
+    def _wal_path(self, segment):
+        return os.path.join(self.directory,
+                            f"{WAL_PREFIX}{segment:06d}{WAL_SUFFIX}")
+
+
+class JournaledRepository(Repository):
+    """
+    Repository wrapper logging every change to a DurableStore.
+
+    Reads, and the methods specific to the wrapped repository
+    (range(), snapshot(), ...), are delegated unchanged.
+    """
+
+    def __init__(self, repository, name, store):
+        self._repository = repository
+        self._name = name
+        self._store = store
+
+    def __getattr__(self, attr_name):
+        return getattr(self._repository, attr_name)
+
+    def add(self, obj):
+        self._repository.add(obj)
+        obj.watch(self)
+        self._store.put(self._name, obj)
+
+    def add_many(self, objs):
+        self._repository.add_many(objs)
+        for obj in objs:
+            obj.watch(self)
+            self._store.put(self._name, obj)
+
+    def get(self, obj_id):
+        return self._repository.get(obj_id)
+
+    def get_all(self):
+        return self._repository.get_all()
+
+    def update(self, obj_id, data):
+        # The wrapped repository may group the changes (one copy)
+        self._repository.update(obj_id, data)
+
+    def delete(self, obj_id):
+        obj = self._repository.get(obj_id)
+        if obj is not None:
+            self._repository.delete(obj_id)
+            obj.unwatch(self)
+            self._store.delete(self._name, obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        return self._repository.get_by_attribute(attr_name, attr_value)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        return self._repository.get_all_by_attribute(attr_name, attr_value)
+
+    def watches(self, attr_name):
+        # Every change goes to the WAL
+        return True
+
+    def reindex(self, obj, attr_name):
+        """Called by stored objects when one of their attributes changes."""
+        self._store.put(self._name, obj)
+
+
+def encode(obj):
+    """
+    Return the record of obj: (class name, id, fields, refs, ref_lists).
+
+    refs maps attributes holding a model to its id, ref_lists the
+    attributes holding a list of models to their ids.
+    """
+    fields, refs, ref_lists = {}, {}, {}
+    for attr in _slot_names(type(obj)):
+        value = getattr(obj, attr, None)
+        if isinstance(value, BaseModel):
+            refs[attr] = value.id
+        elif isinstance(value, list) and value and isinstance(value[0], BaseModel):
+            ref_lists[attr] = [item.id for item in value]
+        else:
+            fields[attr] = value
+    return type(obj).__name__, obj.id, fields, refs, ref_lists
+
+
+def _model_classes():
+    """{class name: class} of every BaseModel subclass."""
+    classes, todo = {}, [BaseModel]
+    while todo:
+        for cls in todo.pop().__subclasses__():
+            classes[cls.__name__] = cls
+            todo.append(cls)
+    return classes
+
+
+@functools.cache
+def _slot_names(cls):
+    """Stored attributes of a model class (its __slots__ and its bases')."""
+    return tuple(
+        attr for klass in reversed(cls.__mro__)
+        for attr in klass.__dict__.get("__slots__", ())
+        if attr != "_repositories"
+    )
+
+
+def _fsync_directory(directory):
+    """Make a rename durable (POSIX only)."""
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -1,10 +1,16 @@
+import threading
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
 
 class Repository(ABC):
     @abstractmethod
     def add(self, obj):
         pass
 
+    @abstractmethod
+    def add_many(self, objs):
+        pass
+
     @abstractmethod
     def get(self, obj_id):
         pass
@@ -25,13 +31,68 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_all_by_attribute(self, attr_name, attr_value):
+        pass
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """
+    Dict-backed repository.
+
+    Attributes named in indexes get a hash index (value -> objects):
+    get_by_attribute() and get_all_by_attribute() on them are O(1)
+    instead of a scan of every object.
+
+    Attributes named in sorted_indexes get a sorted index (a list of
+    (value, id) pairs searched with bisect): range() returns the
+    objects within [lo, hi] in O(log n + k), already sorted.
+
+    Indexes follow add(), update(), delete() and any later assignment
+    of an indexed attribute on a stored object (BaseModel.__setattr__
+    calls reindex() for the attributes watches() names).
+
+    Example:
+        users = InMemoryRepository(indexes=["email"])
+        places = InMemoryRepository(sorted_indexes=["price"])
+    """
+
+    def __init__(self, indexes=None, sorted_indexes=None):
         self._storage = {}
+        # attr -> {value: {obj_id: obj}}, buckets keep insertion order
+        self._indexes = {attr: {} for attr in indexes or []}
+        # attr -> [(value, obj_id)] sorted, None values left out
+        self._sorted = {attr: [] for attr in sorted_indexes or []}
+        # attr -> {obj_id: value}, the key each object is filed under
+        self._keys = {attr: {} for attr in [*self._indexes, *self._sorted]}
+        # Repository notified by stored objects (see copy())
+        self._watcher = self
+        # In a copy: (attr, value) of the buckets copied so far, the
+        # others are shared with the original (None: none is shared)
+        self._copied_buckets = None
 
     def add(self, obj):
+        if obj.id in self._storage:
+            self._unindex(self._storage[obj.id])
         self._storage[obj.id] = obj
+        for attr in self._keys:
+            self._file(obj, attr)
+        if self._keys:
+            obj.watch(self._watcher)
+
+    def add_many(self, objs):
+        """Add objs; sorted indexes are rebuilt with one sort, not n inserts."""
+        sorted_indexes, self._sorted = self._sorted, {}
+        try:
+            for obj in objs:
+                self.add(obj)
+        finally:
+            self._sorted = sorted_indexes
+        for attr, entries in self._sorted.items():
+            keys = self._keys[attr]
+            entries[:] = sorted(
+                (value, obj_id) for obj_id, value in keys.items()
+                if value is not None)
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
@@ -45,8 +106,224 @@ class InMemoryRepository(Repository):
             obj.update(data)
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        obj = self._storage.pop(obj_id, None)
+        if obj is not None:
+            self._unindex(obj)
+            obj.unwatch(self._watcher)
 
     def get_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._indexes:
+            bucket = self._indexes[attr_name].get(attr_value, {})
+            return next(self._matching(bucket.values(), attr_name, attr_value),
+                        None)
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._indexes:
+            bucket = self._indexes[attr_name].get(attr_value, {})
+            return list(self._matching(bucket.values(), attr_name, attr_value))
+        return [obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value]
+
+    @staticmethod
+    def _matching(objs, attr_name, attr_value):
+        # An object changed since this index was built (a snapshot of
+        # ConcurrentInMemoryRepository) is left out of its old bucket
+        return (obj for obj in objs if getattr(obj, attr_name) == attr_value)
+
+    def range(self, attr_name, lo=None, hi=None, limit=None, reverse=False):
+        """
+        Return the objects whose attr_name is within [lo, hi].
+
+        Args:
+            attr_name (str): An attribute listed in sorted_indexes.
+            lo, hi: Inclusive bounds, None for no bound.
+            limit (int, optional): Maximum number of objects returned.
+            reverse (bool): Largest values first.
+
+        Returns:
+            list: Objects sorted by attr_name (then by id). Objects
+            whose attr_name is None are never returned.
+
+        Raises:
+            ValueError: If attr_name has no sorted index.
+        """
+        if attr_name not in self._sorted:
+            raise ValueError(f"{attr_name} has no sorted index")
+        entries = self._sorted[attr_name]
+        start = 0 if lo is None else bisect_left(entries, lo, key=_value)
+        end = len(entries) if hi is None else bisect_right(entries, hi, key=_value)
+        if limit is not None:
+            if reverse:
+                start = max(start, end - limit)
+            else:
+                end = min(end, start + limit)
+        selected = entries[start:end]
+        if reverse:
+            selected.reverse()
+        # Same check as _matching(): the current value must still be
+        # the one the entry was filed under
+        storage = self._storage
+        return [storage[obj_id] for value, obj_id in selected
+                if getattr(storage[obj_id], attr_name) == value]
+
+    def copy(self, watcher=None):
+        """
+        Return an independent copy of the storage and the indexes.
+
+        The stored objects themselves are shared. Hash buckets are
+        copied lazily, when the copy first changes them.
+
+        Args:
+            watcher (Repository, optional): Repository that objects added
+                to the copy notify of attribute changes (default: the copy).
+        """
+        clone = InMemoryRepository.__new__(InMemoryRepository)
+        clone._storage = dict(self._storage)
+        clone._indexes = {attr: dict(index) for attr, index in self._indexes.items()}
+        clone._sorted = {attr: list(entries) for attr, entries in self._sorted.items()}
+        clone._keys = {attr: dict(keys) for attr, keys in self._keys.items()}
+        clone._watcher = watcher or clone
+        clone._copied_buckets = set()
+        return clone
+
+    def watches(self, attr_name):
+        """Whether a change of attr_name must be reported to reindex()."""
+        return attr_name in self._keys
+
+    def reindex(self, obj, attr_name):
+        """Move obj to the place of the current value of attr_name."""
+        if attr_name not in self._keys or self._storage.get(obj.id) is not obj:
+            return
+        self._remove(obj, attr_name)
+        self._file(obj, attr_name)
+
+    def _file(self, obj, attr_name):
+        value = getattr(obj, attr_name, None)
+        if attr_name in self._indexes:
+            self._bucket(attr_name, value)[obj.id] = obj
+        if attr_name in self._sorted and value is not None:
+            insort(self._sorted[attr_name], (value, obj.id))
+        self._keys[attr_name][obj.id] = value
+
+    def _remove(self, obj, attr_name):
+        value = self._keys[attr_name].pop(obj.id)
+        if attr_name in self._indexes:
+            bucket = self._bucket(attr_name, value)
+            del bucket[obj.id]
+            if not bucket:
+                del self._indexes[attr_name][value]
+        if attr_name in self._sorted and value is not None:
+            entries = self._sorted[attr_name]
+            del entries[bisect_left(entries, (value, obj.id))]
+
+    def _unindex(self, obj):
+        for attr in self._keys:
+            self._remove(obj, attr)
+
+    def _bucket(self, attr_name, value):
+        """Writable bucket of value (copied first if shared)."""
+        index = self._indexes[attr_name]
+        bucket = index.get(value)
+        copied = self._copied_buckets
+        if bucket is None or (copied is not None
+                              and (attr_name, value) not in copied):
+            bucket = index[value] = dict(bucket or {})
+            if copied is not None:
+                copied.add((attr_name, value))
+        return bucket
+
+
+class ConcurrentInMemoryRepository(Repository):
+    """
+    Thread-safe InMemoryRepository, for multi-threaded servers.
+
+    The data lives in an immutable snapshot (an InMemoryRepository
+    that is never modified once published). Writers take a lock,
+    apply their change to a copy of the snapshot and publish the copy
+    with a single assignment; readers never lock and never copy:
+
+    - every read sees one consistent snapshot, never a half-done write;
+    - snapshot() returns it, for several reads of the same state;
+    - get_all() returns the tuple of values built with the snapshot.
+
+    Writes cost O(n) (the copy): this suits small read-mostly data
+    only, hence THREAD_SAFE_REPOSITORIES is off by default. The stored
+    objects are shared between snapshots, so changing an attribute is
+    seen at once by every reader; the indexes follow with the next
+    snapshot, and until then index lookups skip an object whose
+    current value no longer matches its entry. update() changes all
+    its attributes within one write: one copy, one publish.
+    """
+
+    def __init__(self, indexes=None, sorted_indexes=None):
+        # Reentrant: reindex() runs within the write of update()
+        self._lock = threading.RLock()
+        self._pending = None
+        self._publish(InMemoryRepository(indexes, sorted_indexes))
+
+    def snapshot(self):
+        """Return the current snapshot (read only)."""
+        return self._state[0]
+
+    def add(self, obj):
+        self._write(lambda repo: repo.add(obj))
+
+    def add_many(self, objs):
+        """Add objs with a single copy of the snapshot."""
+        self._write(lambda repo: repo.add_many(objs))
+
+    def get(self, obj_id):
+        return self._state[0].get(obj_id)
+
+    def get_all(self):
+        """Return every object, as an immutable tuple (no copy)."""
+        return self._state[1]
+
+    def update(self, obj_id, data):
+        obj = self.get(obj_id)
+        if obj:
+            self._write(lambda repo: obj.update(data))
+
+    def delete(self, obj_id):
+        self._write(lambda repo: repo.delete(obj_id))
+
+    def get_by_attribute(self, attr_name, attr_value):
+        return self._state[0].get_by_attribute(attr_name, attr_value)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        return self._state[0].get_all_by_attribute(attr_name, attr_value)
+
+    def range(self, attr_name, lo=None, hi=None, limit=None, reverse=False):
+        return self._state[0].range(attr_name, lo, hi, limit, reverse)
+
+    def watches(self, attr_name):
+        return self._state[0].watches(attr_name)
+
+    def reindex(self, obj, attr_name):
+        """Called by stored objects when an indexed attribute changes."""
+        if self.watches(attr_name):
+            self._write(lambda repo: repo.reindex(obj, attr_name))
+
+    def _write(self, change):
+        with self._lock:
+            if self._pending is not None:
+                # Nested in a write of this thread: same copy
+                change(self._pending)
+                return
+            repo = self._pending = self._state[0].copy(watcher=self)
+            try:
+                change(repo)
+            finally:
+                # Even on error: the copy has the index moves of the
+                # attributes changed before it
+                self._pending = None
+                self._publish(repo)
+
+    def _publish(self, repo):
+        # One assignment: readers see the old or the new state, whole
+        self._state = (repo, tuple(repo._storage.values()))
+
+
+def _value(entry):
+    """Sort key of a sorted index entry: the attribute value."""
+    return entry[0]
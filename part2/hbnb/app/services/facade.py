@@ -1,6 +1,9 @@
 # app/services/facade.py
 
-from app.persistence.repository import InMemoryRepository
+from app.persistence.durable import DurableStore
+from app.persistence.repository import (
+    ConcurrentInMemoryRepository, InMemoryRepository
+)
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
@@ -15,10 +18,8 @@ class HBnBFacade:
 
     def __init__(self):
         """Initialize repositories for users, places, reviews, and amenities."""
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+        self.store = None
+        self.reset()
 
     # ==================================================
     # USER METHODS
@@ -182,6 +183,28 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_by_price(self, min_price=None, max_price=None, limit=None):
+        """
+        Retrieve the places priced within [min_price, max_price].
+
+        Args:
+            min_price (float, optional): Lowest price per night.
+            max_price (float, optional): Highest price per night.
+            limit (int, optional): Maximum number of places returned.
+
+        Returns:
+            list[Place]: Matching places, cheapest first.
+
+        Raises:
+            ValueError: If the bounds or the limit are invalid.
+        """
+        if min_price is not None and max_price is not None \
+                and min_price > max_price:
+            raise ValueError("min_price must be <= max_price")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive integer")
+        return self.place_repo.range("price", min_price, max_price, limit)
+
     def update_place(self, place_id, place_data):
         """
         Update an existing place's information.
@@ -278,11 +301,10 @@ class HBnBFacade:
         Returns:
             list[Review]: Reviews linked to that place.
         """
-        return [
-            r for r in self.review_repo.get_all()
-            if getattr(r, "place", None)
-            and getattr(r.place, "id", None) == place_id
-        ]
+        place = self.place_repo.get(place_id)
+        if not place:
+            return []
+        return self.review_repo.get_all_by_attribute("place", place)
 
     def get_all_reviews(self):
         """Retrieve all reviews."""
@@ -384,8 +406,38 @@ class HBnBFacade:
         """Delete amenity."""
         return self.amenity_repo.delete(amenity_id)
 
-    def reset(self):
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+    def reset(self, thread_safe=False, persistence_dir=None,
+              fsync_interval=1.0, snapshot_interval=300.0):
+        """
+        Recreate the repositories: empty, or loaded from disk.
+
+        Args:
+            thread_safe (bool): Use ConcurrentInMemoryRepository
+                (for a multi-threaded server).
+            persistence_dir (str, optional): Keep the data in this
+                directory (snapshot + write-ahead log, see DurableStore).
+            fsync_interval (float): Seconds between two WAL fsyncs.
+            snapshot_interval (float): Seconds between two snapshots.
+        """
+        if self.store:
+            self.store.close()
+            self.store = None
+
+        repository = (ConcurrentInMemoryRepository if thread_safe
+                      else InMemoryRepository)
+        # Hash indexes: email lookups (signup, login), reviews of a place
+        repositories = {
+            "users": repository(indexes=["email"]),
+            "places": repository(sorted_indexes=["price"]),
+            "reviews": repository(indexes=["place"]),
+            "amenities": repository(),
+        }
+        if persistence_dir:
+            self.store = DurableStore(persistence_dir, repositories,
+                                      fsync_interval, snapshot_interval)
+            repositories = self.store.open()
+
+        self.user_repo = repositories["users"]
+        self.place_repo = repositories["places"]
+        self.review_repo = repositories["reviews"]
+        self.amenity_repo = repositories["amenities"]
@@ -0,0 +1,106 @@
+"""
+Benchmark — restart time of the persisted in-memory repositories.
+
+Creates places (1M by default) and their owners in repositories kept
+by a DurableStore, then times:
+- the WAL write (group commit of every object),
+- a restart replaying the WAL only,
+- a snapshot,
+- a restart from the snapshot (mmap) with an empty WAL tail.
+
+Usage (from part2/hbnb):
+    python3 -m benchmarks.durable_restart [--places 1000000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.durable import DurableStore, SNAPSHOT_FILE
+from app.persistence.repository import (
+    ConcurrentInMemoryRepository, InMemoryRepository
+)
+
+OWNERS = 10_000
+
+
+def _repositories(repository=ConcurrentInMemoryRepository):
+    return {
+        "users": repository(indexes=["email"]),
+        "places": repository(sorted_indexes=["price"]),
+    }
+
+
+def _seed(directory, places):
+    store = DurableStore(directory, _repositories(InMemoryRepository),
+                         fsync_interval=3600, snapshot_interval=None)
+    repos = store.open()
+    rng = random.Random(42)
+    owners = [User("Bench", "Owner", f"owner{i}@bench.io", "bench1234")
+              for i in range(OWNERS)]
+    repos["users"].add_many(owners)
+    repos["places"].add_many([
+        Place(f"Place {i}", "Generated place", rng.randint(10, 500),
+              rng.uniform(-60, 60), rng.uniform(-180, 180), rng.choice(owners))
+        for i in range(places)
+    ])
+    return store
+
+
+def _size_mb(directory):
+    return sum(os.path.getsize(os.path.join(directory, f))
+               for f in os.listdir(directory)) / 2**20
+
+
+def _restart(directory):
+    started = time.perf_counter()
+    store = DurableStore(directory, _repositories(),
+                         fsync_interval=3600, snapshot_interval=None)
+    repos = store.open()
+    elapsed = time.perf_counter() - started
+    count = len(repos["places"].get_all())
+    return store, elapsed, count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        started = time.perf_counter()
+        store = _seed(directory, args.places)
+        print(f"Created {args.places} places in "
+              f"{time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        store.close()
+        print(f"WAL write + fsync:         {time.perf_counter() - started:6.1f}s"
+              f"  ({_size_mb(directory):.0f} MB)")
+
+        store, elapsed, count = _restart(directory)
+        print(f"Restart from the WAL:      {elapsed:6.1f}s  ({count} places)")
+
+        started = time.perf_counter()
+        store.snapshot()
+        snapshot_mb = os.path.getsize(
+            os.path.join(directory, SNAPSHOT_FILE)) / 2**20
+        print(f"Snapshot:                  {time.perf_counter() - started:6.1f}s"
+              f"  ({snapshot_mb:.0f} MB)")
+        store.close()
+
+        store, elapsed, count = _restart(directory)
+        print(f"Restart from the snapshot: {elapsed:6.1f}s  ({count} places)")
+        store.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
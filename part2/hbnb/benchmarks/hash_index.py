@@ -0,0 +1,66 @@
+"""
+Benchmark — InMemoryRepository.get_by_attribute: hash index vs scan.
+
+Fills two user repositories (1M users by default), one declared with
+indexes=["email"], then times email lookups (the query run by every
+signup and login) for a few repository sizes.
+
+Usage (from part2/hbnb):
+    python3 -m benchmarks.hash_index [--users 1000000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+
+LOOKUPS = 1000
+SCAN_LOOKUPS = 5
+
+
+def _time(repo, emails):
+    """Median time (µs) of one get_by_attribute("email", ...)."""
+    timings = []
+    for email in emails:
+        started = time.perf_counter()
+        repo.get_by_attribute("email", email)
+        timings.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    sizes = [size for size in (1_000, 10_000, 100_000, 1_000_000)
+             if size < args.users] + [args.users]
+    indexed = InMemoryRepository(indexes=["email"])
+    scanned = InMemoryRepository()
+
+    started = time.perf_counter()
+    rows = []
+    count = 0
+    for size in sizes:
+        for i in range(count, size):
+            user = User("Bench", "User", f"user{i}@bench.io", "bench1234")
+            indexed.add(user)
+            scanned.add(user)
+        count = size
+        emails = [f"user{rng.randrange(size)}@bench.io" for _ in range(LOOKUPS)]
+        rows.append((size, _time(indexed, emails),
+                     _time(scanned, emails[:SCAN_LOOKUPS])))
+    print(f"Created {args.users} users in {time.perf_counter() - started:.1f}s")
+
+    print(f"\n{'users':>10} {'hash index (µs)':>16} {'scan (µs)':>14}")
+    print("-" * 42)
+    for size, hashed, scan in rows:
+        print(f"{size:>10} {hashed:>16.2f} {scan:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark — memory per model object: compact layout vs __dict__ layout.
+
+Builds objects of every model (100k of each by default) and measures
+the bytes allocated per object with tracemalloc, for:
+- the models (__slots__, integer epoch timestamps),
+- the previous layout: the same attribute values in a per-instance
+  __dict__, with datetime timestamps.
+
+Both layouts hold the same values and the same id strings, so the
+difference is the per-object overhead. Objects referenced by others
+(owners, places) are built outside the measurement.
+
+Usage (from part2/hbnb):
+    python3 -m benchmarks.model_memory [--objects 100000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from app.models.amenity import Amenity
+from app.models.base_model import to_epoch
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class _DictLayout:
+    """An object storing the attributes of a model in its __dict__."""
+
+    def __init__(self, model):
+        # Attributes as the models stored them before __slots__
+        attrs = {
+            "id": model.id,
+            "created_at": model.created_at,
+            "updated_at": model.updated_at,
+        }
+        for klass in reversed(type(model).__mro__[:-2]):
+            for attr in klass.__slots__:
+                value = getattr(model, attr)
+                attrs[attr] = [] if isinstance(value, list) else value
+        self.__dict__.update(attrs)
+
+
+def _bytes_per_object(build, count):
+    """Average bytes allocated (and kept) by build() over count calls."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the objects is not part of their cost
+    return (after - before) / count - 8, objects
+
+
+def _measure(name, build, count):
+    # Build the models first (untraced), then each layout from them
+    models = [build(i) for i in range(count)]
+    compact, _ = _bytes_per_object(lambda i: _copy(models[i]), count)
+    legacy, _ = _bytes_per_object(lambda i: _DictLayout(models[i]), count)
+    return name, compact, legacy
+
+
+def _copy(model):
+    """A new model object sharing the attribute values of model."""
+    clone = type(model).__new__(type(model))
+    object.__setattr__(clone, "_repositories", ())
+    for klass in reversed(type(model).__mro__[:-1]):
+        for attr in klass.__dict__.get("__slots__", ()):
+            if attr not in ("_repositories", "_created_at", "_updated_at"):
+                value = getattr(model, attr)
+                object.__setattr__(clone, attr,
+                                   [] if isinstance(value, list) else value)
+    # A new timestamp, shared by both fields as in BaseModel.__init__
+    now = to_epoch(model.created_at)
+    object.__setattr__(clone, "_created_at", now)
+    object.__setattr__(clone, "_updated_at", now)
+    return clone
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=100_000)
+    args = parser.parse_args()
+
+    owner = User("Bench", "Owner", "owner@bench.io", "bench1234")
+    reviewer = User("Bench", "Reviewer", "reviewer@bench.io", "bench1234")
+    place = Place("Reviewed place", "", 100, 0, 0, owner)
+    rows = [
+        _measure("User", lambda i: User(
+            "Bench", "User", f"user{i}@bench.io", "bench1234"), args.objects),
+        _measure("Place", lambda i: Place(
+            f"Place {i}", "Generated place", 100, 45.0, 5.0, owner),
+            args.objects),
+        _measure("Review", lambda i: Review(
+            "Great stay", 5, reviewer, place), args.objects),
+        _measure("Amenity", lambda i: Amenity(f"Amenity {i}"), args.objects),
+    ]
+
+    print(f"Bytes per object ({args.objects} objects of each model, "
+          f"values shared):\n")
+    print(f"{'model':>8} {'__slots__':>10} {'__dict__':>10} {'saved':>7}")
+    print("-" * 38)
+    for name, compact, legacy in rows:
+        print(f"{name:>8} {compact:>10.0f} {legacy:>10.0f} "
+              f"{1 - compact / legacy:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
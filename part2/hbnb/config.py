@@ -4,6 +4,18 @@ class Config:
     """Base configuration class."""
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Copy-on-write repositories, safe under a multi-threaded server.
+    # Every write (add, delete, change of an indexed attribute) copies
+    # the whole repository: O(n) per write, only for small read-mostly
+    # data. Off by default: run the server with one thread instead.
+    THREAD_SAFE_REPOSITORIES = os.getenv('HBNB_THREAD_SAFE') == '1'
+    # Keep the in-memory data across restarts: snapshot + write-ahead
+    # log in this directory (None = data lost on restart)
+    PERSISTENCE_DIR = os.getenv('HBNB_DATA_DIR')
+    # Seconds between two WAL fsyncs (changes lost on a crash at most)
+    PERSISTENCE_FSYNC_INTERVAL = 1.0
+    # Seconds between two background snapshots (WAL truncated after)
+    PERSISTENCE_SNAPSHOT_INTERVAL = 300
 
 class DevelopmentConfig(Config):
     """Development configuration."""
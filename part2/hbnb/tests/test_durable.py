@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from app.persistence.durable import SNAPSHOT_FILE
+from app.services.facade import HBnBFacade
+
+
+class TestDurableStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.facade = self.open()
+
+    def tearDown(self):
+        self.facade.store.close()
+        shutil.rmtree(self.directory)
+
+    def open(self):
+        facade = HBnBFacade()
+        facade.reset(thread_safe=True, persistence_dir=self.directory,
+                     fsync_interval=60, snapshot_interval=None)
+        return facade
+
+    def restart(self):
+        self.facade.store.close()
+        self.facade = self.open()
+        return self.facade
+
+    def seed(self):
+        owner = self.facade.create_user({"first_name": "John", "last_name": "Doe",
+                                         "email": "john@example.com", "password": "secret12"})
+        guest = self.facade.create_user({"first_name": "Jane", "last_name": "Doe",
+                                         "email": "jane@example.com", "password": "secret12"})
+        wifi = self.facade.create_amenity({"name": "WiFi"})
+        place = self.facade.create_place({"title": "Loft", "price": 100, "latitude": 45.0,
+                                          "longitude": 6.0, "owner_id": owner.id,
+                                          "amenities": [wifi.id]})
+        review = self.facade.create_review({"text": "Great", "rating": 5,
+                                            "user_id": guest.id, "place_id": place.id})
+        return owner, guest, wifi, place, review
+
+    def test_restart_restores_objects_and_links(self):
+        owner, guest, wifi, place, review = self.seed()
+        self.facade.update_place(place.id, {"price": 80})
+        self.facade.update_user(owner.id, {"email": "johnny@example.com"})
+
+        facade = self.restart()
+        place = facade.get_place(place.id)
+        self.assertEqual(place.price, 80)
+        self.assertIs(place.owner, facade.get_user(owner.id))
+        self.assertEqual(place.owner.places, [place])
+        self.assertIs(place.amenities[0], facade.get_amenity(wifi.id))
+        self.assertEqual(facade.get_reviews_by_place(place.id), [facade.get_review(review.id)])
+        self.assertIs(facade.get_review(review.id).user, facade.get_user(guest.id))
+        # Indexes are rebuilt
+        self.assertIs(facade.get_user_by_email("johnny@example.com"), place.owner)
+        self.assertEqual(facade.get_places_by_price(50, 90), [place])
+        self.assertTrue(place.owner.check_password("secret12"))
+
+    def test_delete_and_changes_after_restart(self):
+        _, _, _, place, review = self.seed()
+        self.facade.delete_review(review.id)
+        facade = self.restart()
+        self.assertIsNone(facade.get_review(review.id))
+        # Restored objects are journaled too
+        facade.update_place(place.id, {"title": "Chalet"})
+        self.assertEqual(self.restart().get_place(place.id).title, "Chalet")
+
+    def test_snapshot_truncates_wal(self):
+        _, _, _, place, _ = self.seed()
+        self.facade.store.snapshot()
+        self.facade.update_place(place.id, {"price": 150})
+        self.assertEqual(sorted(f for f in os.listdir(self.directory) if f.startswith("wal.")),
+                         ["wal.000002.log"])
+
+        facade = self.restart()
+        self.assertTrue(os.path.exists(os.path.join(self.directory, SNAPSHOT_FILE)))
+        self.assertEqual(facade.get_place(place.id).price, 150)
+        self.assertEqual(len(facade.get_all_users()), 2)
+
+    def test_torn_wal_tail_is_ignored(self):
+        owner, *_ = self.seed()
+        self.facade.store.flush()
+        wal = sorted(f for f in os.listdir(self.directory) if f.startswith("wal."))[-1]
+        with open(os.path.join(self.directory, wal), "ab") as f:
+            f.write(b"\x40\x00\x00\x00torn")
+
+        facade = self.restart()
+        self.assertEqual(facade.get_user(owner.id).email, "john@example.com")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from datetime import datetime, timezone
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class TestCompactModels(unittest.TestCase):
+
+    def setUp(self):
+        self.owner = User("John", "Doe", "john@example.com", "secret12")
+        self.guest = User("Jane", "Doe", "jane@example.com", "secret12")
+        self.place = Place("Loft", "Nice", 100, 45.0, 5.0, self.owner)
+        self.review = Review("Great", 5, self.guest, self.place)
+        self.amenity = Amenity("Wifi")
+
+    def test_no_instance_dict(self):
+        for obj in (self.owner, self.place, self.review, self.amenity):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+
+    def test_timestamps_are_datetimes(self):
+        self.assertIsInstance(self.place._created_at, int)
+        self.assertEqual(self.place.created_at.tzinfo, timezone.utc)
+        self.assertEqual(self.amenity.created_at, self.amenity.updated_at)
+        moment = datetime(2024, 5, 17, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        self.place.updated_at = moment
+        self.assertEqual(self.place.updated_at, moment)
+        self.place.save()
+        self.assertGreater(self.place.updated_at, moment)
+
+    def test_public_attributes_and_setters(self):
+        self.assertEqual(self.place.price, 100.0)
+        self.assertIs(self.place.owner, self.owner)
+        self.assertEqual(self.place.reviews, [self.review])
+        with self.assertRaises(ValueError):
+            self.place.price = -1
+        with self.assertRaises(ValueError):
+            self.place.latitude = 91
+        self.assertEqual(self.place.price, 100.0)
+
+    def test_update_ignores_unknown_attributes(self):
+        self.amenity.update({"name": "Pool", "color": "blue"})
+        self.assertEqual(self.amenity.name, "Pool")
+        with self.assertRaises(AttributeError):
+            self.amenity.color = "blue"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -72,6 +72,20 @@ class TestPlaceEndpoints(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.get_json()), 1)
 
+    def test_get_places_by_price(self):
+        for price in (150.0, 40.0, 90.0, 120.0):
+            self.client.post('/api/v1/places/', json={**self.valid_place, "price": price})
+        response = self.client.get('/api/v1/places/?min_price=50&max_price=120')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['price'] for p in response.get_json()], [90.0, 120.0])
+        response = self.client.get('/api/v1/places/?max_price=100&limit=1')
+        self.assertEqual([p['price'] for p in response.get_json()], [40.0])
+
+    def test_get_places_by_price_invalid(self):
+        for query in ("min_price=abc", "min_price=100&max_price=50", "max_price=10&limit=0"):
+            response = self.client.get(f'/api/v1/places/?{query}')
+            self.assertEqual(response.status_code, 400)
+
     # GET /api/v1/places/<id>
     def test_get_place_by_id(self):
         post_resp = self.client.post('/api/v1/places/', json=self.valid_place)
@@ -0,0 +1,234 @@
+import sys
+import threading
+import unittest
+from unittest import mock
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.repository import (
+    ConcurrentInMemoryRepository, InMemoryRepository
+)
+
+
+class TestInMemoryRepositoryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository(indexes=["email"])
+        self.john = User("John", "Doe", "john@example.com", "secret12")
+        self.jane = User("Jane", "Doe", "jane@example.com", "secret12")
+        self.repo.add(self.john)
+        self.repo.add(self.jane)
+
+    def test_get_by_indexed_attribute(self):
+        self.assertIs(self.repo.get_by_attribute("email", "jane@example.com"), self.jane)
+        self.assertIsNone(self.repo.get_by_attribute("email", "nobody@example.com"))
+
+    def test_get_all_by_attribute(self):
+        self.assertEqual(self.repo.get_all_by_attribute("last_name", "Doe"),
+                         [self.john, self.jane])
+        self.assertEqual(self.repo.get_all_by_attribute("email", "john@example.com"),
+                         [self.john])
+        self.assertEqual(self.repo.get_all_by_attribute("email", "x@example.com"), [])
+
+    def test_index_follows_setters_and_update(self):
+        self.john.email = "johnny@example.com"
+        self.assertIsNone(self.repo.get_by_attribute("email", "john@example.com"))
+        self.assertIs(self.repo.get_by_attribute("email", "johnny@example.com"), self.john)
+
+        self.repo.update(self.jane.id, {"email": "j@example.com"})
+        self.assertIs(self.repo.get_by_attribute("email", "j@example.com"), self.jane)
+
+        self.john.update_profile("John", "Doe", "jd@example.com")
+        self.assertIs(self.repo.get_by_attribute("email", "jd@example.com"), self.john)
+
+    def test_only_indexed_attributes_reindex(self):
+        with mock.patch.object(self.repo, "reindex") as reindex:
+            self.john.first_name = "Johnny"
+            self.john.save()
+            reindex.assert_not_called()
+            self.john.email = "johnny@example.com"
+            reindex.assert_called_once_with(self.john, "email")
+
+    def test_index_follows_delete(self):
+        self.repo.delete(self.john.id)
+        self.assertIsNone(self.repo.get_by_attribute("email", "john@example.com"))
+        # A deleted object no longer updates the index
+        self.john.email = "ghost@example.com"
+        self.assertIsNone(self.repo.get_by_attribute("email", "ghost@example.com"))
+
+    def test_property_setter_index(self):
+        places = InMemoryRepository(indexes=["price"])
+        place = Place("Loft", "", 100, 45.0, 6.0, self.john)
+        places.add(place)
+        place.price = 80
+        self.assertEqual(places.get_all_by_attribute("price", 80), [place])
+        self.assertEqual(places.get_all_by_attribute("price", 100), [])
+        # A rejected value leaves the index untouched
+        with self.assertRaises(ValueError):
+            place.price = -1
+        self.assertEqual(places.get_all_by_attribute("price", 80), [place])
+
+
+class TestInMemoryRepositoryRange(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository(sorted_indexes=["price"])
+        self.owner = User("John", "Doe", "john@example.com", "secret12")
+        self.places = {}
+        for title, price in (("A", 40), ("B", 120), ("C", 75), ("D", 75), ("E", 200)):
+            self.places[title] = Place(title, "", price, 45.0, 6.0, self.owner)
+            self.repo.add(self.places[title])
+
+    def titles(self, places):
+        return [p.title for p in places]
+
+    def test_range_bounds_limit_reverse(self):
+        # Equal prices are ordered by id
+        ties = sorted(["C", "D"], key=lambda t: self.places[t].id)
+        self.assertEqual(self.titles(self.repo.range("price", 50, 120)), ties + ["B"])
+        self.assertEqual(self.titles(self.repo.range("price", hi=75))[0], "A")
+        self.assertEqual(self.titles(self.repo.range("price", lo=100, limit=1)), ["B"])
+        self.assertEqual(self.titles(self.repo.range("price", reverse=True, limit=2)), ["E", "B"])
+        self.assertEqual(self.repo.range("price", 300), [])
+
+    def test_range_follows_writes(self):
+        self.places["E"].price = 50
+        self.repo.update(self.places["A"].id, {"price": 500})
+        self.repo.delete(self.places["B"].id)
+        prices = [p.price for p in self.repo.range("price")]
+        self.assertEqual(prices, [50, 75, 75, 500])
+
+    def test_range_needs_sorted_index(self):
+        with self.assertRaises(ValueError):
+            self.repo.range("title")
+
+
+class TestConcurrentInMemoryRepository(unittest.TestCase):
+
+    WRITERS = 4
+    READERS = 8
+    PLACES_PER_WRITER = 300
+
+    def setUp(self):
+        self.repo = ConcurrentInMemoryRepository(indexes=["title"], sorted_indexes=["price"])
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def writer(self, n):
+        owner = User("Writer", str(n), f"writer{n}@example.com", "secret12")
+        places = []
+        for i in range(self.PLACES_PER_WRITER):
+            place = Place(f"w{n}", "", i % 50, 45.0, 6.0, owner)
+            self.repo.add(place)
+            places.append(place)
+            if i % 3 == 0:
+                places[i // 2].price = 100 + i
+            if i % 4 == 0:
+                self.repo.delete(places[i // 4].id)
+
+    def check_snapshot(self, snapshot):
+        objects = snapshot.get_all()
+        entries = snapshot._sorted["price"]
+        assert {p.id for p in objects} == {i for _, i in entries}, "index out of sync"
+        assert len(objects) == len(entries), "duplicate index entries"
+        # range() skips the objects repriced since the snapshot
+        assert len(snapshot.range("price")) <= len(entries), "duplicate range results"
+        titled = sum(len(snapshot.get_all_by_attribute("title", f"w{n}"))
+                     for n in range(self.WRITERS))
+        assert titled == len(objects), "hash index out of sync"
+
+    def test_stress_readers_and_writers(self):
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            try:
+                while not done.is_set():
+                    self.check_snapshot(self.repo.snapshot())
+                    everything = self.repo.get_all()
+                    self.assertIsInstance(everything, tuple)
+                    for place in everything[:5]:
+                        # None if deleted since get_all()
+                        self.assertIn(self.repo.get(place.id), (place, None))
+            except Exception as e:  # reported by the main thread
+                errors.append(e)
+
+        readers = [threading.Thread(target=reader) for _ in range(self.READERS)]
+        writers = [threading.Thread(target=self.writer, args=(n,)) for n in range(self.WRITERS)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.check_snapshot(self.repo.snapshot())
+        deleted = len(range(0, self.PLACES_PER_WRITER, 4))
+        self.assertEqual(len(self.repo.get_all()),
+                         self.WRITERS * (self.PLACES_PER_WRITER - deleted))
+        prices = [p.price for p in self.repo.range("price")]
+        self.assertEqual(prices, sorted(p.price for p in self.repo.get_all()))
+
+    def test_snapshot_is_isolated(self):
+        owner = User("John", "Doe", "john@example.com", "secret12")
+        first = Place("A", "", 10, 45.0, 6.0, owner)
+        self.repo.add(first)
+        snapshot = self.repo.snapshot()
+        self.repo.add(Place("B", "", 20, 45.0, 6.0, owner))
+        self.repo.delete(first.id)
+        self.assertEqual([p.title for p in snapshot.get_all()], ["A"])
+        self.assertEqual([p.title for p in self.repo.get_all()], ["B"])
+
+    def test_old_snapshot_skips_changed_objects(self):
+        owner = User("John", "Doe", "john@example.com", "secret12")
+        place = Place("A", "", 10, 45.0, 6.0, owner)
+        self.repo.add(place)
+        snapshot = self.repo.snapshot()
+        place.price = 90
+        self.repo.update(place.id, {"title": "B", "price": 95})
+        # The object is no longer returned under the values it left
+        self.assertEqual(snapshot.get_all_by_attribute("title", "A"), [])
+        self.assertIsNone(snapshot.get_by_attribute("title", "A"))
+        self.assertEqual(snapshot.range("price", 0, 50), [])
+        self.assertEqual(self.repo.get_all_by_attribute("title", "B"), [place])
+        self.assertEqual(self.repo.range("price", 95, 95), [place])
+
+    def test_update_is_one_write(self):
+        owner = User("John", "Doe", "john@example.com", "secret12")
+        place = Place("A", "", 10, 45.0, 6.0, owner)
+        self.repo.add(place)
+        copy = InMemoryRepository.copy
+        with mock.patch.object(InMemoryRepository, "copy", autospec=True,
+                               side_effect=copy) as copies:
+            self.repo.update(place.id, {"title": "B", "price": 20})
+        # Both index moves published together, with a single copy
+        self.assertEqual(copies.call_count, 1)
+        after = self.repo.snapshot()
+        self.assertEqual(after.get_all_by_attribute("title", "B"), [place])
+        self.assertEqual(after.range("price", 20, 20), [place])
+        with self.assertRaises(ValueError):
+            self.repo.update(place.id, {"title": "C", "price": -1})
+        # The change applied before the error is indexed
+        self.assertEqual(self.repo.get_all_by_attribute("title", "C"), [place])
+
+    def test_copy_copies_each_bucket_once(self):
+        owner = User("John", "Doe", "john@example.com", "secret12")
+        self.repo.add(Place("A", "", 10, 45.0, 6.0, owner))
+        snapshot = self.repo.snapshot()
+        # add_many() writes the same shared bucket many times
+        self.repo.add_many([Place("A", "", i, 45.0, 6.0, owner) for i in range(50)])
+        self.assertEqual(len(snapshot.get_all_by_attribute("title", "A")), 1)
+        self.assertEqual(len(self.repo.get_all_by_attribute("title", "A")), 51)
+
+        clone = snapshot.copy()
+        bucket = clone._bucket("title", "A")
+        self.assertIsNot(bucket, snapshot._indexes["title"]["A"])
+        self.assertIs(clone._bucket("title", "A"), bucket)
+
+
+if __name__ == '__main__':
+    unittest.main()
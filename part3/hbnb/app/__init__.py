@@ -5,7 +5,9 @@ Creates and configures the Flask application instance
 for the HBnB project.
 """
 
-from flask import Flask
+import time
+
+from flask import Flask, g, has_request_context
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
@@ -28,6 +30,29 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor.execute("PRAGMA foreign_keys=ON;")
         cursor.close()
 
+
+# Compteur de requêtes SQL par requête HTTP (détection des N+1)
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_sql_timer(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, dropped with it if the statement fails
+    context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_sql_statement(conn, cursor, statement, parameters, context,
+                         executemany):
+    elapsed = time.perf_counter() - context._query_start_time
+    if has_request_context():
+        g.sql_queries = g.get("sql_queries", 0) + 1
+        g.sql_time = g.get("sql_time", 0.0) + elapsed
+
+
+def _add_sql_stats_headers(response):
+    """Expose the SQL statement count and DB time of the request."""
+    response.headers["X-SQL-Queries"] = str(g.get("sql_queries", 0))
+    response.headers["X-SQL-Time-ms"] = f"{g.get('sql_time', 0.0) * 1000:.2f}"
+    return response
+
 from app.api import api_bp
 
 
@@ -47,13 +72,40 @@ def create_app(config_class="config.DevelopmentConfig"):
     app.config.from_object(config_class)
     print(">>> USING DATABASE:", app.config["SQLALCHEMY_DATABASE_URI"])
 
-    CORS(app)
+    # Link (next page) readable by the front-end, another origin
+    CORS(app, expose_headers=['Link'])
     bcrypt.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
 
+    # X-SQL-Queries / X-SQL-Time-ms headers, in debug and testing by default
+    sql_stats_headers = app.config.get('SQL_STATS_HEADERS')
+    if sql_stats_headers is None:
+        sql_stats_headers = app.debug or app.testing
+    if sql_stats_headers:
+        app.after_request(_add_sql_stats_headers)
+
+    # One COMMIT per request instead of one per mutation (opt-out in config)
+    if app.config.get('UNIT_OF_WORK_PER_REQUEST', True):
+        from app.persistence import unit_of_work
+        unit_of_work.init_app(app)
+
+    # Read-through cache of repository get() (see REPOSITORY_CACHE)
+    from app.persistence import cache
+    cache.init_app(app)
+
+    # Serialized GET responses (see RESPONSE_CACHE_MAX_BYTES)
+    from app.services import response_cache
+    response_cache.init_app(app)
+
     with app.app_context():
         db.create_all()
+        if app.config.get('FULLTEXT_SEARCH', True):
+            from app.persistence import fulltext
+            fulltext.create_places_index(db.engine)
+        if app.config.get('SPATIAL_INDEX', True):
+            from app.persistence import spatial
+            spatial.create_places_index(db.engine)
 
     from app.services import facade
     # Reset uniquement en mode Test
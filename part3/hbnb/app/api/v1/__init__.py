@@ -9,9 +9,13 @@ It registers all available namespaces such as:
 - Places
 - Reviews
 - Amenities
+- Stats
 
 All routes defined in this version will be prefixed with:
     /api/v1/
+
+JSON responses are encoded by app.api.v1.serializers (orjson when
+installed).
 """
 
 from flask_restx import Api
@@ -23,6 +27,8 @@ from app.api.v1.places import api as places_ns
 from app.api.v1.reviews import api as reviews_ns
 from app.api.v1.amenities import api as amenities_ns
 from app.api.v1.auth import api as auth_ns
+from app.api.v1.stats import api as stats_ns
+from app.api.v1.serializers import output_json
 
 #Decclaration du schema JWT pour le bouton Authorize dans Swagger
 authorizations = {
@@ -44,6 +50,8 @@ api = Api(
     authorizations=authorizations,
     security=[{'Bearer': []}]
 )
+# Shared JSON encoder of every endpoint (see serializers.dumps())
+api.representation('application/json')(output_json)
 
 # Register namespaces with version prefix
 api.add_namespace(users_ns, path="/v1/users")
@@ -51,3 +59,4 @@ api.add_namespace(places_ns, path="/v1/places")
 api.add_namespace(reviews_ns, path="/v1/reviews")
 api.add_namespace(amenities_ns, path="/v1/amenities")
 api.add_namespace(auth_ns, path="/v1/auth")
+api.add_namespace(stats_ns, path="/v1/stats")
@@ -14,9 +14,25 @@ Access rules:
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt
 from app.services import facade
+from app.api.v1.caching import cached_response
+from app.api.v1.conditional import (
+    collection_version, is_conditional, not_modified, resource_version,
+    version_headers
+)
+from app.api.v1.fieldsets import FIELDS_HELP, Fieldset, column
+from app.api.v1.pagination import get_page_args, next_link_header
+from app.api.v1.serializers import register
 
 api = Namespace('amenities', description='Amenity operations')
 
+# Fields of the amenities returned (?fields= on GET /amenities/ and
+# /amenities/<id>)
+AMENITY_FIELDS = register('Amenity', 'detail', Fieldset({
+    name: column(name) for name in ('id', 'name', 'description')
+}))
+# Columns read by GET /amenities/: rows, no entities
+AMENITY_LIST_COLUMNS = AMENITY_FIELDS.columns()
+
 # Define the amenity model for input validation and documentation
 amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity'),
@@ -50,30 +66,41 @@ class AmenityList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
-        return {
-            'id': new_amenity.id,
-            'name': new_amenity.name,
-            'description': new_amenity.description
-        }, 201
+        return AMENITY_FIELDS.dump(new_amenity), 201
 
+    @api.doc(params={'limit': 'Page size', 'after': 'Cursor of the next page',
+                     'fields': FIELDS_HELP})
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'Amenities not modified')
+    @api.response(400, 'Invalid pagination parameters or fields')
+    @cached_response(lambda data: ['amenities'])
     def get(self):
         """
-        Retrieve all amenities.
+        Retrieve a page of amenities.
 
         Returns:
-            list: A list of all amenities
-            int: HTTP status code 200
+            list: A page of amenities
+            int: HTTP status code 200 (304 if the ETag sent still matches)
+            dict: `Link: rel="next"` header when more amenities exist,
+                ETag and Last-Modified
         """
-        amenities = facade.get_all_amenities()
-        return [
-            {
-                'id': a.id,
-                'name': a.name,
-                'description': a.description
-            }
-            for a in amenities
-        ], 200
+        etag, last_modified = collection_version(
+            'amenities', facade.get_amenities_version())
+        response = not_modified(etag, last_modified)
+        if response:
+            return response
+
+        try:
+            names = AMENITY_FIELDS.requested()
+            after, limit = get_page_args()
+            amenities, next_cursor = facade.get_amenities_page(
+                after, limit, columns=AMENITY_FIELDS.columns(names))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return AMENITY_FIELDS.dump_many(amenities, names), 200, {
+            **next_link_header(next_cursor),
+            **version_headers(etag, last_modified)}
 
 
 @api.route('/<amenity_id>')
@@ -85,7 +112,10 @@ class AmenityResource(Resource):
     an amenity by its ID.
     """
 
+    @api.doc(params={'fields': FIELDS_HELP})
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Amenity not modified')
+    @api.response(400, 'Invalid fields')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """
@@ -96,20 +126,34 @@ class AmenityResource(Resource):
 
         Returns:
             dict: The amenity details (id and name)
-            int: HTTP status code 200 on success
+            int: HTTP status code 200 on success, 304 if the
+                ETag / Last-Modified sent still match
 
         Raises:
+            400 Bad Request: If fields names an unknown field
             404 Not Found: If the amenity does not exist
         """
+        try:
+            names = AMENITY_FIELDS.requested()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # One column read: no amenity is loaded for a 304
+        updated_at = (is_conditional()
+                      and facade.get_amenity_updated_at(amenity_id))
+        if updated_at:
+            response = not_modified(*resource_version(
+                ('amenity', amenity_id, names), updated_at))
+            if response:
+                return response
+
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
 
-        return {
-            'id': amenity.id,
-            'name': amenity.name,
-            'description': amenity.description
-        }, 200
+        return AMENITY_FIELDS.dump(amenity, names), 200, version_headers(
+            *resource_version(('amenity', amenity.id, names),
+                              amenity.updated_at))
 
     @jwt_required()
     @api.expect(amenity_model, validate=True)
@@ -0,0 +1,66 @@
+"""
+Response cache decorator for the API v1 public read endpoints.
+
+    @cached_response(lambda data, place_id: [f"place:{place_id}"])
+    def get(self, place_id): ...
+
+The first 200 response of a URL is serialized once and stored with
+its headers (ETag, Link, ...) and tags (see app.services.response_cache).
+Next requests are answered from the stored bytes: no SQL, no
+serialization, and a 304 when the client's ETag still matches.
+Responses carry an `X-Cache: HIT` or `X-Cache: MISS` header.
+"""
+
+from functools import wraps
+
+from flask import Response, request
+from flask_restx.utils import unpack
+
+from app.api.v1.serializers import dumps
+from app.services import response_cache
+
+
+def cached_response(tags):
+    """
+    Serve a resource GET method from the response cache.
+
+    Args:
+        tags (callable): tags(data, **view_args) returning the tags
+            of a 200 response body (data is the object before JSON
+            encoding, view_args the URL parameters like place_id).
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if not response_cache.enabled():
+                return method(*args, **kwargs)
+
+            key = request.url
+            entry = response_cache.get(key)
+            if entry is not None:
+                return _respond(entry.body, entry.headers, 'HIT')
+
+            version = response_cache.version()
+            result = method(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            data, code, headers = unpack(result)
+            if code != 200:
+                return result
+
+            # Same bytes as the API representation sends
+            body = dumps(data)
+            headers = list(headers.items())
+            response_cache.put(key, body, headers, tags(data, **kwargs),
+                               version)
+            return _respond(body, headers, 'MISS')
+        return wrapper
+    return decorator
+
+
+def _respond(body, headers, status):
+    response = Response(body, status=200, headers=headers,
+                        mimetype='application/json')
+    response.headers['X-Cache'] = status
+    # 304 when If-None-Match / If-Modified-Since still match
+    return response.make_conditional(request)
@@ -0,0 +1,101 @@
+"""
+Conditional GET helpers for the API v1 read endpoints.
+
+Every read response carries validators:
+- ETag          : strong, hash of the resource key and timestamps
+- Last-Modified : the most recent updated_at involved
+- Cache-Control : no-cache (clients may store, but must revalidate)
+
+A request sending them back (If-None-Match, or If-Modified-Since
+without If-None-Match) gets a bodyless 304 when nothing changed.
+Endpoints check the validators from a cheap version query (one
+updated_at, or count + max(updated_at) of a collection) before
+loading or serializing anything.
+"""
+
+import hashlib
+from datetime import timezone
+
+from flask import Response, request
+from werkzeug.http import http_date, is_resource_modified
+
+
+def resource_version(key, *timestamps):
+    """
+    Compute the validators of a resource.
+
+    Args:
+        key (tuple): What identifies the representation (like
+            ('place', id), or a collection name, the query string
+            and the row count).
+        *timestamps (datetime or None): updated_at values it depends on.
+
+    Returns:
+        tuple: (etag, last_modified), last_modified is None
+        without timestamps.
+    """
+    stamps = [_utc(stamp) for stamp in timestamps if stamp is not None]
+    digest = hashlib.sha1(
+        repr((key, [stamp.isoformat() for stamp in stamps])).encode()
+    ).hexdigest()
+    return digest, max(stamps, default=None)
+
+
+def collection_version(name, *versions):
+    """
+    Compute the validators of a list endpoint response.
+
+    Args:
+        name (str): Name of the collection.
+        *versions (tuple): (count, max updated_at) of every table the
+            response depends on (see get_collection_version()).
+
+    The query string (page, filters, sort) is part of the key: each
+    URL has its own ETag.
+
+    Returns:
+        tuple: (etag, last_modified), see resource_version().
+    """
+    counts = tuple(count for count, _ in versions)
+    return resource_version((name, request.query_string, counts),
+                            *(updated_at for _, updated_at in versions))
+
+
+def is_conditional():
+    """True if the request carries If-None-Match or If-Modified-Since."""
+    return ('If-None-Match' in request.headers
+            or 'If-Modified-Since' in request.headers)
+
+
+def not_modified(etag, last_modified):
+    """
+    Answer a conditional request whose validators still match.
+
+    Returns:
+        Response or None: a 304 response, or None when the
+        representation changed (or the request is unconditional).
+    """
+    if not is_conditional() or is_resource_modified(
+            request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return Response(status=304, headers=version_headers(etag, last_modified))
+
+
+def version_headers(etag, last_modified):
+    """
+    Build the validator headers of a 200 (or 304) response.
+
+    Returns:
+        dict: ETag, Last-Modified (when known) and Cache-Control.
+    """
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+def _utc(stamp):
+    # SQLite returns naive datetimes: every timestamp is stored in UTC
+    if stamp.tzinfo is None:
+        return stamp.replace(tzinfo=timezone.utc)
+    return stamp.astimezone(timezone.utc)
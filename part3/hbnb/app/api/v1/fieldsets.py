@@ -0,0 +1,145 @@
+"""
+Sparse fieldsets for the API v1 read endpoints.
+
+    GET /api/v1/places/?fields=id,title,price
+
+Every read endpoint declares the fields of its items as a Fieldset:
+each field names the columns it reads and how its value is computed.
+The fields asked with ?fields= (all of them by default) drive both
+the SQL side — the columns of a list projection, the relationships
+and deferred columns loaded by a detail endpoint — and the keys of
+the response items. An unknown field name gets a 400.
+
+Items are serialized by dump functions generated from the fields
+(see app.api.v1.serializers): columns are read as plain attributes
+in one dict display, only computed fields are called.
+"""
+
+from collections import namedtuple
+from operator import attrgetter
+
+from flask import request
+
+# Description of the ?fields= parameter in the Swagger docs
+FIELDS_HELP = 'Comma-separated fields to return (default: all)'
+
+# One field: the columns (or relationships) it reads, and its value
+# from an item: Field(("review_count",), lambda p: p.review_count).
+# path is set for plain attributes, read inline by dump functions.
+Field = namedtuple("Field", ["columns", "get", "path"], defaults=[None])
+
+
+def column(name, path=None):
+    """
+    Field holding the value of one column.
+
+    Args:
+        name (str): Column name.
+        path (str, optional): Dotted attribute path of the value in
+            the item, when the entity is wrapped (like 'place.title'
+            in a search result). Defaults to name.
+    """
+    path = path or name
+    if not all(part.isidentifier() for part in path.split(".")):
+        raise ValueError(f"Invalid attribute path: {path}")
+    return Field((name,), attrgetter(path), path)
+
+
+class Fieldset:
+    """
+    The fields of the items of one endpoint, in response order.
+
+    Example:
+        USER_FIELDS = Fieldset({
+            'id': column('id'),
+            'first_name': column('first_name'),
+        })
+        names = USER_FIELDS.requested()          # ?fields=
+        rows = ....get_all_columns(USER_FIELDS.columns(names))
+        items = USER_FIELDS.dump_many(rows, names)
+    """
+
+    def __init__(self, fields):
+        self.fields = dict(fields)
+        self.names = tuple(self.fields)
+        # Compiled dump functions by (names, many): at most two per
+        # subset of the fields
+        self._dumpers = {}
+
+    def requested(self):
+        """
+        Read the ?fields= query parameter.
+
+        Returns:
+            tuple: Field names, in response order (every field when
+            the parameter is absent).
+
+        Raises:
+            ValueError: If a name is unknown, or none is given.
+        """
+        value = request.args.get('fields')
+        if value is None:
+            return self.names
+        names = {name.strip() for name in value.split(',') if name.strip()}
+        if not names:
+            raise ValueError("fields must name at least one field")
+        unknown = sorted(names.difference(self.fields))
+        if unknown:
+            raise ValueError(f"Unknown field: {unknown[0]}")
+        return tuple(name for name in self.names if name in names)
+
+    def columns(self, names=None):
+        """Columns read by the fields names (every field by default)."""
+        return tuple(dict.fromkeys(
+            column for name in (names or self.names)
+            for column in self.fields[name].columns))
+
+    def dump(self, item, names=None):
+        """Serialize an item (entity or row) with the fields names."""
+        return self.dumper(names or self.names)(item)
+
+    def dump_many(self, items, names=None):
+        """Serialize a list of items with the fields names."""
+        return self.dumper(names or self.names, many=True)(items)
+
+    def dumper(self, names, many=False):
+        """
+        Dump function of the fields names, compiled on first use.
+
+        Returns:
+            callable: dump(item) -> dict, or dump(items) -> list of
+            dicts when many is True.
+        """
+        key = (names, many)
+        dumper = self._dumpers.get(key)
+        if dumper is None:
+            dumper = self._dumpers[key] = _compile(self.fields, names, many)
+        return dumper
+
+
+def _compile(fields, names, many):
+    """
+    Generate the dump function of the fields names.
+
+    For fields {'id': column('id'), 'rating': Field(..., get)} the
+    generated code is:
+
+        def dump(items):
+            return [{'id': item.id, 'rating': _get1(item)} for item in items]
+    """
+    namespace = {}
+    values = []
+    for index, name in enumerate(names):
+        field = fields[name]
+        if field.path is not None:
+            values.append(f"{name!r}: item.{field.path}")
+        else:
+            namespace[f"_get{index}"] = field.get
+            values.append(f"{name!r}: _get{index}(item)")
+    body = "{" + ", ".join(values) + "}"
+    if many:
+        source = f"def dump(items):\n    return [{body} for item in items]\n"
+    else:
+        source = f"def dump(item):\n    return {body}\n"
+    exec(compile(source, f"<dump {','.join(names)}>", "exec"), namespace)
+    return namespace["dump"]
@@ -0,0 +1,78 @@
+"""
+Pagination helpers for the API v1 list endpoints.
+
+List endpoints accept two query parameters:
+- limit : page size (defaults to PAGE_SIZE_DEFAULT, capped at PAGE_SIZE_MAX)
+- after : opaque cursor returned by the previous page
+
+The response body stays a JSON list. When more results exist,
+the URL of the next page is returned in a `Link: <...>; rel="next"`
+header.
+"""
+
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+
+def get_page_args(prefix=''):
+    """
+    Read and validate the pagination query parameters.
+
+    Args:
+        prefix (str): Prefix of the parameter names, for a list
+            embedded in another resource (like 'reviews_' for
+            reviews_limit / reviews_after).
+
+    Returns:
+        tuple: (after, limit).
+
+    Raises:
+        ValueError: If limit is not a positive integer.
+    """
+    limit = request.args.get(f'{prefix}limit')
+    if limit is None:
+        limit = current_app.config.get('PAGE_SIZE_DEFAULT', 20)
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError(f"{prefix}limit must be a positive integer")
+        if limit < 1:
+            raise ValueError(f"{prefix}limit must be a positive integer")
+    limit = min(limit, current_app.config.get('PAGE_SIZE_MAX', 100))
+
+    return request.args.get(f'{prefix}after') or None, limit
+
+
+def next_link_header(next_cursor):
+    """
+    Build the response headers pointing to the next page.
+
+    Args:
+        next_cursor (str or None): Cursor of the next page.
+
+    Returns:
+        dict: {'Link': ...} or an empty dict on the last page.
+    """
+    if next_cursor is None:
+        return {}
+    return {'Link': f'<{next_page_url(next_cursor)}>; rel="next"'}
+
+
+def next_page_url(next_cursor, prefix=''):
+    """
+    Build the URL of the next page: the current URL with the cursor.
+
+    Args:
+        next_cursor (str or None): Cursor of the next page.
+        prefix (str): Prefix of the cursor parameter (see get_page_args()).
+
+    Returns:
+        str or None: None on the last page.
+    """
+    if next_cursor is None:
+        return None
+    args = request.args.to_dict()
+    args[f'{prefix}after'] = next_cursor
+    return f'{request.base_url}?{urlencode(args)}'
@@ -8,16 +8,130 @@ and integrates with the business logic layer via the HBnBFacade.
 Acces rules:
 - POST /    : Authenticated (owner_id = current user)
 - GET /     : Public
-- GET /<id> : Public
+- GET /search : Public
+- GET /nearby : Public
+- GET /<id> : Public (?include=reviews,review_authors embeds reviews)
 - GET /<id> : Owner OR Admin
 """
 
+import math
+from collections import namedtuple
+from operator import attrgetter
+
+from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.api.v1.caching import cached_response
+from app.api.v1.conditional import (
+    collection_version, is_conditional, not_modified, resource_version,
+    version_headers
+)
+from app.api.v1.fieldsets import FIELDS_HELP, Field, Fieldset, column
+from app.api.v1.pagination import (
+    get_page_args, next_link_header, next_page_url
+)
+from app.api.v1.serializers import register
 
 api = Namespace('places', description='Place operations')
 
+
+def _average_rating(place):
+    """Place.average_rating, from the rating_average column (rows)."""
+    return round(place.rating_average, 2) if place.review_count else None
+
+
+# Columns of the summary of a place in list endpoints
+_SUMMARY_COLUMNS = ('id', 'title', 'price', 'latitude', 'longitude',
+                    'review_count')
+_AVERAGE_RATING_COLUMNS = ('review_count', 'rating_average')
+
+# Fields of GET /places/ (?fields=)
+PLACE_LIST_FIELDS = register('Place', 'list', Fieldset({
+    **{name: column(name) for name in _SUMMARY_COLUMNS},
+    'average_rating': Field(_AVERAGE_RATING_COLUMNS, _average_rating),
+}))
+# Columns read by GET /places/: rows, no Place entities
+PLACE_LIST_COLUMNS = PLACE_LIST_FIELDS.columns()
+
+# Fields of GET /places/search (items are PlaceMatch)
+PLACE_MATCH_FIELDS = register('Place', 'search', Fieldset({
+    **{name: column(name, f'place.{name}') for name in _SUMMARY_COLUMNS},
+    'average_rating': Field(_AVERAGE_RATING_COLUMNS,
+                            lambda m: _average_rating(m.place)),
+    'title_highlight': Field((), attrgetter('title_highlight'),
+                             'title_highlight'),
+    'snippet': Field((), attrgetter('snippet'), 'snippet'),
+}))
+
+# Fields of GET /places/nearby (items are PlaceDistance)
+PLACE_DISTANCE_FIELDS = register('Place', 'nearby', Fieldset({
+    **{name: column(name, f'place.{name}') for name in _SUMMARY_COLUMNS},
+    'average_rating': Field(_AVERAGE_RATING_COLUMNS,
+                            lambda r: _average_rating(r.place)),
+    'distance_km': Field((), lambda r: round(r.distance_km, 3)),
+}))
+
+# Response of POST /places/
+PLACE_CREATED_FIELDS = register('Place', 'created', Fieldset({
+    name: column(name) for name in (
+        'id', 'title', 'description', 'price', 'latitude', 'longitude',
+        'owner_id')
+}))
+
+# Owner and amenities nested in GET /places/<id>
+OWNER_FIELDS = register('User', 'owner', Fieldset({
+    name: column(name) for name in ('id', 'first_name', 'last_name', 'email')
+}))
+PLACE_AMENITY_FIELDS = register('Amenity', 'summary', Fieldset({
+    name: column(name) for name in ('id', 'name')
+}))
+
+# Fields of GET /places/<id>: owner and amenities are relationships
+PLACE_FIELDS = register('Place', 'detail', Fieldset({
+    **{name: column(name) for name in (
+        'id', 'title', 'description', 'price', 'latitude', 'longitude')},
+    'owner': Field(('owner',), lambda p: (
+        OWNER_FIELDS.dump(p.owner) if p.owner else None)),
+    'amenities': Field(('amenities',),
+                       lambda p: PLACE_AMENITY_FIELDS.dump_many(p.amenities)),
+    'review_count': column('review_count'),
+    'average_rating': Field(('review_count', 'rating_sum'),
+                            attrgetter('average_rating'), 'average_rating'),
+    'rating_histogram': Field(
+        tuple(f'rating_{rating}_count' for rating in range(1, 6)),
+        attrgetter('rating_histogram'), 'rating_histogram'),
+}))
+# What GET /places/<id> loads only when a field reads it:
+# relationships and deferred columns
+PLACE_ON_DEMAND = ('owner', 'amenities', 'description')
+
+# Fields of GET /places/<id>/reviews
+REVIEW_FIELDS = register('Review', 'by_place', Fieldset({
+    name: column(name)
+    for name in ('id', 'text', 'rating', 'user_id', 'place_id')
+}))
+# Columns read by GET /places/<id>/reviews
+REVIEW_LIST_COLUMNS = REVIEW_FIELDS.columns()
+# Relations GET /places/<id>?include= accepts (owner and amenities
+# follow ?fields=, review_authors implies reviews)
+PLACE_INCLUDES = ('owner', 'amenities', 'reviews', 'review_authors')
+# Review authors embedded by include=review_authors
+REVIEW_AUTHOR_FIELDS = register('User', 'author', Fieldset({
+    name: column(name) for name in ('id', 'first_name', 'last_name')
+}))
+REVIEW_AUTHOR_COLUMNS = REVIEW_AUTHOR_FIELDS.columns()
+
+# One review embedded by include=reviews, with its author row (None
+# when authors are not included, or the author is gone)
+_EmbeddedReview = namedtuple('_EmbeddedReview', ['review', 'author'])
+EMBEDDED_REVIEW_FIELDS = register('Review', 'embedded', Fieldset({
+    **{name: column(name, f'review.{name}')
+       for name in ('id', 'text', 'rating', 'user_id')},
+    'user': Field((), lambda r: (
+        REVIEW_AUTHOR_FIELDS.dump(r.author) if r.author else None)),
+}))
+
 # -----------------------------
 # Related entity models
 # -----------------------------
@@ -81,62 +195,363 @@ class PlaceList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
-        return {
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'price': place.price,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-            'owner_id': place.owner.id
-        }, 201
-
+        return PLACE_CREATED_FIELDS.dump(place), 201
+
+    @api.doc(params={
+        'limit': 'Page size',
+        'after': 'Cursor of the next page',
+        'min_price': 'Minimum price per night',
+        'max_price': 'Maximum price per night',
+        'amenities': 'Comma-separated amenity IDs (places must have all)',
+        'bbox': 'Bounding box: min_lon,min_lat,max_lon,max_lat',
+        'sort': 'price | rating | newest (default: oldest first)',
+        'fields': FIELDS_HELP
+    })
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(304, 'Places not modified')
+    @api.response(400, 'Invalid pagination, filter parameters or fields')
+    @cached_response(lambda data: _places_list_tags())
+    def get(self):
+        """Retrieve a page of places, filtered and sorted. Public endpoint."""
+        versions = [facade.get_places_version()]
+        if request.args.get('amenities'):
+            # Deleting an amenity unlinks places without touching them
+            versions.append(facade.get_amenities_version())
+        etag, last_modified = collection_version('places', *versions)
+        response = not_modified(etag, last_modified)
+        if response:
+            return response
+
+        try:
+            names = PLACE_LIST_FIELDS.requested()
+            after, limit = get_page_args()
+            places, next_cursor = facade.search_places(
+                after=after, limit=limit,
+                columns=PLACE_LIST_FIELDS.columns(names),
+                **_get_search_args())
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return PLACE_LIST_FIELDS.dump_many(places, names), 200, {
+            **next_link_header(next_cursor),
+            **version_headers(etag, last_modified)}
+
+
+def _places_list_tags():
+    """Response cache tags of GET /places/."""
+    if request.args.get('amenities'):
+        return ['places:list', 'amenities']
+    return ['places:list']
+
+
+def _get_price_args():
+    """Read the min_price / max_price query parameters."""
+    args = {}
+    for name in ('min_price', 'max_price'):
+        if request.args.get(name):
+            try:
+                args[name] = float(request.args[name])
+            except ValueError:
+                raise ValueError(f"{name} must be a non-negative number")
+            # float() accepts 'nan' and 'inf'
+            if not math.isfinite(args[name]):
+                raise ValueError(f"{name} must be a non-negative number")
+    return args
+
+
+def _get_search_args():
+    """
+    Read the filter and sort query parameters of GET /places/.
+
+    Returns:
+        dict: Keyword arguments of facade.search_places().
+
+    Raises:
+        ValueError: If a number cannot be parsed.
+    """
+    args = _get_price_args()
+
+    if request.args.get('amenities'):
+        args['amenity_ids'] = [
+            amenity_id.strip()
+            for amenity_id in request.args['amenities'].split(',')
+            if amenity_id.strip()
+        ]
+
+    if request.args.get('bbox'):
+        try:
+            args['bbox'] = tuple(
+                float(value) for value in request.args['bbox'].split(','))
+        except ValueError:
+            raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+
+    if request.args.get('sort'):
+        args['sort'] = request.args['sort']
+    return args
+
+# -----------------------------
+# Full-text search endpoint
+# -----------------------------
+
+@api.route('/search')
+class PlaceSearch(Resource):
+
+    @api.doc(params={
+        'q': 'Words to search in titles and descriptions',
+        'min_price': 'Minimum price per night',
+        'max_price': 'Maximum price per night',
+        'limit': 'Page size',
+        'after': 'Cursor of the next page',
+        'fields': FIELDS_HELP
+    })
+    @api.response(200, 'Matching places, best match first')
+    @api.response(304, 'Places not modified')
+    @api.response(400, 'Missing q or invalid parameters')
+    def get(self):
+        """Full-text search of places (BM25 ranking). Public endpoint."""
+        etag, last_modified = collection_version(
+            'places/search', facade.get_places_version())
+        response = not_modified(etag, last_modified)
+        if response:
+            return response
+
+        try:
+            names = PLACE_MATCH_FIELDS.requested()
+            after, limit = get_page_args()
+            matches, next_cursor = facade.search_places_text(
+                request.args.get('q', ''), after=after, limit=limit,
+                columns=PLACE_MATCH_FIELDS.columns(names),
+                **_get_price_args())
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return PLACE_MATCH_FIELDS.dump_many(matches, names), 200, {
+            **next_link_header(next_cursor),
+            **version_headers(etag, last_modified)}
+
+def _get_nearby_args():
+    """
+    Read the lat / lon / radius_km query parameters of GET /nearby.
+
+    Returns:
+        tuple: (latitude, longitude, radius_km), radius defaults to 10.
+
+    Raises:
+        ValueError: If lat or lon is missing, or a value is not a finite
+            number.
+    """
+    values = []
+    for name, default in (('lat', None), ('lon', None), ('radius_km', 10)):
+        value = request.args.get(name) or default
+        if value is None:
+            raise ValueError(f"{name} is required")
+        try:
+            values.append(float(value))
+        except ValueError:
+            raise ValueError(f"{name} must be a number")
+        # float() accepts 'nan' and 'inf'
+        if not math.isfinite(values[-1]):
+            raise ValueError(f"{name} must be a number")
+    return tuple(values)
+
+# -----------------------------
+# Nearby search endpoint
+# -----------------------------
+
+@api.route('/nearby')
+class PlaceNearby(Resource):
+
+    @api.doc(params={
+        'lat': 'Latitude of the center',
+        'lon': 'Longitude of the center',
+        'radius_km': 'Search radius in kilometers (default 10)',
+        'limit': 'Maximum number of places',
+        'fields': FIELDS_HELP
+    })
+    @api.response(200, 'Places within the radius, closest first')
+    @api.response(304, 'Places not modified')
+    @api.response(400, 'Invalid coordinates, radius or limit')
     def get(self):
-        """Retrieve a list of all places. Public endpoint."""
-        places = facade.get_all_places()
-        return [
-            {
-                'id': p.id,
-                'title': p.title,
-                'price': p.price,
-                'latitude': p.latitude,
-                'longitude': p.longitude
-            }
-            for p in places
-        ], 200
+        """Places near a point, ranked by distance. Public endpoint."""
+        etag, last_modified = collection_version(
+            'places/nearby', facade.get_places_version())
+        response = not_modified(etag, last_modified)
+        if response:
+            return response
+
+        try:
+            names = PLACE_DISTANCE_FIELDS.requested()
+            _, limit = get_page_args()
+            latitude, longitude, radius_km = _get_nearby_args()
+            results = facade.get_places_nearby(
+                latitude, longitude, radius_km, limit=limit,
+                max_radius_km=current_app.config.get('NEARBY_RADIUS_MAX_KM'),
+                columns=PLACE_DISTANCE_FIELDS.columns(names))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return (PLACE_DISTANCE_FIELDS.dump_many(results, names), 200,
+                version_headers(etag, last_modified))
 
 # -----------------------------
 # Single place endpoints
 # -----------------------------
 
+def _place_tags(place_id, data):
+    """Response cache tags of GET /places/<id>: place, owner, amenities."""
+    tags = [f'place:{place_id}']
+    if data.get('owner'):
+        tags.append(f"user:{data['owner']['id']}")
+    tags.extend(f"amenity:{amenity['id']}"
+                for amenity in data.get('amenities', ()))
+    tags.extend(f"user:{review['user']['id']}"
+                for review in data.get('reviews', ()) if review.get('user'))
+    return tags
+
+
+def _place_version(place_id, names, updated_at, owner_updated_at,
+                   amenity_count, amenities_updated_at, reviews=None):
+    """
+    Validators of GET /places/<id> (see facade.get_place_version()).
+
+    Only the relationships among the fields names are versioned.
+    reviews is the version of the embedded reviews (see
+    facade.get_place_reviews_version()); the query string is then
+    part of the key, each page of reviews has its own ETag.
+    """
+    if 'owner' not in names:
+        owner_updated_at = None
+    if 'amenities' not in names:
+        amenity_count = amenities_updated_at = None
+    key = ('place', place_id, names, amenity_count)
+    timestamps = [updated_at, owner_updated_at, amenities_updated_at]
+    if reviews is not None:
+        count, *stamps = reviews
+        key += (request.query_string, count)
+        timestamps += stamps
+    return resource_version(key, *timestamps)
+
+
+def _get_includes():
+    """
+    Read the include query parameter of GET /places/<id>.
+
+    Returns:
+        set: Names from PLACE_INCLUDES.
+
+    Raises:
+        ValueError: If a name is unknown.
+    """
+    names = {name.strip() for name in request.args.get('include', '').split(',')
+             if name.strip()}
+    unknown = sorted(names.difference(PLACE_INCLUDES))
+    if unknown:
+        raise ValueError(f"Unknown include: {unknown[0]}")
+    if 'review_authors' in names:
+        names.add('reviews')
+    return names
+
+
+def _embedded_reviews(place_id, after, limit, with_authors):
+    """
+    One page of the reviews of a place, for GET /places/<id>?include=reviews.
+
+    One SELECT for the page, one SELECT ... IN for its authors.
+
+    Returns:
+        dict: 'reviews' (list) and 'reviews_next' (URL of the next
+        page, None on the last one).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    reviews, next_cursor = facade.get_reviews_by_place_page(
+        place_id, after, limit, columns=REVIEW_LIST_COLUMNS)
+    names = EMBEDDED_REVIEW_FIELDS.names
+    authors = {}
+    if not with_authors:
+        names = tuple(name for name in names if name != 'user')
+    elif reviews:
+        authors = facade.get_users_by_ids(
+            {review.user_id for review in reviews}, REVIEW_AUTHOR_COLUMNS)
+
+    items = EMBEDDED_REVIEW_FIELDS.dump_many(
+        [_EmbeddedReview(review, authors.get(review.user_id))
+         for review in reviews], names)
+    return {'reviews': items,
+            'reviews_next': next_page_url(next_cursor, 'reviews_')}
+
+
 @api.route('/<place_id>')
 class PlaceResource(Resource):
 
+    @api.doc(params={
+        'include': 'Comma-separated: owner, amenities, reviews, review_authors',
+        'reviews_limit': 'Page size of the embedded reviews',
+        'reviews_after': 'Cursor of the next page of embedded reviews',
+        'fields': FIELDS_HELP})
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(304, 'Place not modified')
+    @api.response(400, 'Invalid include, pagination parameters or fields')
     @api.response(404, 'Place not found')
+    @cached_response(lambda data, place_id: _place_tags(place_id, data))
     def get(self, place_id):
-        """Get place details by ID, including owner and amenities.Public endpoint."""
-        place = facade.get_place(place_id)
+        """
+        Get place details by ID, including owner and amenities.
+        Public endpoint.
+
+        ?include=reviews embeds a page of reviews (reviews_limit,
+        reviews_after), review_authors their authors' names.
+        ?fields= selects the place fields: owner, amenities and
+        description are only loaded when asked.
+        """
+        try:
+            names = PLACE_FIELDS.requested()
+            includes = _get_includes()
+            reviews_after, reviews_limit = get_page_args('reviews_')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        with_reviews = 'reviews' in includes
+        with_authors = 'review_authors' in includes
+
+        # One SELECT of timestamps (two with reviews): nothing is
+        # loaded for a 304
+        version = is_conditional() and facade.get_place_version(place_id)
+        if version:
+            reviews_version = (facade.get_place_reviews_version(
+                place_id, with_authors) if with_reviews else None)
+            response = not_modified(*_place_version(
+                place_id, names, *version, reviews=reviews_version))
+            if response:
+                return response
+
+        # owner and description in the same SELECT, amenities in one
+        # SELECT ... IN, each only if a requested field reads it
+        columns = PLACE_FIELDS.columns(names)
+        place = facade.get_place(place_id, load=[
+            name for name in PLACE_ON_DEMAND if name in columns])
         if not place:
             return {'error': 'Place not found'}, 404
 
-        owner = facade.get_user(place.owner.id)
-        return {
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'price': place.price,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-            'owner': {
-                'id': owner.id,
-                'first_name': owner.first_name,
-                'last_name': owner.last_name,
-                'email': owner.email
-            } if owner else None,
-            'amenities': [{'id': a.id, 'name': a.name} for a in place.amenities]
-        }, 200
+        body = PLACE_FIELDS.dump(place, names)
+
+        reviews_version = None
+        if with_reviews:
+            reviews_version = facade.get_place_reviews_version(
+                place_id, with_authors)
+            try:
+                body.update(_embedded_reviews(
+                    place_id, reviews_after, reviews_limit, with_authors))
+            except ValueError as e:
+                return {'error': str(e)}, 400
+
+        owner = place.owner if 'owner' in names else None
+        amenities = place.amenities if 'amenities' in names else []
+        return body, 200, version_headers(*_place_version(
+            place.id, names, place.updated_at,
+            owner.updated_at if owner else None, len(amenities),
+            max((a.updated_at for a in amenities), default=None),
+            reviews=reviews_version))
 
     @jwt_required()
     @api.expect(place_update_model, validate=True)
@@ -155,7 +570,7 @@ class PlaceResource(Resource):
             return {'error': 'Place not found'}, 404
 
         # Admin bypasses ownership check
-        if not is_admin and place.owner.id != current_user:
+        if not is_admin and place.owner_id != current_user:
             return {'error': 'Unauthorized action'}, 403
 
         place_data = api.payload
@@ -183,7 +598,7 @@ class PlaceResource(Resource):
             return {'error': 'Place not found'}, 404
 
         # Admin bypasses ownership check
-        if not is_admin and place.owner.id != current_user:
+        if not is_admin and place.owner_id != current_user:
             return {'error': 'Unauthorized action'}, 403
 
         facade.delete_place(place_id)
@@ -192,20 +607,33 @@ class PlaceResource(Resource):
 @api.route('/<place_id>/reviews')
 class PlaceReviewList(Resource):
 
+    @api.doc(params={'limit': 'Page size', 'after': 'Cursor of the next page',
+                     'fields': FIELDS_HELP})
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(304, 'Reviews not modified')
+    @api.response(400, 'Invalid pagination parameters or fields')
     @api.response(404, 'Place not found')
+    @cached_response(lambda data, place_id: [f'place:{place_id}'])
     def get(self, place_id):
-        """Get all reviews for a specific place. Public endpoint."""
+        """Get a page of reviews for a specific place. Public endpoint."""
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
 
-        reviews = facade.get_reviews_by_place(place_id)
+        etag, last_modified = collection_version(
+            f'places/{place_id}/reviews', facade.get_reviews_version(place_id))
+        response = not_modified(etag, last_modified)
+        if response:
+            return response
+
+        try:
+            names = REVIEW_FIELDS.requested()
+            after, limit = get_page_args()
+            reviews, next_cursor = facade.get_reviews_by_place_page(
+                place_id, after, limit, columns=REVIEW_FIELDS.columns(names))
+        except ValueError as e:
+            return {'error': str(e)}, 400
 
-        return [{
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            "place_id": review.place.id
-        } for review in reviews], 200
+        return REVIEW_FIELDS.dump_many(reviews, names), 200, {
+            **next_link_header(next_cursor),
+            **version_headers(etag, last_modified)}
@@ -14,9 +14,25 @@ Access rules:
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.api.v1.conditional import (
+    collection_version, is_conditional, not_modified, resource_version,
+    version_headers
+)
+from app.api.v1.fieldsets import FIELDS_HELP, Fieldset, column
+from app.api.v1.pagination import get_page_args, next_link_header
+from app.api.v1.serializers import register
 
 api = Namespace('reviews', description='Review operations')
 
+# Fields of the reviews returned (?fields= on GET /reviews/ and
+# /reviews/<id>)
+REVIEW_FIELDS = register('Review', 'detail', Fieldset({
+    name: column(name)
+    for name in ('id', 'text', 'rating', 'user_id', 'place_id')
+}))
+# Columns read by GET /reviews/: rows, no entities
+REVIEW_LIST_COLUMNS = REVIEW_FIELDS.columns()
+
 review_model = api.model('Review', {
     'text': fields.String(required=True, description='Written feedback'),
     'rating': fields.Integer(required=True, description='Rating of the place (1-5)'),
@@ -56,58 +72,77 @@ class ReviewList(Resource):
             return{'error': 'Place not found'}, 404
 
         #check user is not reviewing their own place
-        if place.owner.id == current_user:
+        if place.owner_id == current_user:
             return{'error': 'You cannot review your own place'}, 400
 
         #Cannot review the same place twice
-        existing_reviews = facade.get_reviews_by_place(review_data['place_id'])
-        for r in existing_reviews:
-            if r.user.id == current_user:
-                return {'error': 'You have already reviewed this place'}, 400
+        if facade.review_exists(current_user, review_data['place_id']):
+            return {'error': 'You have already reviewed this place'}, 400
 
         try:
             new_review = facade.create_review(review_data)
-            return {
-                'id': new_review.id,
-                'text': new_review.text,
-                'rating': new_review.rating,
-                'user_id': current_user,
-                'place_id': review_data['place_id']
-            }, 201
+            return REVIEW_FIELDS.dump(new_review), 201
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.doc(params={'limit': 'Page size', 'after': 'Cursor of the next page',
+                     'fields': FIELDS_HELP})
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(304, 'Reviews not modified')
+    @api.response(400, 'Invalid pagination parameters or fields')
     def get(self):
-        """Retrieve a list of all reviews. Public endpoint."""
-        reviews = facade.get_all_reviews()
-        return [{
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            "user_id": review.user.id,
-            "place_id": review.place.id
-        } for review in reviews], 200
+        """Retrieve a page of reviews. Public endpoint."""
+        etag, last_modified = collection_version(
+            'reviews', facade.get_reviews_version())
+        response = not_modified(etag, last_modified)
+        if response:
+            return response
+
+        try:
+            names = REVIEW_FIELDS.requested()
+            after, limit = get_page_args()
+            reviews, next_cursor = facade.get_reviews_page(
+                after, limit, columns=REVIEW_FIELDS.columns(names))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return REVIEW_FIELDS.dump_many(reviews, names), 200, {
+            **next_link_header(next_cursor),
+            **version_headers(etag, last_modified)}
 
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
 
+    @api.doc(params={'fields': FIELDS_HELP})
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(304, 'Review not modified')
+    @api.response(400, 'Invalid fields')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """Get review details by ID. Public endpoint."""
-        review = facade.get_review(review_id)
+        try:
+            names = REVIEW_FIELDS.requested()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # One column read: no review is loaded for a 304
+        updated_at = (is_conditional()
+                      and facade.get_review_updated_at(review_id))
+        if updated_at:
+            response = not_modified(*resource_version(
+                ('review', review_id, names), updated_at))
+            if response:
+                return response
+
+        # text is deferred: read in the same SELECT, only when asked
+        review = facade.get_review(
+            review_id, load=["text"] if "text" in names else [])
         if not review:
             return {'error': 'Review not found'}, 404
 
-        return {
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            "user_id": review.user.id,
-            "place_id": review.place.id
-        }, 200
+        return REVIEW_FIELDS.dump(review, names), 200, version_headers(
+            *resource_version(('review', review.id, names), review.updated_at))
 
     @jwt_required()
     @api.expect(review_update_model)
@@ -126,7 +161,7 @@ class ReviewResource(Resource):
             return {'error': 'Review not found'}, 404
 
         # Admin bypasses ownership check
-        if not is_admin and review.user.id !=current_user:
+        if not is_admin and review.user_id !=current_user:
             return {'error': 'Unauthorized action'}, 403
 
         update_data = api.payload
@@ -154,7 +189,7 @@ class ReviewResource(Resource):
             return {'error': 'Review not found'}, 404
 
         # Admin bypasses ownership check
-        if not is_admin and review.user.id != current_user:
+        if not is_admin and review.user_id != current_user:
             return {'error': 'Unauthorized action'}, 403
 
         facade.delete_review(review_id)
@@ -0,0 +1,99 @@
+"""
+Serializer registry of the API v1 responses.
+
+    PLACE_LIST_FIELDS = register('Place', 'list', Fieldset({...}))
+    items = PLACE_LIST_FIELDS.dump_many(rows, names)
+
+Every view of a model (list item, detail, created, ...) is a Fieldset
+registered once, at import time of its API module: its dump
+functions are generated then (see fieldsets._compile), so a request
+only runs one dict display per item.
+
+dumps() encodes JSON with orjson when it is installed, with the
+json module otherwise (NaN and infinities written as null, like
+orjson, never as the invalid NaN / Infinity tokens). It is the application/json representation of
+the API (output_json), so every endpoint, error responses and the
+response cache included, shares one encoder.
+"""
+
+import json
+import math
+
+from flask import make_response
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+# (model, view) -> Fieldset
+_registry = {}
+
+
+def register(model, view, fieldset):
+    """
+    Register the fieldset of a view of a model and compile its dump
+    functions for the default fields.
+
+    Returns:
+        Fieldset: The fieldset, for a module-level assignment.
+
+    Raises:
+        ValueError: If the view is already registered.
+    """
+    key = (model, view)
+    if key in _registry:
+        raise ValueError(f"Serializer already registered: {model}.{view}")
+    fieldset.dumper(fieldset.names)
+    fieldset.dumper(fieldset.names, many=True)
+    _registry[key] = fieldset
+    return fieldset
+
+
+def get(model, view):
+    """
+    Fieldset of a view of a model.
+
+    Raises:
+        KeyError: If the view is not registered.
+    """
+    return _registry[(model, view)]
+
+
+def views():
+    """Registered (model, view) pairs, sorted."""
+    return sorted(_registry)
+
+
+def dumps(data):
+    """Encode data as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        return _json_dumps(data)
+    except ValueError:
+        # Rare: only then walk the data for non-finite floats
+        return _json_dumps(_finite(data))
+
+
+def _json_dumps(data):
+    return json.dumps(data, ensure_ascii=False, allow_nan=False,
+                      separators=(',', ':')).encode()
+
+
+def _finite(data):
+    """Copy of data with NaN and infinities replaced by None."""
+    if isinstance(data, float):
+        return data if math.isfinite(data) else None
+    if isinstance(data, dict):
+        return {key: _finite(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_finite(value) for value in data]
+    return data
+
+
+def output_json(data, code, headers=None):
+    """JSON representation of the API (replaces flask-restx's)."""
+    response = make_response(dumps(data), code)
+    response.headers.extend(headers or {})
+    return response
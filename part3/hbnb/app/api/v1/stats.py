@@ -0,0 +1,65 @@
+"""
+Stats API endpoints module.
+
+Runtime counters of the application, for monitoring.
+
+Access rules:
+- GET /cache             : Admin only
+- DELETE /cache          : Admin only
+- GET /response-cache    : Admin only
+- DELETE /response-cache : Admin only
+"""
+
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt
+from app.services import facade
+
+api = Namespace('stats', description='Runtime statistics')
+
+
+@api.route('/cache')
+class CacheStats(Resource):
+    """Repository read-through caches (REPOSITORY_CACHE)."""
+
+    @api.response(200, 'Cache counters per model')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Hits, misses, hit rate and size of each model cache. Admin only."""
+        if not get_jwt().get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        return facade.get_cache_stats(), 200
+
+    @api.response(200, 'Caches emptied')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def delete(self):
+        """Empty every model cache and the response cache. Admin only."""
+        if not get_jwt().get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        facade.clear_caches()
+        return {'message': 'Caches cleared successfully'}, 200
+
+
+@api.route('/response-cache')
+class ResponseCacheStats(Resource):
+    """Serialized GET responses (RESPONSE_CACHE_MAX_BYTES)."""
+
+    @api.response(200, 'Response cache counters (null when disabled)')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Entries, size, hits, misses and evictions. Admin only."""
+        if not get_jwt().get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        return facade.get_response_cache_stats(), 200
+
+    @api.response(200, 'Response cache emptied')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def delete(self):
+        """Empty the response cache. Admin only."""
+        if not get_jwt().get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        facade.clear_response_cache()
+        return {'message': 'Response cache cleared successfully'}, 200
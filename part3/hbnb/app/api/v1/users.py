@@ -15,9 +15,23 @@ Access rules:
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.api.v1.conditional import (
+    collection_version, is_conditional, not_modified, resource_version,
+    version_headers
+)
+from app.api.v1.fieldsets import FIELDS_HELP, Fieldset, column
+from app.api.v1.serializers import register
+from app.api.v1.pagination import get_page_args, next_link_header
 
 api = Namespace('users', description='User operations')
 
+# Fields of the users returned (?fields= on GET /users/ and /users/<id>)
+USER_FIELDS = register('User', 'detail', Fieldset({
+    name: column(name) for name in ('id', 'first_name', 'last_name', 'email')
+}))
+# Columns read by GET /users/: rows, no entities
+USER_LIST_COLUMNS = USER_FIELDS.columns()
+
 
 # =========================
 # API MODELS
@@ -104,33 +118,46 @@ class UserList(Resource):
                 return {'error': str(e)}, 422
             return {'error': str(e)}, 400
 
-        return {
-            'id': new_user.id,
-            'first_name': new_user.first_name,
-            'last_name': new_user.last_name,
-            'email': new_user.email
-        }, 201
+        return USER_FIELDS.dump(new_user), 201
 
+    @api.doc(params={'limit': 'Page size', 'after': 'Cursor of the next page',
+                     'fields': FIELDS_HELP})
     @api.response(200, 'Users list retrieved successfully')
+    @api.response(304, 'Users not modified')
+    @api.response(400, 'Invalid pagination parameters')
     def get(self):
         """
-        Retrieve all registered users.
+        Retrieve a page of registered users.
+
+        Query parameters:
+            limit (int): Page size.
+            after (str): Cursor returned in the Link header.
+            fields (str): Fields to return, like "id,first_name".
 
         Returns:
             list: List of users (without password).
-            HTTP 200 on success.
+            HTTP 200 on success, with a `Link: rel="next"` header
+            when more users exist.
+            HTTP 304 if the ETag / Last-Modified sent still match.
+            HTTP 400 if the pagination parameters or fields are invalid.
         """
-        users = facade.get_all_users()
+        etag, last_modified = collection_version(
+            'users', facade.get_users_version())
+        response = not_modified(etag, last_modified)
+        if response:
+            return response
+
+        try:
+            names = USER_FIELDS.requested()
+            after, limit = get_page_args()
+            users, next_cursor = facade.get_users_page(
+                after, limit, columns=USER_FIELDS.columns(names))
+        except ValueError as e:
+            return {'error': str(e)}, 400
 
-        return [
-            {
-                'id': u.id,
-                'first_name': u.first_name,
-                'last_name': u.last_name,
-                'email': u.email
-            }
-            for u in users
-        ], 200
+        return USER_FIELDS.dump_many(users, names), 200, {
+            **next_link_header(next_cursor),
+            **version_headers(etag, last_modified)}
 
 
 # =========================
@@ -143,7 +170,10 @@ class UserResource(Resource):
     Resource for retrieving and updating a specific user.
     """
 
+    @api.doc(params={'fields': FIELDS_HELP})
     @api.response(200, 'User details retrieved successfully')
+    @api.response(304, 'User not modified')
+    @api.response(400, 'Invalid fields')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """
@@ -155,18 +185,30 @@ class UserResource(Resource):
         Returns:
             dict: User information (without password).
             HTTP 200 on success.
+            HTTP 304 if the ETag / Last-Modified sent still match.
+            HTTP 400 if fields names an unknown field.
             HTTP 404 if user does not exist.
         """
+        try:
+            names = USER_FIELDS.requested()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # One column read: no user is loaded for a 304
+        updated_at = (is_conditional()
+                      and facade.get_user_updated_at(user_id))
+        if updated_at:
+            response = not_modified(*resource_version(
+                ('user', user_id, names), updated_at))
+            if response:
+                return response
+
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
 
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email
-        }, 200
+        return USER_FIELDS.dump(user, names), 200, version_headers(
+            *resource_version(('user', user.id, names), user.updated_at))
 
     @jwt_required()
     @api.expect(user_update_model, validate=True)
@@ -219,12 +261,7 @@ class UserResource(Resource):
             except ValueError as e:
                 return {'error': str(e)}, 400
 
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email
-        }, 200
+        return USER_FIELDS.dump(user), 200
 
     @jwt_required()
     @api.response(200, 'User successfully deleted')
@@ -16,6 +16,11 @@ class Amenity(BaseModel):
     """
 
     __tablename__ = 'amenities'
+    __table_args__ = (
+        # get_amentiy_by_name
+        db.Index('ix_amenities_name', 'name'),
+        db.Index('ix_amenities_created_at_id', 'created_at', 'id'),
+    )
 
     name = db.Column(db.String(50), nullable=False)
     description = db.Column(db.Text,  nullable=True, default='')
@@ -8,6 +8,10 @@ All other models inherits from this class.
 import uuid
 from datetime import datetime, timezone
 from app import db
+from app.persistence import cache
+from app.persistence.pagination import DEFAULT_PAGE_SIZE
+from app.persistence.repository import paginate
+from app.persistence.unit_of_work import commit
 
 
 class BaseModel(db.Model): # db.Model obligatoire pour SQLAlchemy mappe les tables
@@ -39,9 +43,20 @@ class BaseModel(db.Model): # db.Model obligatoire pour SQLAlchemy mappe les tabl
         """
         Updates the updated_at timestamp.
         Should be called whenever the object is modified.
+        Commits, or only flushes inside a unit of work.
         """
         self.updated_at = datetime.now(timezone.utc)
-        db.session.commit()
+        cache.invalidate(type(self), [self.id])
+        commit(db.session)
+
+    def _page(self, collection, after=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of a write-only collection of this object, sorted by
+        (created_at, id), straight from the database (see paginate()).
+        """
+        target = getattr(type(self), collection).property.mapper.class_
+        return paginate(getattr(self, collection).select(), target,
+                        after=after, limit=limit)
 
     def update(self, data: dict):
         """
@@ -8,7 +8,8 @@ multiple amenities and reviews associated with it.
 
 from app import db
 from app.models.base_model import BaseModel
-from sqlalchemy.orm import validates
+from app.persistence.pagination import DEFAULT_PAGE_SIZE
+from sqlalchemy.orm import deferred, validates
 from app.models.sql_tables import place_amenity
 
 class Place(BaseModel):
@@ -24,15 +25,45 @@ class Place(BaseModel):
         owner (User): Owner of the place.
         reviews (list): List of associated Review instances.
         amenities (list): List of associated Amenity instances.
+        review_count (int): Number of reviews (maintained by the facade).
+        rating_sum (int): Sum of the review ratings.
+        rating_<n>_count (int): Number of reviews rated n (1 to 5).
+        rating_average (float): Stored average, 0 without reviews
+            (indexed sort key of GET /places/?sort=rating).
     """
     __tablename__ = 'places'
+    __table_args__ = (
+        # get_places_by_owner
+        db.Index('ix_places_owner_id', 'owner_id'),
+        # Keyset pagination: ORDER BY created_at, id
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+        # PlaceRepository.search: price range / sort=price, sort=rating, bbox
+        db.Index('ix_places_price_id', 'price', 'id'),
+        db.Index('ix_places_rating_average_id', 'rating_average', 'id'),
+        db.Index('ix_places_latitude_longitude', 'latitude', 'longitude'),
+    )
 
     title = db.Column(db.String(100), nullable=False)
-    description = db.Column(db.Text,  nullable=True, default='')
+    # Deferred: loaded on first access, or with load=["description"]
+    description = deferred(db.Column(db.Text,  nullable=True, default=''))
     price = db.Column(db.Float, nullable=False)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
 
+    #------------------------------------------------------
+    # Rating aggregates : updated with every review write,
+    # so average and distribution never need to read reviews
+    #------------------------------------------------------
+
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_1_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_2_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_3_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_4_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_5_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_average = db.Column(db.Float, nullable=False, default=0)
+
 
     #------------------------
     # Validateurs SQLAlchemy
@@ -62,21 +93,62 @@ class Place(BaseModel):
             raise ValueError("longitude must be between -180 and 180")
         return float(value)
 
+    @property
+    def average_rating(self):
+        """Average rating rounded to 2 decimals, None without reviews."""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self):
+        """Number of reviews per rating, as {"1": n1, ..., "5": n5}."""
+        return {
+            str(rating): getattr(self, f"rating_{rating}_count") or 0
+            for rating in range(1, 6)
+        }
+
     def add_review(self, review):
         """Add a review to this place."""
-        self.reviews.append(review)
+        self.reviews.add(review)
         self.save()
 
+    def reviews_page(self, after=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of the reviews of this place.
+
+        Returns:
+            tuple: (reviews, next_cursor), see SQLAlchemyRepository.get_page().
+        """
+        return self._page("reviews", after, limit)
+
     def add_amenity(self, amenity):
         """Add an amenity to this place."""
         self.amenities.append(amenity)
         self.save()
 
+    def set_amenities(self, amenities):
+        """
+        Replace the amenities of this place, in one flush.
+
+        The collection is diffed against the current one: links to
+        amenities kept are left alone, only the removed ones are
+        deleted and the new ones inserted. Duplicates are ignored.
+        """
+        self.amenities = list(dict.fromkeys(amenities))
+        self.save()
+
     #-------------------
     # SQL Relation
     #-------------------
 
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    owner_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
 
-    reviews = db.relationship('Review', backref='place', cascade='all, delete-orphan')
-    amenities = db.relationship('Amenity', secondary='place_amenity', backref='places')
+    # Write-only, removed by ON DELETE CASCADE (see User.places)
+    reviews = db.relationship('Review', backref='place', lazy='write_only',
+                              cascade='all, delete-orphan',
+                              passive_deletes=True)
+    # Links removed by ON DELETE CASCADE on both sides, never loaded
+    amenities = db.relationship('Amenity', secondary='place_amenity',
+                                backref=db.backref('places', passive_deletes=True),
+                                passive_deletes=True)
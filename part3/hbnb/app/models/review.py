@@ -6,7 +6,7 @@ Mappe l'entite Amenity sur la table 'amenities' via SQLAlchemy.
 
 from app import db
 from app.models.base_model import BaseModel
-from sqlalchemy.orm import validates
+from sqlalchemy.orm import deferred, validates
 
 class Review(BaseModel):
     """
@@ -20,8 +20,21 @@ class Review(BaseModel):
     """
 
     __tablename__ = 'reviews'
-
-    text = db.Column(db.Text,  nullable=False)
+    __table_args__ = (
+        # Reviews of a place, sorted for keyset pagination
+        db.Index('ix_reviews_place_id_created_at',
+                 'place_id', 'created_at', 'id'),
+        # Reviews of a user
+        db.Index('ix_reviews_user_id_created_at',
+                 'user_id', 'created_at', 'id'),
+        db.Index('ix_reviews_created_at_id', 'created_at', 'id'),
+        # One review per user and place (index of review_exists())
+        db.UniqueConstraint('user_id', 'place_id',
+                            name='uq_reviews_user_id_place_id'),
+    )
+
+    # Deferred: loaded on first access, or with load=["text"]
+    text = deferred(db.Column(db.Text,  nullable=False))
     rating = db.Column(db.Integer, nullable=False)
 
     #-----------------------
@@ -45,5 +58,5 @@ class Review(BaseModel):
     # SQL Relation
     #-------------------
 
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     place_id = db.Column(db.String(36), db.ForeignKey('places.id', ondelete='CASCADE'), nullable=False)
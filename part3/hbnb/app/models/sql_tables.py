@@ -3,8 +3,10 @@
 from app import db
 
 place_amenity = db.Table('place_amenity',
-                         db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
-                         db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True)
+                         db.Column('place_id', db.String(36), db.ForeignKey('places.id', ondelete='CASCADE'), primary_key=True),
+                         db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id', ondelete='CASCADE'), primary_key=True),
+                         # The primary key covers place_id lookups, not the amenity -> places side
+                         db.Index('ix_place_amenity_amenity_id', 'amenity_id')
 )
 
                          
\ No newline at end of file
@@ -2,6 +2,7 @@
 import re
 from app import db, bcrypt
 from app.models.base_model import BaseModel
+from app.persistence.pagination import DEFAULT_PAGE_SIZE
 from sqlalchemy.orm import validates
 
 class User(BaseModel):
@@ -19,6 +20,10 @@ class User(BaseModel):
     """
 
     __tablename__ = 'users'
+    # email is UNIQUE, which already creates its index
+    __table_args__ = (
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
 
     first_name = db.Column(db.String(50), nullable=False)
     last_name  = db.Column(db.String(50), nullable=False)
@@ -139,7 +144,7 @@ class User(BaseModel):
         Args:
             place (Place): Place instance to add.
         """
-        self.places.append(place)
+        self.places.add(place)
         self.save()
 
     def add_review(self, review):
@@ -149,12 +154,38 @@ class User(BaseModel):
         Args:
             review (Review): Review instance to add.
         """
-        self.reviews.append(review)
+        self.reviews.add(review)
         self.save()
 
+    def places_page(self, after=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of the places owned by the user.
+
+        Returns:
+            tuple: (places, next_cursor), see SQLAlchemyRepository.get_page().
+        """
+        return self._page("places", after, limit)
+
+    def reviews_page(self, after=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of the reviews written by the user.
+
+        Returns:
+            tuple: (reviews, next_cursor), see SQLAlchemyRepository.get_page().
+        """
+        return self._page("reviews", after, limit)
+
     #-------------------
     # SQL Relation 
     #-------------------
 
-    places = db.relationship('Place', backref='owner')
-    reviews = db.relationship('Review', backref='user')
+    # Write-only: adding never loads the collection, reading goes
+    # through places_page() / reviews_page() (or .select()). Deleting
+    # the user never loads them either: ON DELETE CASCADE removes
+    # them in the database
+    places = db.relationship('Place', backref='owner', lazy='write_only',
+                             cascade='all, delete-orphan',
+                             passive_deletes=True)
+    reviews = db.relationship('Review', backref='user', lazy='write_only',
+                              cascade='all, delete-orphan',
+                              passive_deletes=True)
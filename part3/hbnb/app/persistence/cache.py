@@ -0,0 +1,351 @@
+"""
+Repository cache module.
+
+Per-process, bounded read-through cache in front of
+SQLAlchemyRepository.get(), keyed by (model, id).
+
+Entries are immutable snapshots (read-only mappings of column values
+and, for loaded many-to-many collections, of related ids), never
+session-bound objects. On a hit the snapshot is attached to the
+current session with session.merge(load=False): callers get a regular
+persistent object (lazy loads, updates and save() keep working) and
+no SELECT is emitted. Relations asked with load= are resolved through
+the caches of the related models.
+
+Invalidation is driven by session events, so every write path is
+covered: BaseModel.save() / update() and repository update() /
+delete() flush, and flushed objects are evicted (again after COMMIT,
+so a concurrent request cannot re-cache the old row); bulk UPDATE /
+DELETE statements evict the rows they name, or the whole model.
+Deleting a row also clears the models whose foreign keys reference
+it (ON DELETE CASCADE). Writes bypassing the session (raw SQL) are
+only caught by the TTL.
+
+Sizes and TTLs are set per model with REPOSITORY_CACHE in config.py.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+# Session.info keys
+_WROTE_KEY = "repository_cache_wrote"
+_EVICTED_KEY = "repository_cache_evicted"
+
+# model class -> LRUCache, set by init_app()
+_caches = {}
+
+
+class LRUCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds."""
+
+    def __init__(self, max_size, ttl, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key):
+        """Return the value of key, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store value, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """Return the counters of the cache as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def init_app(app):
+    """
+    (Re)create the caches from app.config['REPOSITORY_CACHE'].
+
+    The setting maps model class names to {'max_size': n, 'ttl': s}.
+    Models not listed (or an empty setting) are not cached.
+    """
+    from app import db
+
+    classes = {
+        mapper.class_.__name__: mapper.class_
+        for mapper in db.Model.registry.mappers
+    }
+    _caches.clear()
+    for name, options in (app.config.get('REPOSITORY_CACHE') or {}).items():
+        if name not in classes:
+            raise ValueError(f"REPOSITORY_CACHE: unknown model {name}")
+        _caches[classes[name]] = LRUCache(options.get('max_size', 1024),
+                                          options.get('ttl', 60))
+
+
+def stats():
+    """Return {model name: counters} for every cached model."""
+    return {model.__name__: cache.stats() for model, cache in _caches.items()}
+
+
+def clear():
+    """Empty every cache (counters are kept)."""
+    for cache in _caches.values():
+        cache.clear()
+
+
+def invalidate(model, ids=None):
+    """Evict the given ids of model, or all of its entries."""
+    cache = _caches.get(model)
+    if cache is None:
+        return
+    if ids is None:
+        cache.clear()
+    else:
+        for obj_id in ids:
+            cache.invalidate(obj_id)
+
+
+# -------------------------------------------------
+# Read-through
+# -------------------------------------------------
+
+def get(session, model, obj_id, load=None):
+    """
+    Return obj_id attached to session from its snapshot, or None.
+
+    None means "read the database": model not cached, cache miss,
+    object already in the session (no SELECT needed anyway), or a
+    relation of load that cannot be rebuilt from snapshots.
+    """
+    cache = _caches.get(model)
+    if cache is None or obj_id is None:
+        return None
+    mapper = inspect(model)
+    if mapper.identity_key_from_primary_key([obj_id]) in session.identity_map:
+        return None
+    relations = list(load or [])
+    if not all(_restorable(mapper, name) for name in relations):
+        return None
+
+    snapshot = cache.get(obj_id)
+    if snapshot is None:
+        return None
+    columns, collections = snapshot
+    if any(name not in columns if name in mapper.column_attrs
+           else mapper.relationships[name].secondary is not None
+           and name not in collections for name in relations):
+        return None
+
+    obj = _attach(session, mapper, columns)
+    for name in relations:
+        if name in mapper.column_attrs:
+            continue
+        relation = mapper.relationships[name]
+        target = relation.mapper.class_
+        if relation.secondary is None:
+            local = next(iter(relation.local_columns))
+            value = _get_or_load(session, target, columns[local.key])
+        else:
+            value = [
+                item for item in (_get_or_load(session, target, related_id)
+                                  for related_id in collections[name])
+                if item is not None
+            ]
+        set_committed_value(obj, name, value)
+    return obj
+
+
+def get_column(model, obj_id, name):
+    """Value of one column of a cached row, None if not cached."""
+    cache = _caches.get(model)
+    snapshot = cache.get(obj_id) if cache is not None else None
+    return snapshot[0].get(name) if snapshot is not None else None
+
+
+def store(session, obj):
+    """
+    Cache a snapshot of obj, a clean object just read from the database.
+
+    Related objects loaded with it (load=) are cached too, so that the
+    next get() can rebuild the relations without a SELECT.
+    """
+    # Never cache rows this transaction changed: they are not committed
+    if session.info.get(_WROTE_KEY):
+        return
+    mapper = inspect(obj).mapper
+    _put(session, mapper, obj)
+    for relation in mapper.relationships:
+        if relation.key not in obj.__dict__ or not _restorable(
+                mapper, relation.key):
+            continue
+        related = obj.__dict__[relation.key]
+        for item in related if relation.uselist else [related]:
+            if item is not None:
+                _put(session, relation.mapper, item)
+
+
+def _put(session, mapper, obj):
+    cache = _caches.get(mapper.class_)
+    if cache is not None and obj not in session.dirty:
+        cache.put(inspect(obj).identity[0], _snapshot(mapper, obj))
+
+
+def _snapshot(mapper, obj):
+    """Immutable (columns, collections) snapshot of a loaded object."""
+    # Deferred columns not loaded stay out (and unloaded once attached)
+    columns = MappingProxyType({
+        attr.key: obj.__dict__[attr.key] for attr in mapper.column_attrs
+        if attr.key in obj.__dict__
+    })
+    collections = MappingProxyType({
+        relation.key: tuple(
+            inspect(item).identity[0] for item in obj.__dict__[relation.key])
+        for relation in mapper.relationships
+        if relation.secondary is not None and relation.key in obj.__dict__
+    })
+    return columns, collections
+
+
+def _attach(session, mapper, columns):
+    """Build a detached instance from column values and merge it."""
+    obj = mapper.class_manager.new_instance()
+    for key, value in columns.items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    return session.merge(obj, load=False)
+
+
+def _get_or_load(session, model, obj_id):
+    """Related object: session, then cache, then database."""
+    if obj_id is None:
+        return None
+    obj = get(session, model, obj_id)
+    if obj is None:
+        obj = session.get(model, obj_id)
+        if obj is not None:
+            store(session, obj)
+    return obj
+
+
+def _restorable(mapper, name):
+    """
+    Relations rebuilt from snapshots: many-to-one and many-to-many.
+    Deferred columns too, when the snapshot holds them.
+    """
+    if isinstance(name, str) and name in mapper.column_attrs:
+        return True
+    if not isinstance(name, str) or name not in mapper.relationships:
+        return False
+    relation = mapper.relationships[name]
+    if relation.secondary is not None:
+        return True
+    return not relation.uselist and all(
+        column.table is mapper.local_table for column in relation.local_columns
+    ) and len(relation.local_columns) == 1
+
+
+# -------------------------------------------------
+# Invalidation
+# -------------------------------------------------
+
+def _evict(session, model, ids):
+    """Invalidate now, and remember the keys for after COMMIT."""
+    invalidate(model, ids)
+    session.info.setdefault(_EVICTED_KEY, []).append((model, ids))
+
+
+def _referencing_models(mapper):
+    """Models with a foreign key to mapper's table (cascade targets)."""
+    table = mapper.local_table
+    return [
+        other.class_ for other in mapper.registry.mappers
+        if other.local_table is not None
+        and any(fk.references(table) for fk in other.local_table.foreign_keys)
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def _evict_flushed(session, flush_context):
+    session.info[_WROTE_KEY] = True
+    for obj in list(session.dirty) + list(session.deleted):
+        state = inspect(obj)
+        if state.identity is not None and state.mapper.class_ in _caches:
+            _evict(session, state.mapper.class_, [state.identity[0]])
+    for obj in session.deleted:
+        for model in _referencing_models(inspect(obj).mapper):
+            if model in _caches:
+                _evict(session, model, None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _evict_bulk_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete
+            or orm_execute_state.is_insert):
+        return
+    session = orm_execute_state.session
+    session.info[_WROTE_KEY] = True
+    mapper = orm_execute_state.bind_mapper
+    if orm_execute_state.is_insert or mapper is None:
+        return
+    # Statements may name the rows they change: cache_invalidate=[ids]
+    ids = orm_execute_state.execution_options.get("cache_invalidate")
+    if mapper.class_ in _caches:
+        _evict(session, mapper.class_, ids)
+    if orm_execute_state.is_delete:
+        for model in _referencing_models(mapper):
+            if model in _caches:
+                _evict(session, model, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session):
+    # A concurrent request may have cached the old row between the
+    # flush and the COMMIT: evict the same keys once more
+    session.info.pop(_WROTE_KEY, None)
+    for model, ids in session.info.pop(_EVICTED_KEY, []):
+        invalidate(model, ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session):
+    session.info.pop(_WROTE_KEY, None)
+    session.info.pop(_EVICTED_KEY, None)
@@ -0,0 +1,161 @@
+"""
+Full-text search module.
+
+places_fts is an SQLite FTS5 index over places.title and
+places.description. It is an external content table: the index
+keeps no copy of the text, and triggers update it with every write
+to places (ORM, bulk insert or raw SQL alike).
+
+The index is keyed by the implicit rowid of places: VACUUM may
+renumber rowids, rebuild the index afterwards (rebuild_places_index).
+
+When FTS5 is not compiled into SQLite (or the index has not been
+created), PlaceRepository.search_text() falls back to a LIKE scan.
+"""
+
+import re
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, inspect
+
+PLACES_FTS = "places_fts"
+
+# Separate metadata: db.create_all() / drop_all() must not touch it
+places_fts = Table(
+    PLACES_FTS, MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("title", Text),
+    Column("description", Text),
+    # Hidden column named after the table: target of MATCH / bm25()
+    Column(PLACES_FTS, Text),
+)
+
+# Highlight markers of matched terms in titles and snippets
+MARK_START = "<mark>"
+MARK_END = "</mark>"
+ELLIPSIS = "…"
+SNIPPET_TOKENS = 16
+
+# Same statements in schema.sql
+_CREATE_STATEMENTS = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+        title, description,
+        content='places', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_ai AFTER INSERT ON places BEGIN
+        INSERT INTO places_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_ad AFTER DELETE ON places BEGIN
+        INSERT INTO places_fts(places_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_au
+    AFTER UPDATE OF title, description ON places BEGIN
+        INSERT INTO places_fts(places_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO places_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END""",
+)
+
+
+def fts5_available(connection):
+    """Return True if the database behind connection supports FTS5."""
+    if connection.dialect.name != "sqlite":
+        return False
+    return bool(connection.exec_driver_sql(
+        "SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar())
+
+
+def create_places_index(engine):
+    """
+    Create places_fts and its triggers if they do not exist yet.
+
+    The index is filled from the existing places when it is created,
+    so this can be run on a database created before full-text search.
+
+    Returns:
+        bool: True if the index exists (or was created).
+    """
+    with engine.begin() as connection:
+        if inspect(connection).has_table(PLACES_FTS):
+            return True
+        if not fts5_available(connection):
+            return False
+        for statement in _CREATE_STATEMENTS:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(
+            "INSERT INTO places_fts(places_fts) VALUES ('rebuild')")
+        return True
+
+
+def rebuild_places_index(engine):
+    """
+    Rebuild places_fts from the places table.
+
+    places has no INTEGER PRIMARY KEY, so VACUUM may renumber its
+    rowids: run this after a VACUUM (or after changing places with
+    the triggers dropped).
+    """
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO places_fts(places_fts) VALUES ('rebuild')")
+
+
+def has_places_index(connection):
+    """Return True if places_fts exists (cached per DB connection)."""
+    if PLACES_FTS not in connection.info:
+        connection.info[PLACES_FTS] = inspect(connection).has_table(PLACES_FTS)
+    return connection.info[PLACES_FTS]
+
+
+def search_terms(text):
+    """Split a user query into lowercase words (punctuation dropped)."""
+    return re.findall(r"\w+", (text or "").lower())
+
+
+def match_expression(terms):
+    """
+    Build an FTS5 MATCH expression: every term, as a prefix.
+
+    Terms are quoted so that user input can never be read as FTS5
+    syntax (AND, OR, NEAR, column filters, ...).
+    """
+    return " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+# -------------------------------------------------
+# Python equivalents of highlight() / snippet(),
+# used with the LIKE fallback
+# -------------------------------------------------
+
+def _terms_pattern(terms):
+    return re.compile(
+        "|".join(re.escape(term) for term in terms), re.IGNORECASE)
+
+
+def highlight(text, terms):
+    """Wrap every occurrence of the terms in the highlight markers."""
+    if not text or not terms:
+        return text or ""
+    return _terms_pattern(terms).sub(
+        lambda m: MARK_START + m.group(0) + MARK_END, text)
+
+
+def snippet(text, terms, size=SNIPPET_TOKENS):
+    """Return about size words of text around the first matched term."""
+    words = (text or "").split()
+    if not words:
+        return ""
+    pattern = _terms_pattern(terms) if terms else None
+    first = next((i for i, word in enumerate(words)
+                  if pattern and pattern.search(word)), 0)
+    start = max(0, min(first - size // 4, len(words) - size))
+    end = start + size
+    result = highlight(" ".join(words[start:end]), terms)
+    if start > 0:
+        result = ELLIPSIS + result
+    if end < len(words):
+        result += ELLIPSIS
+    return result
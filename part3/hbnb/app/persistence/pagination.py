@@ -0,0 +1,134 @@
+"""
+Pagination module.
+
+Helpers for keyset (cursor) pagination shared by the repositories.
+
+A cursor is an opaque, URL-safe token encoding the sort key values
+of the last item of a page. The next page starts strictly after
+those values, so a page never needs an OFFSET scan and never
+materializes the whole table.
+"""
+
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_ORDER = ("created_at", "id")
+
+# Types of the cursor values of each sort key; any other key takes
+# a string or a finite number
+_NUMBER = (int, float)
+_KEY_TYPES = {
+    "created_at": datetime,
+    "updated_at": datetime,
+    "id": str,
+    "rowid": int,
+    "price": _NUMBER,
+    "rating_average": _NUMBER,
+    "score": _NUMBER,
+}
+
+
+def parse_order(order_by):
+    """
+    Parse an order_by specification.
+
+    Args:
+        order_by (iterable of str): Attribute names, a leading '-'
+            meaning descending order (like "-created_at").
+
+    Returns:
+        list[tuple]: (attribute name, descending) pairs.
+    """
+    keys = []
+    for key in order_by:
+        if key.startswith("-"):
+            keys.append((key[1:], True))
+        else:
+            keys.append((key, False))
+    return keys
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def _valid_value(name, value):
+    """True if value can be a cursor value of the sort key name."""
+    if isinstance(value, bool):
+        return False
+    if not isinstance(value, _KEY_TYPES.get(name, (str, *_NUMBER))):
+        return False
+    return not isinstance(value, float) or math.isfinite(value)
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key values of an item into an opaque cursor.
+
+    Args:
+        values (list): Sort key values (str, int, float or datetime).
+
+    Returns:
+        str: URL-safe cursor token.
+    """
+    raw = json.dumps([_encode_value(v) for v in values],
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, names):
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        token (str): Cursor token received from the client.
+        names (list[str]): Names of the sort keys, each value of the
+            cursor is checked against its key (see _KEY_TYPES).
+
+    Returns:
+        list: The decoded sort key values.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(v) for v in values]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if len(values) != len(names) or not all(
+            _valid_value(name, value) for name, value in zip(names, values)):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def build_page(rows, limit, keys):
+    """
+    Split the rows fetched for a page (limit + 1) into items and cursor.
+
+    Args:
+        rows (list): Up to limit + 1 objects, already sorted.
+        limit (int): Page size.
+        keys (list[tuple]): Parsed order keys (see parse_order()).
+
+    Returns:
+        tuple: (items, next_cursor), next_cursor is None on the last page.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    items = rows[:limit]
+    last = items[-1]
+    return items, encode_cursor([getattr(last, name) for name, _ in keys])
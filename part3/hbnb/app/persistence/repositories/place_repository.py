@@ -5,8 +5,44 @@ Extends SQLAchemyRepository with Place-specific queries.
 Located in: app/persistence/repositories/place_repository.py
 """
 
+import heapq
+from collections import namedtuple
+
+from sqlalchemy import (
+    Float, and_, case, cast, func, literal_column, or_, select, update
+)
+from sqlalchemy.orm import undefer
+
+from app.models.amenity import Amenity
 from app.models.place import Place
-from app.persistence.repository import SQLAlchemyRepository
+from app.models.review import Review
+from app.models.user import User
+from app.models.sql_tables import place_amenity
+from app.persistence import fulltext, spatial
+from app.persistence.pagination import (
+    DEFAULT_ORDER, DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+)
+from app.persistence.repository import SQLAlchemyRepository, _keyset_condition
+from app.persistence.unit_of_work import commit
+
+RATINGS = range(1, 6)
+
+# search() sort keys: each one is backed by an index (see Place)
+SORTS = {
+    "price": ("price", "id"),
+    "rating": ("-rating_average", "-id"),
+    "newest": ("-created_at", "-id"),
+}
+
+# Implicit SQLite rowid of places: key of the places_fts index
+_ROWID = literal_column("places.rowid")
+
+# One search_text() result: score is lower for better matches
+PlaceMatch = namedtuple(
+    "PlaceMatch", ["place", "score", "title_highlight", "snippet"])
+
+# One nearby() result
+PlaceDistance = namedtuple("PlaceDistance", ["place", "distance_km"])
 
 
 class PlaceRepository(SQLAlchemyRepository):
@@ -18,3 +54,426 @@ class PlaceRepository(SQLAlchemyRepository):
     def get_places_by_owner(self, owner_id):
         """Retrienve all places owned by a specific user."""
         return self.model.query.filter_by(owner_id=owner_id).all()
+
+    def get_place_ids_by_owner(self, owner_id):
+        """Retrieve the IDs of the places owned by a user (ids only)."""
+        return self.db.session.scalars(
+            select(self.model.id).where(self.model.owner_id == owner_id)
+        ).all()
+
+    def get_detail_version(self, place_id):
+        """Timestamps GET /places/<id> depends on, in one SELECT.
+
+        Returns:
+            tuple or None: (place updated_at, owner updated_at,
+            amenity count, max amenity updated_at), None if the
+            place does not exist.
+        """
+        place = self.model
+        linked = place_amenity.c.place_id == place.id
+        row = self.db.session.execute(
+            select(
+                place.updated_at,
+                User.updated_at,
+                select(func.count()).select_from(place_amenity)
+                .where(linked).scalar_subquery(),
+                select(func.max(Amenity.updated_at))
+                .join(place_amenity, place_amenity.c.amenity_id == Amenity.id)
+                .where(linked).scalar_subquery(),
+            )
+            .join(User, User.id == place.owner_id)
+            .where(place.id == place_id)
+        ).one_or_none()
+        return tuple(row) if row is not None else None
+
+    def search(self, min_price=None, max_price=None, amenity_ids=None,
+               bbox=None, sort=None, after=None, limit=DEFAULT_PAGE_SIZE,
+               load=None, columns=None):
+        """Retrieve one page of places matching every given filter.
+
+        Filters and sort are run by the database, the keyset pagination
+        of get_page() is applied on top of them.
+
+        Args:
+            min_price (float): Minimum price per night (inclusive).
+            max_price (float): Maximum price per night (inclusive).
+            amenity_ids (list): Places must have all these amenities.
+            bbox (tuple): (min_lon, min_lat, max_lon, max_lat). A box
+                with min_lon > max_lon crosses the antimeridian.
+            sort (str): One of SORTS, None for (created_at, id).
+            after (str): Cursor returned with the previous page.
+            limit (int): Maximum number of places to return.
+            load (list): Relationships to load eagerly (see get()).
+            columns (list): Select only these columns: items are then
+                rows, as with get_all_columns(), and load is ignored.
+
+        Returns:
+            tuple: (items, next_cursor), next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        place = self.model
+        order_by = SORTS[sort] if sort is not None else DEFAULT_ORDER
+        if columns is not None:
+            query = place.query.with_entities(
+                *self._columns(columns, order_by))
+        else:
+            query = place.query.options(*self._loader_options(load))
+
+        if min_price is not None:
+            query = query.filter(place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(place.price <= max_price)
+
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            query = query.filter(place.latitude.between(min_lat, max_lat))
+            if min_lon <= max_lon:
+                query = query.filter(place.longitude.between(min_lon, max_lon))
+            else:
+                query = query.filter(or_(place.longitude >= min_lon,
+                                         place.longitude <= max_lon))
+
+        amenity_ids = set(amenity_ids or [])
+        if amenity_ids:
+            # Places linked to all the amenities: one lookup per amenity
+            # in ix_place_amenity_amenity_id, grouped by place
+            having_all = (
+                select(place_amenity.c.place_id)
+                .where(place_amenity.c.amenity_id.in_(amenity_ids))
+                .group_by(place_amenity.c.place_id)
+                .having(func.count() == len(amenity_ids))
+            )
+            query = query.filter(place.id.in_(having_all))
+
+        return self._paginate(query, after, limit, order_by)
+
+    def search_text(self, q, min_price=None, max_price=None, after=None,
+                    limit=DEFAULT_PAGE_SIZE, columns=None):
+        """Full-text search over place titles and descriptions.
+
+        Every word of q must match (as a prefix, accents ignored with
+        FTS5). Results are ranked by BM25, title matches weighing more
+        than description matches. Without the places_fts index, a LIKE
+        scan is used instead (title matches first).
+
+        Ranking only reads places_fts, the places of the page are then
+        loaded by rowid: SQLite computes highlight() and snippet() for
+        the rows of the page only, not for every match.
+
+        Args:
+            q (str): Words to search.
+            min_price (float): Minimum price per night (inclusive).
+            max_price (float): Maximum price per night (inclusive).
+            after (str): Cursor returned with the previous page.
+            limit (int): Maximum number of results.
+            columns (list): Select only these columns of the places:
+                PlaceMatch.place is then a row (see get_all_columns()).
+
+        Returns:
+            tuple: (list[PlaceMatch], next_cursor or None).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        terms = fulltext.search_terms(q)
+        if not terms:
+            return [], None
+
+        connection = self.db.session.connection()
+        if fulltext.has_places_index(connection):
+            query, score, rowid = self._match_fulltext(
+                terms, min_price is not None or max_price is not None)
+        else:
+            query, score, rowid = self._match_like(terms)
+        if min_price is not None:
+            query = query.where(self.model.price >= min_price)
+        if max_price is not None:
+            query = query.where(self.model.price <= max_price)
+
+        keys = [("score", False), ("rowid", False)]
+        if after is not None:
+            values = decode_cursor(after, [name for name, _ in keys])
+            query = query.where(
+                _keyset_condition([score, rowid], keys, values))
+        rows = self.db.session.execute(
+            query.order_by("score", rowid).limit(limit + 1)).all()
+
+        places = {}
+        if rows:
+            # Only the LIKE fallback builds snippets from descriptions
+            like = rows[0].title_highlight is None
+            if columns is not None and like:
+                columns = [*columns, "title", "description"]
+            places = self._get_by_rowids(
+                [row.rowid for row in rows], columns,
+                [undefer(self.model.description)] if like else [])
+
+        results = []
+        for row in rows[:limit]:
+            place = places[row.rowid]
+            if row.title_highlight is None:
+                # LIKE fallback: highlight in Python
+                results.append(PlaceMatch(
+                    place, row.score,
+                    fulltext.highlight(place.title, terms),
+                    fulltext.snippet(place.description, terms)))
+            else:
+                results.append(PlaceMatch(
+                    place, row.score, row.title_highlight, row.snippet))
+
+        if len(rows) <= limit:
+            return results, None
+        last = rows[limit - 1]
+        return results, encode_cursor([last.score, last.rowid])
+
+    def _match_fulltext(self, terms, join_places=False):
+        """SELECT rowid, BM25 score, highlighted title and snippet.
+
+        Returns:
+            tuple: (query, score expression, rowid column).
+        """
+        fts = fulltext.places_fts
+        table = literal_column(fulltext.PLACES_FTS)
+        score = func.bm25(table, 10.0, 1.0)
+        query = (
+            select(
+                fts.c.rowid,
+                score.label("score"),
+                func.highlight(table, 0, fulltext.MARK_START,
+                               fulltext.MARK_END).label("title_highlight"),
+                func.snippet(table, 1, fulltext.MARK_START,
+                             fulltext.MARK_END, fulltext.ELLIPSIS,
+                             fulltext.SNIPPET_TOKENS).label("snippet"),
+            )
+            .where(table.match(fulltext.match_expression(terms)))
+        )
+        if join_places:
+            # Only for the price filters: no places column is selected
+            query = query.join(self.model, _ROWID == fts.c.rowid)
+        return query, score, fts.c.rowid
+
+    def _match_like(self, terms):
+        """LIKE fallback of _match_fulltext(): full scan of places.
+
+        The score counts the terms found in the title (negated, so
+        that lower is better as with BM25). title_highlight and snippet
+        are NULL here and computed in Python by search_text().
+        """
+        place = self.model
+        score = -sum(
+            case((place.title.contains(term, autoescape=True), 1), else_=0)
+            for term in terms)
+        query = (
+            select(
+                _ROWID.label("rowid"),
+                score.label("score"),
+                literal_column("NULL").label("title_highlight"),
+                literal_column("NULL").label("snippet"),
+            )
+            .select_from(place)
+            .where(and_(*[
+                or_(place.title.contains(term, autoescape=True),
+                    place.description.contains(term, autoescape=True))
+                for term in terms
+            ]))
+        )
+        return query, score, _ROWID
+
+    def nearby(self, latitude, longitude, radius_km, limit=DEFAULT_PAGE_SIZE,
+               columns=None):
+        """Retrieve the places closest to a point, within radius_km.
+
+        Candidates are read with a bounding box around the circle,
+        through the places_rtree index (or the (latitude, longitude)
+        index without R*Tree), then ranked by exact haversine distance.
+        Only the coordinates of the candidates are fetched, the places
+        themselves are loaded for the returned ones only.
+
+        Args:
+            latitude (float): Latitude of the center.
+            longitude (float): Longitude of the center.
+            radius_km (float): Search radius, in kilometers.
+            limit (int): Maximum number of places to return.
+            columns (list): Select only these columns of the places:
+                PlaceDistance.place is then a row (see get_all_columns()).
+
+        Returns:
+            list[PlaceDistance]: Closest first.
+        """
+        connection = self.db.session.connection()
+        use_rtree = spatial.has_places_index(connection)
+
+        # Plain (rowid, lat, lon) tuples: no ORM processing per candidate
+        candidates = []
+        for box in spatial.bounding_boxes(latitude, longitude, radius_km):
+            query = (self._rtree_candidates(*box) if use_rtree
+                     else self._btree_candidates(*box))
+            candidates.extend(connection.execute(query))
+
+        distance_to = spatial.distance_from(latitude, longitude)
+        closest = heapq.nsmallest(limit, (
+            (distance, rowid) for rowid, distance in (
+                (rowid, distance_to(lat, lon))
+                for rowid, lat, lon in candidates)
+            if distance <= radius_km
+        ))
+        if not closest:
+            return []
+
+        places = self._get_by_rowids([rowid for _, rowid in closest], columns)
+        return [PlaceDistance(places[rowid], distance)
+                for distance, rowid in closest]
+
+    def _get_by_rowids(self, rowids, columns=None, options=()):
+        """Places of the given rowids, as {rowid: place}, in one SELECT.
+
+        With columns, rows of these columns instead of places
+        (options, loader options of the entities, are then ignored).
+        """
+        if columns is None:
+            return dict(self.db.session.execute(
+                select(_ROWID, self.model)
+                .where(_ROWID.in_(rowids))
+                .options(*options)
+            ).all())
+        statement = (
+            select(_ROWID.label("rowid"), *self._columns(columns, ()))
+            .select_from(self.model)
+            .where(_ROWID.in_(rowids))
+        )
+        return {row.rowid: row for row in self.db.session.execute(statement)}
+
+    def _rtree_candidates(self, min_lat, max_lat, min_lon, max_lon):
+        """Coordinates of the places whose R*Tree box meets the box."""
+        rtree = spatial.places_rtree
+        place = self.model
+        return (
+            select(rtree.c.id, place.latitude, place.longitude)
+            .join(place, _ROWID == rtree.c.id)
+            .where(rtree.c.min_lat <= max_lat, rtree.c.max_lat >= min_lat,
+                   rtree.c.min_lon <= max_lon, rtree.c.max_lon >= min_lon)
+        )
+
+    def _btree_candidates(self, min_lat, max_lat, min_lon, max_lon):
+        """Same as _rtree_candidates(), with ix_places_latitude_longitude."""
+        place = self.model
+        return (
+            select(_ROWID, place.latitude, place.longitude)
+            .where(place.latitude.between(min_lat, max_lat),
+                   place.longitude.between(min_lon, max_lon))
+        )
+
+    # ------------------------------------------------------
+    # Rating aggregates
+    # ------------------------------------------------------
+
+    def apply_rating_change(self, place_id, added=None, removed=None):
+        """Update the rating aggregates of a place in one UPDATE.
+
+        The new values are computed by the database (col = col + 1),
+        so concurrent review writes cannot lose an increment.
+
+        Args:
+            place_id (str): ID of the reviewed place.
+            added (int): Rating of a created review (or new rating).
+            removed (int): Rating of a deleted review (or old rating).
+        """
+        place = self.model
+        count_delta = int(added is not None) - int(removed is not None)
+        new_count = place.review_count + count_delta
+        new_sum = place.rating_sum + (added or 0) - (removed or 0)
+        values = {
+            "review_count": new_count,
+            "rating_sum": new_sum,
+            "rating_average": case(
+                (new_count > 0, cast(new_sum, Float) / new_count),
+                else_=0.0),
+        }
+        deltas = {}
+        if added is not None:
+            deltas[added] = deltas.get(added, 0) + 1
+        if removed is not None:
+            deltas[removed] = deltas.get(removed, 0) - 1
+        for rating, delta in deltas.items():
+            column = getattr(place, f"rating_{rating}_count")
+            values[column.key] = column + delta
+
+        self.db.session.execute(
+            update(place).where(place.id == place_id).values(**values)
+            .execution_options(cache_invalidate=[place_id])
+        )
+        commit(self.db.session)
+
+    def recompute_ratings(self, place_ids=None, chunk_size=500):
+        """Rebuild the rating aggregates from the reviews table.
+
+        Args:
+            place_ids (iterable): Places to rebuild, None for all of them.
+
+        Returns:
+            int: Number of places updated.
+        """
+        place = self.model
+
+        def reviews_of_place(*criteria):
+            return select(func.count(Review.id)).where(
+                Review.place_id == place.id, *criteria).scalar_subquery()
+
+        values = {
+            "review_count": reviews_of_place(),
+            "rating_sum": select(func.coalesce(func.sum(Review.rating), 0))
+            .where(Review.place_id == place.id).scalar_subquery(),
+            "rating_average": select(
+                func.coalesce(func.avg(Review.rating), 0.0))
+            .where(Review.place_id == place.id).scalar_subquery(),
+        }
+        for rating in RATINGS:
+            values[f"rating_{rating}_count"] = reviews_of_place(
+                Review.rating == rating)
+
+        statement = update(place).values(**values).execution_options(
+            synchronize_session=False)
+        if place_ids is None:
+            updated = self.db.session.execute(statement).rowcount
+        else:
+            place_ids = list(set(place_ids))
+            updated = 0
+            for start in range(0, len(place_ids), chunk_size):
+                chunk = place_ids[start:start + chunk_size]
+                updated += self.db.session.execute(
+                    statement.where(place.id.in_(chunk)).execution_options(
+                        cache_invalidate=chunk)).rowcount
+        commit(self.db.session)
+        self.db.session.expire_all()
+        return updated
+
+    def find_rating_mismatches(self):
+        """Return the ids of places whose aggregates disagree with reviews."""
+        place = self.model
+        stats = (
+            select(
+                Review.place_id,
+                func.count(Review.id).label("review_count"),
+                func.sum(Review.rating).label("rating_sum"),
+                func.avg(Review.rating).label("rating_average"),
+                *[func.sum((Review.rating == rating).cast(self.db.Integer))
+                  .label(f"rating_{rating}_count") for rating in RATINGS],
+            )
+            .group_by(Review.place_id)
+            .subquery()
+        )
+        columns = ["review_count", "rating_sum"] + [
+            f"rating_{rating}_count" for rating in RATINGS]
+        query = (
+            select(place.id)
+            .outerjoin(stats, stats.c.place_id == place.id)
+            .where(or_(
+                *[getattr(place, name) != func.coalesce(stats.c[name], 0)
+                  for name in columns],
+                func.abs(place.rating_average
+                         - func.coalesce(stats.c.rating_average, 0)) > 1e-9,
+            ))
+        )
+        return list(self.db.session.scalars(query))
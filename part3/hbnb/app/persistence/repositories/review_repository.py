@@ -5,7 +5,10 @@ Extended SQLAlchemyRepository with Review-specific queries.
 Located in:app/persistence/repositories/review_repository.py
 """
 
+from sqlalchemy import func, literal, select
+
 from app.models.review import Review
+from app.models.user import User
 from app.persistence.repository import SQLAlchemyRepository
 
 
@@ -22,3 +25,32 @@ class ReviewRepository(SQLAlchemyRepository):
     def get_reviews_by_user(self, user_id):
         """Retrieve all reviews written by a specific user."""
         return self.model.query.filter_by(user_id=user_id).all()
+
+    def exists(self, user_id, place_id):
+        """True if the user reviewed the place (one unique index lookup)."""
+        return self.db.session.scalar(
+            select(literal(1)).where(self.model.user_id == user_id,
+                                     self.model.place_id == place_id)
+        ) is not None
+
+    def get_reviewed_place_ids(self, user_id):
+        """Retrieve the IDs of the places reviewed by a user (ids only)."""
+        return self.db.session.scalars(
+            select(self.model.place_id).where(self.model.user_id == user_id)
+        ).all()
+
+    def get_place_reviews_version(self, place_id, authors=False):
+        """
+        Version the reviews of a place, in one SELECT.
+
+        Returns:
+            tuple: (count, max(updated_at)) of the reviews, plus
+            max(updated_at) of their authors when authors is True.
+        """
+        columns = [func.count(self.model.id), func.max(self.model.updated_at)]
+        if authors:
+            columns.append(func.max(User.updated_at))
+        statement = select(*columns).where(self.model.place_id == place_id)
+        if authors:
+            statement = statement.join(User, User.id == self.model.user_id)
+        return tuple(self.db.session.execute(statement).one())
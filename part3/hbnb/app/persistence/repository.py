@@ -8,6 +8,20 @@ contains:
 """
 
 from abc import ABC, abstractmethod
+from collections import namedtuple
+from functools import lru_cache
+
+from sqlalchemy import and_, event, func, insert, inspect, or_, select
+from sqlalchemy.orm import ColumnProperty, joinedload, selectinload, undefer
+
+from app.persistence import cache
+from app.persistence.pagination import (
+    DEFAULT_ORDER, DEFAULT_PAGE_SIZE, build_page, decode_cursor, parse_order
+)
+from app.persistence.unit_of_work import commit, in_unit_of_work
+
+# Rows sent per INSERT executemany / COMMIT by add_many()
+DEFAULT_CHUNK_SIZE = 1000
 
 
 # =================================
@@ -21,11 +35,19 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def get(self, obj_id):
+    def add_many(self, objs, chunk_size=DEFAULT_CHUNK_SIZE):
+        pass
+
+    @abstractmethod
+    def get(self, obj_id, load=None):
         pass
 
     @abstractmethod
-    def get_all(self):
+    def get_all(self, load=None):
+        pass
+
+    @abstractmethod
+    def get_many(self, ids):
         pass
 
     @abstractmethod
@@ -40,41 +62,223 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_all_by_attribute(self, attr_name, attr_value):
+        pass
+
+    @abstractmethod
+    def get_page(self, after=None, limit=DEFAULT_PAGE_SIZE,
+                 order_by=DEFAULT_ORDER, filters=None, load=None):
+        pass
+
+    @abstractmethod
+    def get_all_columns(self, columns, after=None, limit=DEFAULT_PAGE_SIZE,
+                        order_by=DEFAULT_ORDER, filters=None):
+        pass
+
+    @abstractmethod
+    def get_updated_at(self, obj_id):
+        pass
+
+    @abstractmethod
+    def get_collection_version(self, filters=None):
+        pass
+
 
 # ================================================
 # In-Memory Repository (Kept for tests / fallback)
 # ================================================
 
 class InMemoryRepository(Repository):
+    """Dict-backed repository.
+
+    Attributes named in indexes get a hash index (value -> objects):
+    get_by_attribute() and get_all_by_attribute() on them are O(1)
+    instead of a scan. Indexes follow add(), update(), delete() and
+    any later assignment of an indexed column on a stored object
+    (SQLAlchemy "set" attribute events).
 
-    def __init__(self):
+    Example:
+        users = InMemoryRepository(indexes=["email"])
+    """
+
+    def __init__(self, indexes=None):
         self._storage = {}
+        # attr -> {value: {obj_id: obj}}, buckets keep insertion order
+        self._indexes = {attr: {} for attr in indexes or []}
+        # attr -> {obj_id: value}, the key each object is filed under
+        self._keys = {attr: {} for attr in self._indexes}
 
     def add(self, obj):
+        # Column defaults (id, created_at, ...) are only applied on
+        # flush: resolve them in Python, as add_many() does
+        _column_values(inspect(type(obj)), obj)
+        if obj.id in self._storage:
+            self._unindex(self._storage[obj.id])
         self._storage[obj.id] = obj
-
-    def get(self, obj_id):
+        for attr in self._indexes:
+            self._file(obj, attr, getattr(obj, attr, None))
+            _watch_attribute(type(obj), attr)
+        if self._indexes:
+            repositories = obj.__dict__.setdefault(_REPOSITORIES_KEY, [])
+            if self not in repositories:
+                repositories.append(self)
+
+    def add_many(self, objs, chunk_size=DEFAULT_CHUNK_SIZE):
+        for obj in objs:
+            self.add(obj)
+
+    # load is accepted for interface parity: in memory, relations
+    # are plain attributes and are always "loaded"
+    def get(self, obj_id, load=None):
         return self._storage.get(obj_id)
 
-    def get_all(self):
+    def get_all(self, load=None):
         return list(self._storage.values())
 
+    def get_by_ids(self, ids):
+        return {
+            obj_id: self._storage[obj_id]
+            for obj_id in ids if obj_id in self._storage
+        }
+
+    def get_columns_by_ids(self, columns, ids):
+        row = _row_type(tuple(columns))
+        return {
+            obj_id: row(*(getattr(self._storage[obj_id], name)
+                          for name in columns))
+            for obj_id in ids if obj_id in self._storage
+        }
+
+    def get_many(self, ids):
+        ids = list(dict.fromkeys(ids))
+        return ([self._storage[i] for i in ids if i in self._storage],
+                [i for i in ids if i not in self._storage])
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             obj.update(data)
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        obj = self._storage.pop(obj_id, None)
+        if obj is not None:
+            self._unindex(obj)
+            repositories = obj.__dict__.get(_REPOSITORIES_KEY, [])
+            if self in repositories:
+                repositories.remove(self)
 
     def get_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._indexes:
+            bucket = self._indexes[attr_name].get(attr_value)
+            return next(iter(bucket.values())) if bucket else None
         return next(
             (obj for obj in self._storage.values()
             if getattr(obj, attr_name) == attr_value),
             None
         )
 
+    def get_all_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._indexes:
+            return list(self._indexes[attr_name].get(attr_value, {}).values())
+        return [
+            obj for obj in self._storage.values()
+            if getattr(obj, attr_name) == attr_value
+        ]
+
+    def reindex(self, obj, attr_name, value):
+        """Move obj to the bucket of value (new value of attr_name)."""
+        if attr_name not in self._indexes or self._storage.get(obj.id) is not obj:
+            return
+        self._remove(obj, attr_name)
+        self._file(obj, attr_name, value)
+
+    def _file(self, obj, attr_name, value):
+        self._indexes[attr_name].setdefault(value, {})[obj.id] = obj
+        self._keys[attr_name][obj.id] = value
+
+    def _remove(self, obj, attr_name):
+        value = self._keys[attr_name].pop(obj.id)
+        bucket = self._indexes[attr_name][value]
+        del bucket[obj.id]
+        if not bucket:
+            del self._indexes[attr_name][value]
+
+    def _unindex(self, obj):
+        for attr in self._indexes:
+            self._remove(obj, attr)
+
+    def get_page(self, after=None, limit=DEFAULT_PAGE_SIZE,
+                 order_by=DEFAULT_ORDER, filters=None, load=None):
+        keys = parse_order(order_by)
+        objs = [
+            obj for obj in self._storage.values()
+            if all(getattr(obj, k) == v for k, v in (filters or {}).items())
+        ]
+        # Stable sorts from the least to the most significant key
+        for name, descending in reversed(keys):
+            objs.sort(key=lambda obj: getattr(obj, name), reverse=descending)
+
+        if after is not None:
+            values = decode_cursor(after, [name for name, _ in keys])
+            objs = [obj for obj in objs if _after_cursor(obj, keys, values)]
+        return build_page(objs[:limit + 1], limit, keys)
+
+    def get_all_columns(self, columns, after=None, limit=DEFAULT_PAGE_SIZE,
+                        order_by=DEFAULT_ORDER, filters=None):
+        objs, next_cursor = self.get_page(after, limit, order_by, filters)
+        row = _row_type(tuple(columns))
+        return [row(*(getattr(obj, name) for name in columns))
+                for obj in objs], next_cursor
+
+    def get_updated_at(self, obj_id):
+        obj = self._storage.get(obj_id)
+        return obj.updated_at if obj is not None else None
+
+    def get_collection_version(self, filters=None):
+        objs = [
+            obj for obj in self._storage.values()
+            if all(getattr(obj, k) == v for k, v in (filters or {}).items())
+        ]
+        return len(objs), max((obj.updated_at for obj in objs), default=None)
+
+
+@lru_cache(maxsize=None)
+def _row_type(columns):
+    """Named tuple type of the rows of InMemoryRepository.get_all_columns()."""
+    return namedtuple("Row", columns)
+
+
+# Instance __dict__ key listing the InMemoryRepository objects holding it
+_REPOSITORIES_KEY = "_in_memory_repositories"
+# (class, attribute) pairs with a reindexing "set" listener
+_watched_attributes = set()
+
+
+def _watch_attribute(cls, attr_name):
+    """Reindex stored objects whenever cls.attr_name is assigned."""
+    if (cls, attr_name) in _watched_attributes:
+        return
+    _watched_attributes.add((cls, attr_name))
+    attribute = getattr(cls, attr_name, None)
+    # Plain (unmapped) attributes are only indexed by add() / update()
+    if hasattr(attribute, "dispatch"):
+        event.listen(attribute, "set", _reindex_on_set)
+
+
+def _reindex_on_set(target, value, oldvalue, initiator):
+    for repository in target.__dict__.get(_REPOSITORIES_KEY, ()):
+        repository.reindex(target, initiator.key, value)
+
+
+def _after_cursor(obj, keys, values):
+    """Return True if obj sorts strictly after the cursor values."""
+    for (name, descending), value in zip(keys, values):
+        current = getattr(obj, name)
+        if current != value:
+            return current < value if descending else current > value
+    return False
+
 
 # ===================================
 # SQLAlchemy Repository
@@ -85,6 +289,8 @@ class SQLAlchemyRepository(Repository):
 
     Handles all CRUD operations through SQLAlchemy sessiosn.
     Can be used for any mapped model (User, Place,Review, Amenity).
+    Writes commit immediately, or only flush inside a unit of work
+    (see app.persistence.unit_of_work).
     """
 
 
@@ -99,15 +305,117 @@ class SQLAlchemyRepository(Repository):
     def add(self, obj):
         """Add a new object to the database."""
         self.db.session.add(obj)
-        self.db.session.commit()
-
-    def get(self, obj_id):
-        """Retrieve an object by its primary key."""
-        return self.db.session.get(self.model, obj_id)
+        commit(self.db.session)
+
+    def add_many(self, objs, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Insert many new objects with one executemany and commit per chunk.
+
+        Inside a unit of work each chunk is only flushed.
+
+        Column defaults (id, created_at, ...) are resolved in Python and
+        written back on the objects, so callers can read their ids.
+        Many-to-many collections already set on the objects (like
+        Place.amenities) are inserted in the association table within
+        the same chunk. The objects are not attached to the session.
+
+        Args:
+            objs (list): New (transient) model instances.
+            chunk_size (int): Number of rows per INSERT batch / COMMIT.
+
+        Raises:
+            sqlalchemy.exc.IntegrityError: If a chunk violates a constraint.
+                That chunk is rolled back, previous chunks stay committed.
+                Inside a unit of work nothing is rolled back here: the
+                unit of work decides for all its writes.
+        """
+        mapper = inspect(self.model)
+        for start in range(0, len(objs), chunk_size):
+            chunk = objs[start:start + chunk_size]
+            rows = [_column_values(mapper, obj) for obj in chunk]
+            try:
+                self.db.session.execute(insert(self.model), rows)
+                for table, links in _secondary_rows(mapper, chunk).items():
+                    self.db.session.execute(table.insert(), links)
+                commit(self.db.session)
+            except Exception:
+                if not in_unit_of_work(self.db.session):
+                    self.db.session.rollback()
+                raise
+
+    def get_by_ids(self, ids, chunk_size=500):
+        """Retrieve the objects matching ids, as a {id: obj} dict.
+
+        Runs one IN query per chunk of ids (SQLite limits the number
+        of bound parameters per statement). Unknown ids are absent
+        from the result.
+        """
+        ids = list(set(ids))
+        found = {}
+        for start in range(0, len(ids), chunk_size):
+            for obj in self.model.query.filter(
+                    self.model.id.in_(ids[start:start + chunk_size])):
+                found[obj.id] = obj
+        return found
+
+    def get_columns_by_ids(self, columns, ids, chunk_size=500):
+        """Retrieve rows of the given columns matching ids, as a {id: row} dict.
+
+        get_by_ids() without entities: one IN query per chunk of ids,
+        selecting the columns only (see get_all_columns()).
+        """
+        ids = list(set(ids))
+        columns = self._columns(columns, ("id",))
+        found = {}
+        for start in range(0, len(ids), chunk_size):
+            for row in self.model.query.with_entities(*columns).filter(
+                    self.model.id.in_(ids[start:start + chunk_size])):
+                found[row.id] = row
+        return found
+
+    def get_many(self, ids):
+        """Retrieve several objects by primary key with one IN query.
+
+        Args:
+            ids (iterable): Primary keys; duplicates are ignored.
+
+        Returns:
+            tuple: (objects, missing_ids), both in the order of ids.
+            An empty ids runs no query.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return [], []
+        found = {
+            obj.id: obj
+            for obj in self.model.query.filter(self.model.id.in_(ids))
+        }
+        return ([found[i] for i in ids if i in found],
+                [i for i in ids if i not in found])
+
+    def get(self, obj_id, load=None):
+        """Retrieve an object by its primary key.
+
+        Read through the repository cache when the model is cached
+        (REPOSITORY_CACHE, see app.persistence.cache).
+
+        Args:
+            obj_id (str): Primary key.
+            load (list): Relationships to load eagerly, by name
+                (like ["owner", "amenities"]) or as loader options.
+        """
+        obj = cache.get(self.db.session, self.model, obj_id, load)
+        if obj is not None:
+            return obj
+        obj = self.db.session.get(
+            self.model, obj_id, options=self._loader_options(load)
+        )
+        if obj is not None:
+            cache.store(self.db.session, obj)
+        return obj
 
-    def get_all(self):
-        """Retrieve all objects of this model."""
-        return self.model.query.all()
+    def get_all(self, load=None):
+        """Retrieve all objects of this model (see get() for load)."""
+        return self.model.query.options(*self._loader_options(load)).all()
 
     def update(self, obj_id, data):
         """Update an object's attributes by ID."""
@@ -115,7 +423,8 @@ class SQLAlchemyRepository(Repository):
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            self.db.session.commit()
+            cache.invalidate(self.model, [obj_id])
+            commit(self.db.session)
 
 
     def delete(self, obj_id):
@@ -123,10 +432,227 @@ class SQLAlchemyRepository(Repository):
         obj = self.get(obj_id)
         if obj:
             self.db.session.delete(obj)
-            self.db.session.commit()
+            cache.invalidate(self.model, [obj_id])
+            commit(self.db.session)
 
     def get_by_attribute(self, attr_name, attr_value):
         """Retrieve the first object matching a given attribute value."""
         return self.model.query.filter_by(
             **{attr_name: attr_value}
         ).first()
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Retrieve every object matching a given attribute value."""
+        return self.model.query.filter_by(
+            **{attr_name: attr_value}
+        ).all()
+
+    def get_page(self, after=None, limit=DEFAULT_PAGE_SIZE,
+                 order_by=DEFAULT_ORDER, filters=None, load=None):
+        """Retrieve one page of objects using keyset pagination.
+
+        Args:
+            after (str): Opaque cursor returned with the previous page.
+            limit (int): Maximum number of objects to return.
+            order_by (tuple): Sort keys, '-' prefix for descending.
+                Must end with a unique column (id) to be stable.
+            filters (dict): Optional equality filters (like filter_by).
+            load (list): Relationships to load eagerly (see get()).
+
+        Returns:
+            tuple: (items, next_cursor), next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        query = self.model.query.options(*self._loader_options(load))
+        if filters:
+            query = query.filter_by(**filters)
+        return self._paginate(query, after, limit, order_by)
+
+    def get_all_columns(self, columns, after=None, limit=DEFAULT_PAGE_SIZE,
+                        order_by=DEFAULT_ORDER, filters=None):
+        """Retrieve one page of rows holding only the given columns.
+
+        Same keyset pagination as get_page(), but no entity is built:
+        the SELECT lists the columns only, and each row is a named
+        tuple (row.id, row.title, ...). Meant for list endpoints, which
+        emit a few fields of many objects.
+
+        Args:
+            columns (iterable of str): Column attributes to select.
+                The sort keys missing from it are selected as well.
+            after, limit, order_by, filters: See get_page().
+
+        Returns:
+            tuple: (rows, next_cursor), next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        query = self.model.query.with_entities(
+            *self._columns(columns, order_by))
+        if filters:
+            query = query.filter_by(**filters)
+        return self._paginate(query, after, limit, order_by)
+
+    def get_updated_at(self, obj_id):
+        """Return the updated_at of an object (one column), None if absent.
+
+        Cheap version check of conditional GETs: no entity is built,
+        and no SELECT at all when the row is in the repository cache.
+        """
+        updated_at = cache.get_column(self.model, obj_id, "updated_at")
+        if updated_at is not None:
+            return updated_at
+        return self.db.session.scalar(
+            select(self.model.updated_at).where(self.model.id == obj_id))
+
+    def get_collection_version(self, filters=None):
+        """Return (row count, max(updated_at)) of the model, in one SELECT.
+
+        Any insert or delete changes the count, any update the
+        maximum: together they version a collection.
+
+        Args:
+            filters (dict): Optional equality filters (like filter_by).
+        """
+        statement = select(
+            func.count(), func.max(self.model.updated_at)
+        ).where(*[
+            getattr(self.model, name) == value
+            for name, value in (filters or {}).items()
+        ])
+        count, updated_at = self.db.session.execute(statement).one()
+        return count, updated_at
+
+    def _columns(self, columns, order_by):
+        """Column attributes of columns, plus the missing sort keys."""
+        names = list(dict.fromkeys(columns))
+        names += [name for name, _ in parse_order(order_by)
+                  if name not in names]
+        return [getattr(self.model, name) for name in names]
+
+    def _loader_options(self, load):
+        """
+        Translate relationship names into eager loading options.
+
+        Collections use selectinload (one extra SELECT ... IN for the
+        whole result), many-to-one relations use joinedload (same
+        SELECT). Deferred columns (like Place.description) named in
+        load are undeferred. Loader option objects are passed through
+        unchanged.
+        """
+        options = []
+        for item in load or []:
+            if not isinstance(item, str):
+                options.append(item)
+                continue
+            relation = getattr(self.model, item)
+            if isinstance(relation.property, ColumnProperty):
+                options.append(undefer(relation))
+            elif relation.property.uselist:
+                options.append(selectinload(relation))
+            else:
+                options.append(joinedload(relation))
+        return options
+
+    def _paginate(self, query, after, limit, order_by):
+        """Apply keyset ordering, cursor and limit to a query."""
+        query, keys = _keyset_page(query, self.model, after, limit, order_by)
+        return build_page(query.all(), limit, keys)
+
+
+def paginate(statement, model, after=None, limit=DEFAULT_PAGE_SIZE,
+             order_by=DEFAULT_ORDER):
+    """Retrieve one page of a SELECT statement using keyset pagination.
+
+    Used for write-only relationships, whose select() gives the
+    statement of the collection (like place.reviews.select()).
+
+    Args:
+        statement (Select): Statement selecting model objects.
+        model: Mapped class selected (sort keys are read from it).
+        after, limit, order_by: See SQLAlchemyRepository.get_page().
+
+    Returns:
+        tuple: (items, next_cursor), next_cursor is None on the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    from app import db
+    statement, keys = _keyset_page(statement, model, after, limit, order_by)
+    return build_page(db.session.scalars(statement).all(), limit, keys)
+
+
+def _keyset_page(query, model, after, limit, order_by):
+    """Apply keyset ordering, cursor and limit + 1 to a query or select."""
+    keys = parse_order(order_by)
+    columns = [getattr(model, name) for name, _ in keys]
+
+    if after is not None:
+        values = decode_cursor(after, [name for name, _ in keys])
+        query = query.filter(_keyset_condition(columns, keys, values))
+
+    query = query.order_by(*[
+        column.desc() if descending else column.asc()
+        for column, (_, descending) in zip(columns, keys)
+    ])
+    return query.limit(limit + 1), keys
+
+
+def _column_values(mapper, obj):
+    """Return the column values of obj, filling Python-side defaults."""
+    values = {}
+    for attr in mapper.column_attrs:
+        value = getattr(obj, attr.key)
+        default = attr.columns[0].default
+        if value is None and default is not None:
+            value = default.arg(None) if default.is_callable else default.arg
+            setattr(obj, attr.key, value)
+        values[attr.key] = value
+    return values
+
+
+def _secondary_rows(mapper, objs):
+    """Collect association table rows for collections set on objs."""
+    rows = {}
+    for rel in mapper.relationships:
+        if rel.secondary is None:
+            continue
+        for obj in objs:
+            # Only collections explicitly set: never lazy load here
+            for target in obj.__dict__.get(rel.key) or []:
+                row = {
+                    secondary.key: getattr(obj, local.key)
+                    for local, secondary in rel.synchronize_pairs
+                }
+                row.update({
+                    secondary.key: getattr(target, remote.key)
+                    for remote, secondary in rel.secondary_synchronize_pairs
+                })
+                rows.setdefault(rel.secondary, []).append(row)
+    return rows
+
+
+def _keyset_condition(columns, keys, values):
+    """
+    Build the WHERE clause selecting rows strictly after the cursor.
+
+    (a, b) > (x, y) is expanded to: a > x OR (a = x AND b > y),
+    which also supports mixed ascending / descending keys.
+    The redundant leading `a >= x` lets the database seek the
+    (a, b) index instead of OR-ing two index scans and sorting.
+    """
+    first_column, (_, first_descending) = columns[0], keys[0]
+    guard = (first_column <= values[0] if first_descending
+             else first_column >= values[0])
+
+    clauses = []
+    for i, (column, (_, descending), value) in enumerate(
+            zip(columns, keys, values)):
+        equal = [columns[j] == values[j] for j in range(i)]
+        step = column < value if descending else column > value
+        clauses.append(and_(*equal, step))
+    return and_(guard, or_(*clauses))
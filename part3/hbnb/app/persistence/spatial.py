@@ -0,0 +1,158 @@
+"""
+Spatial index module.
+
+places_rtree is an SQLite R*Tree index of places coordinates, one
+point box (min = max) per place, keyed by the implicit rowid of
+places. Triggers update it whenever a place is created, moved or
+deleted, whatever the writer (facade, bulk insert or raw SQL).
+
+Nearby searches read the R*Tree with a bounding box around the
+circle, then rank the candidates by exact haversine distance.
+Without R*Tree support, the bounding box is read through the
+(latitude, longitude) index of places instead.
+
+As with places_fts, VACUUM may renumber the rowids of places:
+rebuild the index afterwards (rebuild_places_index).
+"""
+
+import math
+
+from sqlalchemy import Column, Float, Integer, MetaData, Table, inspect
+
+PLACES_RTREE = "places_rtree"
+
+# Mean Earth radius (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Separate metadata: db.create_all() / drop_all() must not touch it
+places_rtree = Table(
+    PLACES_RTREE, MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+    Column("min_lon", Float),
+    Column("max_lon", Float),
+)
+
+# Same statements in schema.sql
+_CREATE_STATEMENTS = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS places_rtree USING rtree(
+        id, min_lat, max_lat, min_lon, max_lon
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS places_rtree_ai AFTER INSERT ON places BEGIN
+        INSERT INTO places_rtree(id, min_lat, max_lat, min_lon, max_lon)
+        VALUES (new.rowid, new.latitude, new.latitude,
+                new.longitude, new.longitude);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS places_rtree_ad AFTER DELETE ON places BEGIN
+        DELETE FROM places_rtree WHERE id = old.rowid;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS places_rtree_au
+    AFTER UPDATE OF latitude, longitude ON places BEGIN
+        UPDATE places_rtree
+        SET min_lat = new.latitude, max_lat = new.latitude,
+            min_lon = new.longitude, max_lon = new.longitude
+        WHERE id = new.rowid;
+    END""",
+)
+
+_FILL_STATEMENT = (
+    "INSERT INTO places_rtree(id, min_lat, max_lat, min_lon, max_lon) "
+    "SELECT rowid, latitude, latitude, longitude, longitude FROM places"
+)
+
+
+def rtree_available(connection):
+    """Return True if the database behind connection supports R*Tree."""
+    if connection.dialect.name != "sqlite":
+        return False
+    return bool(connection.exec_driver_sql(
+        "SELECT sqlite_compileoption_used('ENABLE_RTREE')").scalar())
+
+
+def create_places_index(engine):
+    """
+    Create places_rtree and its triggers if they do not exist yet.
+
+    The index is filled from the existing places when it is created.
+
+    Returns:
+        bool: True if the index exists (or was created).
+    """
+    with engine.begin() as connection:
+        if inspect(connection).has_table(PLACES_RTREE):
+            return True
+        if not rtree_available(connection):
+            return False
+        for statement in _CREATE_STATEMENTS:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(_FILL_STATEMENT)
+        return True
+
+
+def rebuild_places_index(engine):
+    """Refill places_rtree from places (after a VACUUM, for instance)."""
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM places_rtree")
+        connection.exec_driver_sql(_FILL_STATEMENT)
+
+
+def has_places_index(connection):
+    """Return True if places_rtree exists (cached per DB connection)."""
+    if PLACES_RTREE not in connection.info:
+        connection.info[PLACES_RTREE] = inspect(connection).has_table(
+            PLACES_RTREE)
+    return connection.info[PLACES_RTREE]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points, in kilometers."""
+    return distance_from(lat1, lon1)(lat2, lon2)
+
+
+def distance_from(lat, lon):
+    """
+    Return a function computing the haversine distance (km) to (lat, lon).
+
+    The trigonometry of the center is computed once, for ranking
+    many candidates against the same point.
+    """
+    phi1 = math.radians(lat)
+    cos_phi1 = math.cos(phi1)
+    radians, sin, cos = math.radians, math.sin, math.cos
+
+    def distance(lat2, lon2):
+        phi2 = radians(lat2)
+        a = (sin((phi2 - phi1) / 2) ** 2
+             + cos_phi1 * cos(phi2) * sin(radians(lon2 - lon) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+    return distance
+
+
+def bounding_boxes(lat, lon, radius_km):
+    """
+    Boxes containing every point within radius_km of (lat, lon).
+
+    Returns:
+        list[tuple]: (min_lat, max_lat, min_lon, max_lon) boxes, two of
+        them when the circle crosses the antimeridian.
+    """
+    d_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle contains a pole: every longitude is reachable
+        return [(max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0)]
+
+    # Widest longitude span of the circle (at its tangent latitude)
+    d_lon = math.degrees(math.asin(
+        min(1.0, math.sin(math.radians(d_lat)) / math.cos(math.radians(lat)))))
+    min_lon, max_lon = lon - d_lon, lon + d_lon
+    if min_lon < -180:
+        return [(min_lat, max_lat, min_lon + 360, 180.0),
+                (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, max_lat, min_lon, 180.0),
+                (min_lat, max_lat, -180.0, max_lon - 360)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
@@ -0,0 +1,108 @@
+"""
+Unit of work module.
+
+Groups every write of a block of code (typically one HTTP request)
+into a single transaction.
+
+Outside a unit of work, commit() behaves like db.session.commit(),
+one COMMIT per mutation (the historical behaviour). Inside a unit of
+work, commit() only flushes: SQL is sent (so ids, constraints and
+later queries see the changes) and the single COMMIT, or ROLLBACK,
+happens when the outermost unit of work ends.
+
+Usage:
+    with unit_of_work():
+        facade.create_place(...)
+        facade.create_review(...)   # one COMMIT for both
+
+init_app() opens one unit of work per Flask request: committed when
+the response status is < 400, rolled back otherwise.
+"""
+
+from contextlib import contextmanager
+
+from app import db
+
+_DEPTH_KEY = "unit_of_work_depth"
+_FLUSHED_KEY = "unit_of_work_flushed"
+
+
+def in_unit_of_work(session=None):
+    """Return True if a unit of work is active on the session."""
+    session = session if session is not None else db.session
+    return session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def commit(session=None):
+    """
+    Commit the session, or only flush it inside a unit of work.
+
+    Repositories and models call this instead of session.commit().
+    """
+    session = session if session is not None else db.session
+    if in_unit_of_work(session):
+        session.flush()
+        session.info[_FLUSHED_KEY] = True
+    else:
+        session.commit()
+
+
+def begin(session=None):
+    """Enter a (possibly nested) unit of work."""
+    session = session if session is not None else db.session
+    session.info[_DEPTH_KEY] = session.info.get(_DEPTH_KEY, 0) + 1
+
+
+def end(success, session=None):
+    """
+    Leave a unit of work.
+
+    Only the outermost one commits (success=True) or rolls back.
+    A unit of work that wrote nothing (read-only request) just ends
+    its transaction with a ROLLBACK: no COMMIT is issued.
+    """
+    session = session if session is not None else db.session
+    depth = session.info.get(_DEPTH_KEY, 0) - 1
+    session.info[_DEPTH_KEY] = max(depth, 0)
+    if depth > 0:
+        return
+    wrote = (session.info.pop(_FLUSHED_KEY, False)
+             or session.new or session.dirty or session.deleted)
+    if success and wrote:
+        session.commit()
+    else:
+        session.rollback()
+
+
+@contextmanager
+def unit_of_work():
+    """Run a block of code in a single transaction."""
+    begin()
+    try:
+        yield db.session
+    except Exception:
+        end(False)
+        raise
+    end(True)
+
+
+def init_app(app):
+    """Register the per-request unit of work hooks on a Flask app."""
+
+    @app.before_request
+    def _begin_unit_of_work():
+        begin()
+
+    @app.after_request
+    def _end_unit_of_work(response):
+        if in_unit_of_work():
+            end(response.status_code < 400)
+        return response
+
+    @app.teardown_request
+    def _abort_unit_of_work(exc):
+        # Reached with an active unit of work only if the request
+        # raised before after_request could run
+        if in_unit_of_work():
+            db.session.info[_DEPTH_KEY] = 1
+            end(False)
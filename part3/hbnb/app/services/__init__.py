@@ -5,8 +5,8 @@ This module initializes the HBnBFacade instance,
 which acts as the entry point to the business logic layer.
 """
 
-from app.services.facade import HBnBFacade
+from app.services.facade import HBnBFacade, BulkValidationError
 
 facade = HBnBFacade()
 
-__all__ = ["facade", "HBnBFacade"]
+__all__ = ["facade", "HBnBFacade", "BulkValidationError"]
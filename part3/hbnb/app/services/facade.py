@@ -1,14 +1,39 @@
 # app/services/facade.py
 
+import math
+
 from app.persistence.repositories.user_repository import UserRepository
-from app.persistence.repositories.place_repository import PlaceRepository
+from app.persistence.repositories.place_repository import (
+    SORTS as PLACE_SORTS, PlaceRepository
+)
 from app.persistence.repositories.review_repository import ReviewRepository
 from app.persistence.repositories.amenity_repository import AmenityRepository
 from app.persistence.repository import SQLAlchemyRepository
+from app.persistence import cache as repository_cache
+from app.persistence.pagination import DEFAULT_PAGE_SIZE
+from app.persistence.unit_of_work import unit_of_work
+from app.services import response_cache
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+class BulkValidationError(ValueError):
+    """
+    Raised by the bulk create methods when some rows are invalid.
+
+    Nothing is inserted in that case.
+
+    Attributes:
+        errors (list[dict]): One {'index': int, 'error': str} entry
+            per invalid row, index being the position in the input list.
+    """
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid row(s)")
+        self.errors = errors
 
 
 class HBnBFacade:
@@ -72,9 +97,50 @@ class HBnBFacade:
         """Retrieve all users."""
         return self.user_repo.get_all()
 
+    def get_users_page(self, after=None, limit=DEFAULT_PAGE_SIZE,
+                       columns=None):
+        """
+        Retrieve one page of users, sorted by (created_at, id).
+
+        With columns, the page holds rows of these columns only
+        (see SQLAlchemyRepository.get_all_columns()).
+        """
+        return _page(self.user_repo, after, limit, columns)
+
+    def get_users_by_ids(self, user_ids, columns):
+        """
+        Retrieve the given columns of several users with one IN query.
+
+        Returns:
+            dict: {user id: row}, unknown ids are absent.
+        """
+        return self.user_repo.get_columns_by_ids(columns, user_ids)
+
+    def get_user_updated_at(self, user_id):
+        """updated_at of a user (conditional GET), None if not found."""
+        return self.user_repo.get_updated_at(user_id)
+
+    def get_users_version(self):
+        """(count, max(updated_at)) of the users (conditional GET)."""
+        return self.user_repo.get_collection_version()
+
     def delete_user(self, user_id):
-        """Delete a user by ID."""
-        return self.user_repo.delete(user_id)
+        """
+        Delete a user by ID, with their places and reviews.
+
+        Places and reviews are removed by the database (ON DELETE
+        CASCADE), never loaded; the rating aggregates of the places
+        the user had reviewed are then rebuilt.
+        """
+        with unit_of_work():
+            place_ids = self.review_repo.get_reviewed_place_ids(user_id)
+            owned_ids = self.place_repo.get_place_ids_by_owner(user_id)
+            response_cache.invalidate(
+                f"user:{user_id}", "places:list",
+                *(f"place:{pid}" for pid in {*place_ids, *owned_ids}))
+            self.user_repo.delete(user_id)
+            if place_ids:
+                self.place_repo.recompute_ratings(place_ids)
 
     def update_user(self, user_id, user_data):
         """Update an existing user."""
@@ -95,6 +161,7 @@ class HBnBFacade:
             user.hash_password(user_data["password"])
 
         user.save()
+        response_cache.invalidate(f"user:{user_id}")
         return user
 
     # ==================================================
@@ -124,6 +191,7 @@ class HBnBFacade:
         owner = self.user_repo.get(place_data["owner_id"])
         if not owner:
             raise ValueError("Owner not found")
+        amenities = self._get_amenities(place_data.get("amenities", []))
 
         # Create the Place instance
         place = Place(
@@ -133,29 +201,94 @@ class HBnBFacade:
             latitude=place_data["latitude"],
             longitude=place_data["longitude"],
             owner_id=place_data["owner_id"],
+            # Linked before the place joins the session: no lazy load
+            # of the (empty) collection, links inserted with the place
+            amenities=amenities,
         )
-
-        # Attach amenities if provided
-        for amenity_id in place_data.get("amenities", []):
-            amenity = self.amenity_repo.get(amenity_id)
-            if not amenity:
-                raise ValueError(f"Amenity {amenity_id} not found")
-            place.add_amenity(amenity)
-
         self.place_repo.add(place)
+        response_cache.invalidate("places:list")
         return place
 
-    def get_place(self, place_id):
+    def create_places_bulk(self, places_data, chunk_size=1000):
+        """
+        Create many places at once (seeding / migrations).
+
+        Every row is validated first; rows are then inserted with one
+        executemany and one commit per chunk.
+
+        Args:
+            places_data (list[dict]): Same fields as create_place().
+            chunk_size (int): Rows per INSERT batch / COMMIT.
+
+        Returns:
+            list[Place]: The created places, in input order.
+
+        Raises:
+            BulkValidationError: If any row is invalid (nothing inserted).
+        """
+        owners = self.user_repo.get_by_ids(
+            row.get("owner_id") for row in places_data)
+        amenities = self.amenity_repo.get_by_ids(
+            amenity_id for row in places_data
+            for amenity_id in row.get("amenities", []))
+
+        places, errors = [], []
+        for index, row in enumerate(places_data):
+            try:
+                if row.get("owner_id") not in owners:
+                    raise ValueError("Owner not found")
+                missing = [amenity_id for amenity_id in row.get("amenities", [])
+                           if amenity_id not in amenities]
+                if missing:
+                    raise _amenities_not_found(missing)
+                place = Place(
+                    title=row["title"],
+                    description=row.get("description", ""),
+                    price=row["price"],
+                    latitude=row["latitude"],
+                    longitude=row["longitude"],
+                    owner_id=row["owner_id"],
+                )
+                # No backref events: the amenities must not be touched
+                set_committed_value(place, "amenities", [
+                    amenities[a] for a in row.get("amenities", [])])
+                places.append(place)
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append({"index": index, "error": _row_error(e)})
+
+        if errors:
+            raise BulkValidationError(errors)
+        self.place_repo.add_many(places, chunk_size=chunk_size)
+        response_cache.invalidate("places:list")
+        return places
+
+    def get_place(self, place_id, load=None):
         """
         Retrieve a place by ID.
 
         Args:
             place_id (str): ID of the place.
+            load (list, optional): Relationships to load eagerly,
+                like ["owner", "amenities"].
 
         Returns:
             Place or None: The Place instance or None if not found.
         """
-        return self.place_repo.get(place_id)
+        return self.place_repo.get(place_id, load=load)
+
+    def get_place_version(self, place_id):
+        """
+        Version of a place with its owner and amenities (conditional GET).
+
+        Returns:
+            tuple or None: (place updated_at, owner updated_at,
+            amenity count, max amenity updated_at), None if not found.
+        """
+        return self.place_repo.get_detail_version(place_id)
+
+    def get_places_version(self):
+        """(count, max(updated_at)) of the places (conditional GET)."""
+        return self.place_repo.get_collection_version()
 
     def get_all_places(self):
         """
@@ -166,6 +299,130 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_page(self, after=None, limit=DEFAULT_PAGE_SIZE,
+                        columns=None):
+        """
+        Retrieve one page of places, sorted by (created_at, id).
+
+        Args:
+            after (str): Cursor returned with the previous page.
+            limit (int): Maximum number of places to return.
+            columns (list, optional): Select only these columns.
+
+        Returns:
+            tuple: (list[Place], next_cursor or None), rows instead
+            of places with columns.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        return _page(self.place_repo, after, limit, columns)
+
+    def search_places(self, min_price=None, max_price=None, amenity_ids=None,
+                      bbox=None, sort=None, after=None,
+                      limit=DEFAULT_PAGE_SIZE, columns=None):
+        """
+        Retrieve one page of places filtered and sorted by the database.
+
+        Args:
+            min_price (float, optional): Minimum price per night.
+            max_price (float, optional): Maximum price per night.
+            amenity_ids (list, optional): Required amenity IDs (all of them).
+            bbox (tuple, optional): (min_lon, min_lat, max_lon, max_lat).
+            sort (str, optional): 'price', 'rating' (best first) or
+                'newest'. Defaults to (created_at, id).
+            after (str): Cursor returned with the previous page.
+            limit (int): Maximum number of places to return.
+            columns (list, optional): Select only these columns.
+
+        Returns:
+            tuple: (list[Place], next_cursor or None), rows instead
+            of places with columns.
+
+        Raises:
+            ValueError: If a filter, the sort or the cursor is invalid.
+        """
+        _check_price_range(min_price, max_price)
+
+        if bbox is not None:
+            if len(bbox) != 4:
+                raise ValueError(
+                    "bbox must be min_lon,min_lat,max_lon,max_lat")
+            min_lon, min_lat, max_lon, max_lat = bbox
+            if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+                raise ValueError("bbox longitudes must be between -180 and 180")
+            if not (-90 <= min_lat <= max_lat <= 90):
+                raise ValueError(
+                    "bbox latitudes must be between -90 and 90, min <= max")
+
+        if sort is not None and sort not in PLACE_SORTS:
+            raise ValueError(
+                "sort must be one of: " + ", ".join(PLACE_SORTS))
+
+        return self.place_repo.search(
+            min_price=min_price, max_price=max_price,
+            amenity_ids=amenity_ids, bbox=bbox, sort=sort,
+            after=after, limit=limit, columns=columns)
+
+    def search_places_text(self, q, min_price=None, max_price=None,
+                           after=None, limit=DEFAULT_PAGE_SIZE, columns=None):
+        """
+        Full-text search of places by title and description.
+
+        Args:
+            q (str): Words to search (all of them must match).
+            min_price (float, optional): Minimum price per night.
+            max_price (float, optional): Maximum price per night.
+            after (str): Cursor returned with the previous page.
+            limit (int): Maximum number of results.
+            columns (list, optional): Select only these place columns.
+
+        Returns:
+            tuple: (list[PlaceMatch], next_cursor or None), best first.
+
+        Raises:
+            ValueError: If q has no word, or a price or the cursor
+                is invalid.
+        """
+        if not q or not q.strip():
+            raise ValueError("q is required")
+        _check_price_range(min_price, max_price)
+        return self.place_repo.search_text(
+            q, min_price=min_price, max_price=max_price,
+            after=after, limit=limit, columns=columns)
+
+    def get_places_nearby(self, latitude, longitude, radius_km,
+                          limit=DEFAULT_PAGE_SIZE, max_radius_km=None,
+                          columns=None):
+        """
+        Retrieve the places closest to a point.
+
+        Args:
+            latitude (float): Latitude of the center (-90 to 90).
+            longitude (float): Longitude of the center (-180 to 180).
+            radius_km (float): Search radius in kilometers (> 0).
+            limit (int): Maximum number of places to return.
+            max_radius_km (float, optional): Largest radius accepted.
+            columns (list, optional): Select only these place columns.
+
+        Returns:
+            list[PlaceDistance]: (place, distance_km), closest first.
+
+        Raises:
+            ValueError: If the center or the radius is invalid.
+        """
+        if not -90 <= latitude <= 90:
+            raise ValueError("lat must be between -90 and 90")
+        if not -180 <= longitude <= 180:
+            raise ValueError("lon must be between -180 and 180")
+        # Written so that NaN fails every check
+        if not (0 < radius_km < math.inf):
+            raise ValueError("radius_km must be greater than 0")
+        if max_radius_km is not None and not radius_km <= max_radius_km:
+            raise ValueError(f"radius_km must be <= {max_radius_km}")
+        return self.place_repo.nearby(latitude, longitude, radius_km,
+                                      limit=limit, columns=columns)
+
     def update_place(self, place_id, place_data):
         """
         Update an existing place's information.
@@ -183,6 +440,10 @@ class HBnBFacade:
         place = self.place_repo.get(place_id)
         if not place:
             return None
+        # Resolved first: nothing is changed if an amenity is unknown
+        amenities = None
+        if "amenities" in place_data:
+            amenities = self._get_amenities(place_data["amenities"])
 
         # Update title, description, price, latitude, longitude
         if "title" in place_data:
@@ -198,20 +459,17 @@ class HBnBFacade:
         if "longitude" in place_data:
             place.longitude = place_data["longitude"]  # setter validates
 
-        # Update amenities if provided
-        if "amenities" in place_data:
-            place.amenities = []
-            for amenity_id in place_data["amenities"]:
-                amenity = self.amenity_repo.get(amenity_id)
-                if not amenity:
-                    raise ValueError(f"Amenity {amenity_id} not found")
-                place.add_amenity(amenity)
-
-        place.save()
+        # Amenities: only the difference with the current set is written
+        if amenities is not None:
+            place.set_amenities(amenities)
+        else:
+            place.save()
+        response_cache.invalidate(f"place:{place_id}", "places:list")
         return place
 
     def delete_place(self, place_id):
-        """Delete a place by ID."""
+        """Delete a place by ID (reviews and amenity links: ON DELETE CASCADE)."""
+        response_cache.invalidate(f"place:{place_id}", "places:list")
         return self.place_repo.delete(place_id)
 
     # ==================================================
@@ -239,7 +497,7 @@ class HBnBFacade:
         if not place:
             raise ValueError("Place not found")
 
-        if user.id == place.owner.id:
+        if user.id == place.owner_id:
             raise ValueError("Owner cannot review their own place")
 
         review = Review(
@@ -249,12 +507,78 @@ class HBnBFacade:
             place_id=review_data["place_id"],
         )
 
-        self.review_repo.add(review)
+        # Review and place rating aggregates in the same transaction
+        with unit_of_work():
+            self.review_repo.add(review)
+            self.place_repo.apply_rating_change(place.id, added=review.rating)
+        response_cache.invalidate(f"place:{place.id}", "places:list")
         return review
 
-    def get_review(self, review_id):
-        """Retrieve review by ID."""
-        return self.review_repo.get(review_id)
+    def create_reviews_bulk(self, reviews_data, chunk_size=1000):
+        """
+        Create many reviews at once (seeding / migrations).
+
+        Args:
+            reviews_data (list[dict]): Same fields as create_review().
+            chunk_size (int): Rows per INSERT batch / COMMIT.
+
+        Returns:
+            list[Review]: The created reviews, in input order.
+
+        Raises:
+            BulkValidationError: If any row is invalid (nothing inserted).
+        """
+        users = self.user_repo.get_by_ids(
+            row.get("user_id") for row in reviews_data)
+        places = self.place_repo.get_by_ids(
+            row.get("place_id") for row in reviews_data)
+
+        reviews, errors = [], []
+        for index, row in enumerate(reviews_data):
+            try:
+                if row.get("user_id") not in users:
+                    raise ValueError("User not found")
+                place = places.get(row.get("place_id"))
+                if not place:
+                    raise ValueError("Place not found")
+                if place.owner_id == row["user_id"]:
+                    raise ValueError("Owner cannot review their own place")
+                reviews.append(Review(
+                    rating=row["rating"],
+                    text=row["text"],
+                    user_id=row["user_id"],
+                    place_id=row["place_id"],
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append({"index": index, "error": _row_error(e)})
+
+        if errors:
+            raise BulkValidationError(errors)
+        self.review_repo.add_many(reviews, chunk_size=chunk_size)
+        self.place_repo.recompute_ratings(r.place_id for r in reviews)
+        response_cache.invalidate(
+            "places:list", *{f"place:{r.place_id}" for r in reviews})
+        return reviews
+
+    def get_review(self, review_id, load=None):
+        """Retrieve review by ID (load: see get_place())."""
+        return self.review_repo.get(review_id, load=load)
+
+    def get_review_updated_at(self, review_id):
+        """updated_at of a review (conditional GET), None if not found."""
+        return self.review_repo.get_updated_at(review_id)
+
+    def get_reviews_version(self, place_id=None):
+        """(count, max(updated_at)) of the reviews, or of a place's ones."""
+        return self.review_repo.get_collection_version(
+            filters={"place_id": place_id} if place_id else None)
+
+    def get_place_reviews_version(self, place_id, authors=False):
+        """
+        (count, max(updated_at)) of a place's reviews, plus the max
+        updated_at of their authors when authors is True.
+        """
+        return self.review_repo.get_place_reviews_version(place_id, authors)
 
     def get_reviews_by_place(self, place_id):
         """
@@ -268,10 +592,37 @@ class HBnBFacade:
         """
         return self.review_repo.get_reviews_by_place(place_id)
 
+    def review_exists(self, user_id, place_id):
+        """
+        Check whether a user already reviewed a place.
+
+        One lookup in the (user_id, place_id) unique index: no review
+        of the place is loaded.
+
+        Args:
+            user_id (str): ID of the author.
+            place_id (str): ID of the place.
+
+        Returns:
+            bool: True if the review exists.
+        """
+        return self.review_repo.exists(user_id, place_id)
+
+    def get_reviews_by_place_page(self, place_id, after=None,
+                                  limit=DEFAULT_PAGE_SIZE, columns=None):
+        """Retrieve one page of reviews for a given place_id."""
+        return _page(self.review_repo, after, limit, columns,
+                     filters={"place_id": place_id})
+
     def get_all_reviews(self):
         """Retrieve all reviews."""
         return self.review_repo.get_all()
 
+    def get_reviews_page(self, after=None, limit=DEFAULT_PAGE_SIZE,
+                         columns=None):
+        """Retrieve one page of reviews, sorted by (created_at, id)."""
+        return _page(self.review_repo, after, limit, columns)
+
     def update_review(self, review_id, review_data):
         """
         Update an existing review.
@@ -293,20 +644,102 @@ class HBnBFacade:
         if "text" in review_data:
             if not review_data["text"] or review_data["text"].strip() == "":
                 raise ValueError("Text cannot be empty")
-            review.text = review_data["text"]
 
         if "rating" in review_data:
             rating = review_data["rating"]
             if rating < 1 or rating > 5:
                 raise ValueError("Rating must be between 1 and 5")
-            review.rating = int(rating)
 
-        review.save()
+        with unit_of_work():
+            if "text" in review_data:
+                review.text = review_data["text"]
+            if "rating" in review_data and int(rating) != review.rating:
+                old_rating = review.rating
+                review.rating = int(rating)
+                self.place_repo.apply_rating_change(
+                    review.place_id, added=review.rating, removed=old_rating)
+            review.save()
+        response_cache.invalidate(f"place:{review.place_id}", "places:list")
         return review
 
     def delete_review(self, review_id):
-        """Delete review."""
-        return self.review_repo.delete(review_id)
+        """Delete review and update the place rating aggregates."""
+        review = self.review_repo.get(review_id)
+        if not review:
+            return None
+        with unit_of_work():
+            self.place_repo.apply_rating_change(
+                review.place_id, removed=review.rating)
+            self.review_repo.delete(review_id)
+        response_cache.invalidate(f"place:{review.place_id}", "places:list")
+
+    # ==================================================
+    # RATING AGGREGATES MAINTENANCE
+    # ==================================================
+
+    def recompute_place_ratings(self, place_ids=None):
+        """
+        Rebuild review_count, rating_sum and the rating histogram
+        of places from the reviews table.
+
+        Args:
+            place_ids (iterable, optional): Places to rebuild.
+                Defaults to every place.
+
+        Returns:
+            int: Number of places rebuilt.
+        """
+        if place_ids is None:
+            response_cache.clear()
+        else:
+            place_ids = list(place_ids)
+            response_cache.invalidate(
+                "places:list", *(f"place:{pid}" for pid in place_ids))
+        return self.place_repo.recompute_ratings(place_ids)
+
+    def check_place_ratings(self):
+        """
+        Verify the rating aggregates against the reviews table.
+
+        Returns:
+            list[str]: IDs of the places whose counters are wrong
+            (empty when everything is consistent).
+        """
+        return self.place_repo.find_rating_mismatches()
+
+    # ==================================================
+    # REPOSITORY CACHE
+    # ==================================================
+
+    def get_cache_stats(self):
+        """
+        Counters of the repository read-through caches.
+
+        Returns:
+            dict: {model name: {'size', 'max_size', 'ttl', 'hits',
+            'misses', 'hit_rate', 'evictions', 'invalidations'}}.
+        """
+        return repository_cache.stats()
+
+    def clear_caches(self):
+        """Empty the repository and response caches (after raw SQL writes, ...)."""
+        repository_cache.clear()
+        response_cache.clear()
+
+    def get_response_cache_stats(self):
+        """
+        Counters of the response cache.
+
+        Returns:
+            dict or None: {'entries', 'size_bytes', 'max_bytes', 'hits',
+            'misses', 'hit_rate', 'evictions', 'invalidations'},
+            None when the cache is disabled.
+        """
+        return response_cache.stats()
+
+    def clear_response_cache(self):
+        """Empty the response cache only."""
+        response_cache.clear()
 
     # ==================================================
     # AMENITY METHODS
@@ -328,16 +761,72 @@ class HBnBFacade:
         )
 
         self.amenity_repo.add(amenity)
+        response_cache.invalidate("amenities")
         return amenity
 
+    def create_amenities_bulk(self, amenities_data, chunk_size=1000):
+        """
+        Create many amenities at once (seeding / migrations).
+
+        Args:
+            amenities_data (list[dict]): Same fields as create_amenity().
+            chunk_size (int): Rows per INSERT batch / COMMIT.
+
+        Returns:
+            list[Amenity]: The created amenities, in input order.
+
+        Raises:
+            BulkValidationError: If any row is invalid (nothing inserted).
+        """
+        amenities, errors = [], []
+        for index, row in enumerate(amenities_data):
+            try:
+                amenities.append(Amenity(
+                    name=row["name"],
+                    description=row.get("description", ""),
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append({"index": index, "error": _row_error(e)})
+
+        if errors:
+            raise BulkValidationError(errors)
+        self.amenity_repo.add_many(amenities, chunk_size=chunk_size)
+        response_cache.invalidate("amenities")
+        return amenities
+
     def get_amenity(self, amenity_id):
         """Retrieve amenity by ID."""
         return self.amenity_repo.get(amenity_id)
 
+    def get_amenity_updated_at(self, amenity_id):
+        """updated_at of an amenity (conditional GET), None if not found."""
+        return self.amenity_repo.get_updated_at(amenity_id)
+
+    def get_amenities_version(self):
+        """(count, max(updated_at)) of the amenities (conditional GET)."""
+        return self.amenity_repo.get_collection_version()
+
     def get_all_amenities(self):
         """Retrieve all amenities."""
         return self.amenity_repo.get_all()
 
+    def _get_amenities(self, amenity_ids):
+        """
+        Retrieve amenities by ID with one query, in the given order.
+
+        Raises:
+            ValueError: If amenities are not found (all of them named).
+        """
+        amenities, missing = self.amenity_repo.get_many(amenity_ids)
+        if missing:
+            raise _amenities_not_found(missing)
+        return amenities
+
+    def get_amenities_page(self, after=None, limit=DEFAULT_PAGE_SIZE,
+                           columns=None):
+        """Retrieve one page of amenities, sorted by (created_at, id)."""
+        return _page(self.amenity_repo, after, limit, columns)
+
     def update_amenity(self, amenity_id, amenity_data):
         """
         Update an existing amenity.
@@ -362,10 +851,12 @@ class HBnBFacade:
         if "description" in amenity_data:
             amenity.description = amenity_data["description"]
         amenity.save()
+        response_cache.invalidate("amenities", f"amenity:{amenity_id}")
         return amenity
 
     def delete_amenity(self, amenity_id):
         """Delete amenity."""
+        response_cache.invalidate("amenities", f"amenity:{amenity_id}")
         return self.amenity_repo.delete(amenity_id)
 
     def reset(self):
@@ -373,3 +864,36 @@ class HBnBFacade:
         self.place_repo = PlaceRepository()
         self.review_repo = ReviewRepository()
         self.amenity_repo = AmenityRepository()
+
+
+def _check_price_range(min_price, max_price):
+    """Validate optional min_price / max_price search filters."""
+    for name, value in (("min_price", min_price), ("max_price", max_price)):
+        if value is not None and value < 0:
+            raise ValueError(f"{name} must be a non-negative number")
+    if (min_price is not None and max_price is not None
+            and min_price > max_price):
+        raise ValueError("min_price must be lower than max_price")
+
+
+def _amenities_not_found(missing):
+    """ValueError naming every missing amenity ID."""
+    if len(missing) == 1:
+        return ValueError(f"Amenity {missing[0]} not found")
+    return ValueError(
+        f"Amenities {', '.join(map(str, missing))} not found")
+
+
+def _row_error(error):
+    """Readable message for a bulk row error (KeyError = missing field)."""
+    if isinstance(error, KeyError):
+        return f"{error.args[0]} is required"
+    return str(error)
+
+
+def _page(repo, after, limit, columns, filters=None):
+    """One page of objects, or of rows of columns only (projection)."""
+    if columns is not None:
+        return repo.get_all_columns(columns, after=after, limit=limit,
+                                    filters=filters)
+    return repo.get_page(after=after, limit=limit, filters=filters)
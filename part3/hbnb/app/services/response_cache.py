@@ -0,0 +1,203 @@
+"""
+Response cache module.
+
+Per-process cache of serialized GET responses (JSON bytes and
+headers), keyed by URL, in front of the public read endpoints
+(see app.api.v1.caching). A hit is served without any SQL and
+without serializing anything.
+
+Every entry carries tags naming the data it was built from:
+- places:list     : GET /places/ pages
+- place:<id>      : GET /places/<id> and GET /places/<id>/reviews
+- user:<id>       : place details whose owner is the user
+- amenity:<id>    : place details listing the amenity
+- amenities       : GET /amenities/ pages (and /places/?amenities=)
+
+Facade mutations call invalidate() with the tags they affect. Tags
+are invalidated at once and again after the COMMIT, so a concurrent
+request cannot cache the old data in between; put() also refuses
+a response built before an invalidation.
+
+The cache is bounded in bytes (RESPONSE_CACHE_MAX_BYTES in config.py,
+0 disables it) and evicts the least recently used entries.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# One cached response: JSON body, headers (list of pairs) and tags
+CachedResponse = namedtuple("CachedResponse", ["body", "headers", "tags"])
+
+# Session.info key: tags to invalidate again after COMMIT
+_PENDING_KEY = "response_cache_tags"
+
+# ResponseCache, set by init_app() (None = disabled)
+_cache = None
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized responses, bounded in bytes, by tag."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        # tag -> keys of the entries carrying it
+        self._keys = {}
+        # Incremented by every invalidation
+        self._clock = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def version(self):
+        """Clock value to pass to put() for a response about to be built."""
+        with self._lock:
+            return self._clock
+
+    def get(self, key):
+        """Return the CachedResponse of key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body, headers, tags, version):
+        """
+        Store a response, evicting the least recently used ones.
+
+        Nothing is stored if the response is larger than the whole
+        cache, or if anything was invalidated since version (the
+        response may hold data older than that invalidation).
+        """
+        entry = CachedResponse(body, tuple(headers), frozenset(tags))
+        cost = _cost(entry)
+        with self._lock:
+            if cost > self.max_bytes or self._clock != version:
+                return
+            self._remove(key)
+            self._entries[key] = entry
+            self.size += cost
+            for tag in entry.tags:
+                self._keys.setdefault(tag, set()).add(key)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags):
+        """Drop every entry carrying one of tags."""
+        with self._lock:
+            self._clock += 1
+            for tag in tags:
+                for key in list(self._keys.get(tag, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._clock += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys.clear()
+            self.size = 0
+
+    def stats(self):
+        """Return the counters of the cache as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= _cost(entry)
+        for tag in entry.tags:
+            keys = self._keys.get(tag)
+            keys.discard(key)
+            if not keys:
+                del self._keys[tag]
+
+
+def _cost(entry):
+    """Bytes accounted for an entry: body and header values."""
+    return len(entry.body) + sum(
+        len(name) + len(value) for name, value in entry.headers)
+
+
+def init_app(app):
+    """(Re)create the cache from app.config['RESPONSE_CACHE_MAX_BYTES']."""
+    global _cache
+    max_bytes = app.config.get('RESPONSE_CACHE_MAX_BYTES') or 0
+    _cache = ResponseCache(max_bytes) if max_bytes > 0 else None
+
+
+def enabled():
+    """True unless RESPONSE_CACHE_MAX_BYTES is 0."""
+    return _cache is not None
+
+
+def get(key):
+    """Cached response of key, None if absent or the cache is disabled."""
+    return _cache.get(key) if _cache is not None else None
+
+
+def version():
+    """Invalidation clock, read before building a response to cache."""
+    return _cache.version() if _cache is not None else 0
+
+
+def put(key, body, headers, tags, version):
+    """Cache a response (see ResponseCache.put())."""
+    if _cache is not None:
+        _cache.put(key, body, headers, tags, version)
+
+
+def invalidate(*tags):
+    """
+    Drop the responses carrying one of tags, now and after the COMMIT
+    of the current transaction.
+    """
+    if _cache is None or not tags:
+        return
+    _cache.invalidate(tags)
+    from app import db
+    db.session.info.setdefault(_PENDING_KEY, set()).update(tags)
+
+
+def stats():
+    """Counters of the cache, None when it is disabled."""
+    return _cache.stats() if _cache is not None else None
+
+
+def clear():
+    if _cache is not None:
+        _cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags and _cache is not None:
+        _cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    # Nothing was written: the early invalidation was enough
+    session.info.pop(_PENDING_KEY, None)
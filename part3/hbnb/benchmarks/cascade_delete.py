@@ -0,0 +1,128 @@
+"""
+Benchmark — deleting a heavily reviewed place: ORM cascade vs ON DELETE CASCADE.
+
+Seeds an in-memory database with two places reviewed by the same
+users (100k reviews each by default), then deletes:
+- the first place the way cascade='all, delete-orphan' without
+  passive_deletes did: every review loaded, one DELETE per review,
+- the second one with facade.delete_place(): one DELETE of the place,
+  the database removes the reviews (ON DELETE CASCADE).
+
+Prints the time, the SQL statements sent (an executemany counts one
+per row) and the peak Python memory of each deletion. Times are taken
+under tracemalloc, which slows the allocation-heavy ORM path.
+
+Usage (from part3/hbnb):
+    python3 -m benchmarks.cascade_delete [--reviews 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import event, insert, select
+
+from app import create_app, db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+
+CHUNK = 50_000
+
+
+def _seed(reviews):
+    owner = User(first_name="Bench", last_name="Owner",
+                 email="owner@bench.io")
+    owner.hash_password("bench1234")
+    places = [Place(title=f"Bench place {i}", price=100, latitude=45.0,
+                    longitude=6.0, owner=owner) for i in range(2)]
+    db.session.add_all([owner, *places])
+    db.session.commit()
+
+    now = datetime.now(timezone.utc)
+    for start in range(0, reviews, CHUNK):
+        users = [{
+            "id": str(uuid.uuid4()), "first_name": "Bench",
+            "last_name": "Reviewer", "email": f"reviewer{i}@bench.io",
+            "password": owner.password, "is_admin": False,
+            "created_at": now, "updated_at": now,
+        } for i in range(start, min(start + CHUNK, reviews))]
+        db.session.execute(insert(User), users)
+        db.session.execute(insert(Review), [{
+            "id": str(uuid.uuid4()), "text": "Nice stay", "rating": 4,
+            "user_id": user["id"], "place_id": place.id,
+            "created_at": now, "updated_at": now,
+        } for place in places for user in users])
+        db.session.commit()
+    return [place.id for place in places]
+
+
+def _orm_cascade_delete(place_id):
+    """The historical path: load the children, delete them one by one."""
+    place = db.session.get(Place, place_id)
+    for review in db.session.scalars(
+            select(Review).where(Review.place_id == place_id)):
+        db.session.delete(review)
+    db.session.delete(place)
+    db.session.commit()
+
+
+def _measure(delete, place_id):
+    """Return (seconds, SQL statements, peak MB) of delete(place_id)."""
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(len(parameters) if executemany else 1)
+
+    db.session.expunge_all()
+    event.listen(db.engine, "before_cursor_execute", _count)
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        delete(place_id)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+        event.remove(db.engine, "before_cursor_execute", _count)
+    remaining = db.session.scalar(
+        select(db.func.count(Review.id)).where(Review.place_id == place_id))
+    assert remaining == 0, f"{remaining} reviews left"
+    return elapsed, sum(statements), peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", type=int, default=100_000)
+    args = parser.parse_args()
+
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        started = time.perf_counter()
+        orm_place, passive_place = _seed(args.reviews)
+        print(f"Seeded 2 places x {args.reviews} reviews "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        rows = [
+            ("ORM cascade (before)",
+             _measure(_orm_cascade_delete, orm_place)),
+            ("ON DELETE CASCADE",
+             _measure(facade.delete_place, passive_place)),
+        ]
+
+        print(f"\n{'delete place':<22} {'time (s)':>9} {'statements':>11} "
+              f"{'peak (MB)':>10}")
+        print("-" * 55)
+        for name, (elapsed, statements, peak) in rows:
+            print(f"{name:<22} {elapsed:>9.2f} {statements:>11} "
+                  f"{peak:>10.2f}")
+
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
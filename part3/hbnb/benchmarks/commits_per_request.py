@@ -0,0 +1,102 @@
+"""
+Benchmark — COMMITs per HTTP request, with and without the unit of work.
+
+Counts the COMMIT statements reaching the database for a few write
+endpoints, once with UNIT_OF_WORK_PER_REQUEST = True (default) and
+once with the historical commit-per-mutation behaviour.
+
+Usage (from part3/hbnb):
+    python3 -m benchmarks.commits_per_request
+"""
+
+from sqlalchemy import event
+
+from app import create_app, db
+from app.models.user import User
+from config import TestingConfig
+
+
+class CommitPerMutationConfig(TestingConfig):
+    """Opt-out: one COMMIT per mutation."""
+    UNIT_OF_WORK_PER_REQUEST = False
+
+
+AMENITIES = 20
+
+
+def _seed_user(email, is_admin=False):
+    user = User(first_name="Bench", last_name="User",
+                email=email, is_admin=is_admin)
+    user.hash_password("bench1234")
+    db.session.add(user)
+    db.session.commit()
+
+
+def run(config_class):
+    """Return {scenario: commits} for one configuration."""
+    app = create_app(config_class)
+    client = app.test_client()
+    commits = {"count": 0}
+
+    with app.app_context():
+        db.create_all()
+        _seed_user("admin@bench.io", is_admin=True)
+        _seed_user("guest@bench.io")
+
+        @event.listens_for(db.engine, "commit")
+        def _count(conn):
+            commits["count"] += 1
+
+    def login(email):
+        r = client.post('/api/v1/auth/login',
+                        json={"email": email, "password": "bench1234"})
+        return {"Authorization": f"Bearer {r.get_json()['access_token']}"}
+
+    admin, guest = login("admin@bench.io"), login("guest@bench.io")
+    amenity_ids = [
+        client.post('/api/v1/amenities/', json={"name": f"A{i}"},
+                    headers=admin).get_json()["id"]
+        for i in range(AMENITIES)
+    ]
+
+    def measure(method, url, **kwargs):
+        before = commits["count"]
+        response = getattr(client, method)(url, **kwargs)
+        return response, commits["count"] - before
+
+    results = {}
+    r, results[f"POST /places/ ({AMENITIES} amenities)"] = measure(
+        "post", '/api/v1/places/', headers=admin, json={
+            "title": "Bench", "price": 80, "latitude": 45.0,
+            "longitude": 6.0, "amenities": amenity_ids})
+    place_id = r.get_json()["id"]
+    _, results[f"PUT /places/<id> ({AMENITIES} amenities)"] = measure(
+        "put", f'/api/v1/places/{place_id}', headers=admin,
+        json={"title": "Bench 2", "amenities": amenity_ids[::-1]})
+    _, results["POST /reviews/"] = measure(
+        "post", '/api/v1/reviews/', headers=guest,
+        json={"text": "Nice", "rating": 5, "place_id": place_id})
+    _, results["PUT /amenities/<id>"] = measure(
+        "put", f'/api/v1/amenities/{amenity_ids[0]}', headers=admin,
+        json={"name": "Renamed"})
+    _, results["GET /places/<id>"] = measure(
+        "get", f'/api/v1/places/{place_id}')
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    return results
+
+
+def main():
+    before = run(CommitPerMutationConfig)
+    after = run(TestingConfig)
+
+    print(f"\n{'Request':<40} {'commit/mutation':>16} {'unit of work':>14}")
+    print("-" * 72)
+    for scenario in before:
+        print(f"{scenario:<40} {before[scenario]:>16} {after[scenario]:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark — GET /places/search: FTS5 index vs LIKE scan.
+
+Seeds an in-memory database with generated places (1M by default),
+then times PlaceRepository.search_text() for a few queries, once
+with the places_fts index and once with the LIKE fallback.
+
+Usage (from part3/hbnb):
+    python3 -m benchmarks.fulltext_search [--places 1000000]
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import insert
+
+from app import create_app, db
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import fulltext
+from app.services import facade
+
+CHUNK = 50_000
+REPEAT = 5
+KINDS = ("studio chalet loft villa maison appartement cabane "
+         "chambre duplex bungalow").split()
+
+
+def _vocabulary(rng, size=20_000):
+    """Pseudo-words, drawn with a Zipf-like law (like real text)."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = sorted({
+        "".join(rng.choices(letters, k=rng.randint(4, 9)))
+        for _ in range(size)
+    })
+    rng.shuffle(words)
+    cum_weights = list(itertools.accumulate(
+        1 / rank for rank in range(1, len(words) + 1)))
+    return words, cum_weights
+
+
+def _seed(places):
+    owner = User(first_name="Bench", last_name="Owner",
+                 email="owner@bench.io")
+    owner.hash_password("bench1234")
+    db.session.add(owner)
+    db.session.commit()
+
+    rng = random.Random(42)
+    words, cum_weights = _vocabulary(rng)
+    cities = words[1000:2000]
+    for start in range(0, places, CHUNK):
+        rows = [{
+            "id": str(uuid.uuid4()),
+            "title": f"{rng.choice(KINDS).capitalize()} {rng.choice(cities)}",
+            "description": " ".join(
+                rng.choices(words, cum_weights=cum_weights, k=40)),
+            "price": rng.randint(10, 500),
+            "latitude": rng.uniform(-60, 60),
+            "longitude": rng.uniform(-180, 180),
+            "owner_id": owner.id,
+        } for _ in range(min(CHUNK, places - start))]
+        db.session.execute(insert(Place), rows)
+        db.session.commit()
+    return [
+        words[5000],                    # rare word
+        cities[0],                      # city: ~0.1% of titles
+        f"chalet {cities[1]}",          # kind + city
+        words[200][:4],                 # prefix of a frequent word
+        words[3],                       # very frequent word
+        "introuvable",                  # no match
+    ]
+
+
+def _time(q):
+    """Median time (ms) of the first page of results, and its size."""
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        matches, _ = facade.search_places_text(q, limit=20)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(matches)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        started = time.perf_counter()
+        queries = _seed(args.places)
+        print(f"Seeded {args.places} places (FTS triggers included) "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        connection = db.session.connection()
+        results = {}
+        for mode, indexed in (("FTS5 + BM25", True), ("LIKE scan", False)):
+            connection.info[fulltext.PLACES_FTS] = indexed
+            results[mode] = {q: _time(q) for q in queries}
+
+        print(f"\n{'q':<26} {'FTS5 + BM25 (ms)':>18} {'LIKE scan (ms)':>16}")
+        print("-" * 62)
+        for q in queries:
+            fts_ms, fts_count = results["FTS5 + BM25"][q]
+            like_ms, like_count = results["LIKE scan"][q]
+            print(f"{q:<26} {fts_ms:>12.1f} ({fts_count:>2}) "
+                  f"{like_ms:>10.1f} ({like_count:>2})")
+
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
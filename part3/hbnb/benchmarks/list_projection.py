@@ -0,0 +1,156 @@
+"""
+Benchmark — list endpoints: ORM entities vs column projections.
+
+Seeds an in-memory database (10k users, places and reviews by
+default, places with a 2 kB description) and walks every page of
+each list the way its endpoint does:
+- entities: get_page() hydrating full objects, as before (password
+  hashes, place descriptions included),
+- projection: get_all_columns() with the columns of the endpoint.
+
+Each request is "fetch the page + build the JSON body". Prints the
+average time per request and the peak Python memory of a request
+(measured in a separate pass, tracemalloc slows allocations down).
+
+Usage (from part3/hbnb):
+    python3 -m benchmarks.list_projection [--rows 10000] [--limit 100]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from app import create_app, db
+from app.api.v1.places import PLACE_LIST_COLUMNS, REVIEW_LIST_COLUMNS
+from app.api.v1.users import USER_LIST_COLUMNS
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+
+DESCRIPTION = "Bright flat close to the old town. " * 60
+
+
+def _seed(rows):
+    hashed = User(first_name="Bench", last_name="User", email="x@bench.io")
+    hashed.hash_password("bench1234")
+    start = datetime.now(timezone.utc)
+    users, places, reviews = [], [], []
+    for i in range(rows):
+        now = start + timedelta(microseconds=i)
+        users.append({
+            "id": str(uuid.uuid4()), "first_name": "Bench",
+            "last_name": f"User {i}", "email": f"user{i}@bench.io",
+            "password": hashed.password, "is_admin": False,
+            "created_at": now, "updated_at": now,
+        })
+        places.append({
+            "id": str(uuid.uuid4()), "title": f"Place {i}",
+            "description": DESCRIPTION, "price": 50 + i % 200,
+            "latitude": 45.0, "longitude": 6.0, "owner_id": users[i]["id"],
+            "review_count": 1, "rating_sum": 4, "rating_4_count": 1,
+            "rating_average": 4.0, "created_at": now, "updated_at": now,
+        })
+        reviews.append({
+            "id": str(uuid.uuid4()), "text": "Lovely stay, would come back.",
+            "rating": 4, "user_id": users[i - 1]["id"],
+            "place_id": places[i]["id"], "created_at": now, "updated_at": now,
+        })
+    for model, values in ((User, users), (Place, places), (Review, reviews)):
+        db.session.execute(insert(model), values)
+    db.session.commit()
+
+
+def _user(u):
+    return {'id': u.id, 'first_name': u.first_name,
+            'last_name': u.last_name, 'email': u.email}
+
+
+def _place(p):
+    return {'id': p.id, 'title': p.title, 'price': p.price,
+            'latitude': p.latitude, 'longitude': p.longitude,
+            'review_count': p.review_count,
+            'average_rating': (round(p.rating_average, 2)
+                               if p.review_count else None)}
+
+
+def _review(r):
+    return {'id': r.id, 'text': r.text, 'rating': r.rating,
+            'user_id': r.user_id, 'place_id': r.place_id}
+
+
+# (list, repository, columns of the endpoint, serializer, entity load)
+LISTS = [
+    ("GET /users/", lambda: facade.user_repo, USER_LIST_COLUMNS, _user, []),
+    ("GET /places/", lambda: facade.place_repo, PLACE_LIST_COLUMNS, _place,
+     ["description"]),
+    ("GET /reviews/", lambda: facade.review_repo, REVIEW_LIST_COLUMNS,
+     _review, ["text"]),
+]
+
+
+def _walk(fetch, serialize, limit):
+    """Request every page; return the size of each JSON body."""
+    sizes, cursor = [], None
+    while True:
+        db.session.expunge_all()
+        items, cursor = fetch(cursor, limit)
+        sizes.append(len(json.dumps([serialize(i) for i in items])))
+        if cursor is None:
+            return sizes
+
+
+def _peak_request(fetch, serialize, limit):
+    """Peak memory (MB) of the costliest request of a page walk."""
+    peak, cursor = 0, None
+    while True:
+        db.session.expunge_all()
+        tracemalloc.start()
+        items, cursor = fetch(cursor, limit)
+        json.dumps([serialize(i) for i in items])
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del items
+        if cursor is None:
+            return peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        _seed(args.rows)
+        print(f"{args.rows} rows per table, {args.limit} per page\n")
+        print(f"{'list':<15} {'mode':<11} {'ms / request':>13} "
+              f"{'peak MB':>8}")
+        print("-" * 50)
+        for name, repo, columns, serialize, load in LISTS:
+            modes = [
+                ("entities", lambda after, limit: repo().get_page(
+                    after=after, limit=limit, load=load)),
+                ("projection", lambda after, limit: repo().get_all_columns(
+                    columns, after=after, limit=limit)),
+            ]
+            for mode, fetch in modes:
+                started = time.perf_counter()
+                requests = len(_walk(fetch, serialize, args.limit))
+                elapsed = (time.perf_counter() - started) / requests
+                peak = _peak_request(fetch, serialize, args.limit)
+                print(f"{name:<15} {mode:<11} {elapsed * 1000:>13.2f} "
+                      f"{peak:>8.2f}")
+
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark — GET /places/nearby: R*Tree vs B-tree vs full scan.
+
+Seeds an in-memory database with places clustered around random
+"cities" (1M places by default), then times
+PlaceRepository.nearby() for a few radii:
+- with the places_rtree index,
+- with the (latitude, longitude) B-tree index (fallback),
+- with a full scan ranking every place by haversine distance.
+
+Usage (from part3/hbnb):
+    python3 -m benchmarks.nearby_search [--places 1000000]
+"""
+
+import argparse
+import heapq
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import insert, select
+
+from app import create_app, db
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import spatial
+from app.services import facade
+
+CHUNK = 50_000
+REPEAT = 5
+CITIES = 1000
+CITY_SPREAD_KM = 15
+RADII_KM = (1, 5, 25, 100)
+LIMIT = 20
+
+
+def _seed(places):
+    owner = User(first_name="Bench", last_name="Owner",
+                 email="owner@bench.io")
+    owner.hash_password("bench1234")
+    db.session.add(owner)
+    db.session.commit()
+
+    rng = random.Random(42)
+    # Listings concentrate on a few latitudes (Europe / North America):
+    # dense latitude bands are what a (latitude, longitude) B-tree
+    # handles worst
+    cities = [(rng.uniform(30, 60), rng.uniform(-125, 40))
+              for _ in range(CITIES)]
+    spread = CITY_SPREAD_KM / spatial.KM_PER_DEGREE
+    for start in range(0, places, CHUNK):
+        rows = []
+        for _ in range(min(CHUNK, places - start)):
+            lat, lon = rng.choice(cities)
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "title": "Bench place",
+                "price": 100,
+                "latitude": max(-90, min(90, rng.gauss(lat, spread))),
+                "longitude": (rng.gauss(lon, spread) + 180) % 360 - 180,
+                "owner_id": owner.id,
+            })
+        db.session.execute(insert(Place), rows)
+        db.session.commit()
+    return cities
+
+
+def _full_scan(lat, lon, radius_km):
+    """Reference: haversine distance of every place, no index."""
+    rows = db.session.execute(
+        select(Place.id, Place.latitude, Place.longitude))
+    return heapq.nsmallest(LIMIT, (
+        (d, place_id) for place_id, d in (
+            (place_id, spatial.haversine_km(lat, lon, plat, plon))
+            for place_id, plat, plon in rows)
+        if d <= radius_km))
+
+
+def _time(call, repeat=REPEAT):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        started = time.perf_counter()
+        cities = _seed(args.places)
+        print(f"Seeded {args.places} places (R*Tree triggers included) "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        lat, lon = cities[0]
+        connection = db.session.connection()
+        rows = []
+        for radius in RADII_KM:
+            def nearby():
+                return facade.get_places_nearby(lat, lon, radius, LIMIT)
+
+            connection.info[spatial.PLACES_RTREE] = True
+            rtree = _time(nearby)
+            connection.info[spatial.PLACES_RTREE] = False
+            btree = _time(nearby)
+            scan = _time(lambda: _full_scan(lat, lon, radius), repeat=1)
+            rows.append((radius, rtree, btree, scan))
+        connection.info[spatial.PLACES_RTREE] = True
+
+        print(f"\n{'radius_km':>9} {'R*Tree (ms)':>16} {'B-tree (ms)':>16} "
+              f"{'full scan (ms)':>18}")
+        print("-" * 62)
+        for radius, rtree, btree, scan in rows:
+            print(f"{radius:>9} "
+                  f"{rtree[0]:>10.1f} ({rtree[1]:>2}) "
+                  f"{btree[0]:>10.1f} ({btree[1]:>2}) "
+                  f"{scan[0]:>12.1f} ({scan[1]:>2})")
+
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
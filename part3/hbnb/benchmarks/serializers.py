@@ -0,0 +1,118 @@
+"""
+Benchmark — serializing a place list: hand-built dicts vs compiled
+serializers.
+
+Serializes 100k place rows (the columns GET /places/ reads, as
+named tuples standing in for SQLAlchemy rows) to JSON bytes:
+- comprehension + jsonify: the dict comprehension the endpoint used
+  to build, encoded by Flask's jsonify(),
+- compiled + json: PLACE_LIST_FIELDS.dump_many() (generated code),
+  encoded by serializers.dumps() without orjson,
+- compiled + orjson: the same, with orjson (skipped when it is not
+  installed).
+
+Prints the best time of --repeat runs to build the items, to encode
+them, and in total, with the speedup over the first mode.
+
+Usage (from part3/hbnb):
+    python3 -m benchmarks.serializers [--places 100000] [--repeat 5]
+"""
+
+import argparse
+import time
+from collections import namedtuple
+
+from flask import jsonify
+
+from app import create_app
+from app.api.v1 import serializers
+from app.api.v1.places import PLACE_LIST_COLUMNS, PLACE_LIST_FIELDS
+
+PlaceRow = namedtuple("PlaceRow", PLACE_LIST_COLUMNS)
+
+
+def _rows(count):
+    return [PlaceRow(id=f"{i:08d}-0000-4000-8000-000000000000",
+                     title=f"Place {i}", price=50.0 + i % 200,
+                     latitude=45.0 + i / count, longitude=6.0 - i / count,
+                     review_count=i % 7, rating_average=3.5 + i % 3 / 2)
+            for i in range(count)]
+
+
+def _comprehension(rows):
+    # GET /places/ before the serializer registry
+    return [{
+        'id': p.id,
+        'title': p.title,
+        'price': p.price,
+        'latitude': p.latitude,
+        'longitude': p.longitude,
+        'review_count': p.review_count,
+        'average_rating': (round(p.rating_average, 2)
+                           if p.review_count else None),
+    } for p in rows]
+
+
+def _compiled(rows):
+    return PLACE_LIST_FIELDS.dump_many(rows)
+
+
+def _stdlib_dumps(items):
+    orjson, serializers.orjson = serializers.orjson, None
+    try:
+        return serializers.dumps(items)
+    finally:
+        serializers.orjson = orjson
+
+
+def _best(build, encode, rows, repeat):
+    """Best (build, encode) times in seconds, and the body size."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = build(rows)
+        built = time.perf_counter()
+        body = encode(items)
+        timings.append((built - started, time.perf_counter() - built))
+    return min(timings, key=sum), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--places", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    modes = [
+        ("comprehension + jsonify", _comprehension,
+         lambda items: jsonify(items).get_data()),
+        ("compiled + json", _compiled, _stdlib_dumps),
+    ]
+    if serializers.orjson is not None:
+        modes.append(("compiled + orjson", _compiled, serializers.dumps))
+    else:
+        print("orjson not installed: compiled + orjson skipped\n")
+
+    rows = _rows(args.places)
+    # Same items whatever the mode
+    assert _compiled(rows[:100]) == _comprehension(rows[:100])
+
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        print(f"{args.places} places, best of {args.repeat}\n")
+        print(f"{'mode':<24} {'build ms':>9} {'encode ms':>10} "
+              f"{'total ms':>9} {'MB':>6} {'speedup':>8}")
+        print("-" * 71)
+        baseline = None
+        for name, build, encode in modes:
+            (build_time, encode_time), size = _best(
+                build, encode, rows, args.repeat)
+            total = build_time + encode_time
+            baseline = baseline or total
+            print(f"{name:<24} {build_time * 1000:>9.1f} "
+                  f"{encode_time * 1000:>10.1f} {total * 1000:>9.1f} "
+                  f"{size / 1e6:>6.2f} {baseline / total:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,32 @@ class Config:
     """Base configuration class."""
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key_that_is_at_least_32_characters_long_123')
     DEBUG = False
+    # Keyset pagination of list endpoints (?limit=&after=)
+    PAGE_SIZE_DEFAULT = 20
+    PAGE_SIZE_MAX = 100
+    # One COMMIT per HTTP request (False = one COMMIT per mutation)
+    UNIT_OF_WORK_PER_REQUEST = True
+    # X-SQL-Queries / X-SQL-Time-ms response headers
+    # (None = enabled in debug and testing only)
+    SQL_STATS_HEADERS = None
+    # FTS5 index of place titles / descriptions, created at startup
+    # (False = GET /places/search uses a LIKE scan)
+    FULLTEXT_SEARCH = True
+    # R*Tree index of place coordinates, created at startup
+    # (False = GET /places/nearby reads the (latitude, longitude) index)
+    SPATIAL_INDEX = True
+    # Largest radius accepted by GET /places/nearby
+    NEARBY_RADIUS_MAX_KM = 500
+    # Read-through cache of repository get(), per process and per model
+    # (max_size entries, ttl in seconds; unlisted models are not cached)
+    REPOSITORY_CACHE = {
+        'User': {'max_size': 1024, 'ttl': 60},
+        'Place': {'max_size': 4096, 'ttl': 60},
+        'Amenity': {'max_size': 256, 'ttl': 300},
+    }
+    # Serialized GET responses of the public read endpoints, per
+    # process, bounded in bytes (0 = disabled, see response_cache.py)
+    RESPONSE_CACHE_MAX_BYTES = 16 * 1024 * 1024
 
 
 class DevelopmentConfig(Config):
@@ -34,6 +60,7 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'   # ← RAM, pas de fichier
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_ACCESS_TOKEN_EXPIRES = False                  # ← tokens sans expiration pour les tests
+    RESPONSE_CACHE_MAX_BYTES = 0                      # ← chaque GET lit la DB (voir tests section 25)
     DEBUG = False
 # DevelopmentConfig est utilisé par défaut dans create_app()
 # via : app.config.from_object("config.developmentConfig")
\ No newline at end of file
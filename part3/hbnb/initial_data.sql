@@ -221,3 +221,20 @@ VALUES (
     'place003-0000-0000-0000-000000000003',
     CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
 );
+
+-- =============================================================
+-- AGRÉGATS DES NOTES
+--    Les reviews ci-dessus sont insérées en SQL direct :
+--    on recalcule review_count / rating_sum / histogramme des places
+--    (équivalent de facade.recompute_place_ratings()).
+-- =============================================================
+
+UPDATE places SET
+    review_count   = (SELECT COUNT(*) FROM reviews r WHERE r.place_id = places.id),
+    rating_sum     = (SELECT COALESCE(SUM(rating), 0) FROM reviews r WHERE r.place_id = places.id),
+    rating_1_count = (SELECT COUNT(*) FROM reviews r WHERE r.place_id = places.id AND r.rating = 1),
+    rating_2_count = (SELECT COUNT(*) FROM reviews r WHERE r.place_id = places.id AND r.rating = 2),
+    rating_3_count = (SELECT COUNT(*) FROM reviews r WHERE r.place_id = places.id AND r.rating = 3),
+    rating_4_count = (SELECT COUNT(*) FROM reviews r WHERE r.place_id = places.id AND r.rating = 4),
+    rating_5_count = (SELECT COUNT(*) FROM reviews r WHERE r.place_id = places.id AND r.rating = 5),
+    rating_average = (SELECT COALESCE(AVG(rating), 0) FROM reviews r WHERE r.place_id = places.id);
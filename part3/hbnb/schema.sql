@@ -21,6 +21,15 @@ CREATE TABLE IF NOT EXISTS places (
     latitude    FLOAT          NOT NULL CHECK(latitude >= -90 AND latitude <= 90),
     longitude   FLOAT          NOT NULL CHECK(longitude >= -180 AND longitude <= 180),
     owner_id    CHAR(36)       NOT NULL,
+    -- Agregats des notes (maintenus a chaque ecriture de review)
+    review_count   INTEGER     NOT NULL DEFAULT 0,
+    rating_sum     INTEGER     NOT NULL DEFAULT 0,
+    rating_1_count INTEGER     NOT NULL DEFAULT 0,
+    rating_2_count INTEGER     NOT NULL DEFAULT 0,
+    rating_3_count INTEGER     NOT NULL DEFAULT 0,
+    rating_4_count INTEGER     NOT NULL DEFAULT 0,
+    rating_5_count INTEGER     NOT NULL DEFAULT 0,
+    rating_average FLOAT       NOT NULL DEFAULT 0,
     created_at  DATETIME       DEFAULT CURRENT_TIMESTAMP,
     updated_at  DATETIME       DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
@@ -53,4 +62,82 @@ CREATE TABLE IF NOT EXISTS place_amenity (
     PRIMARY KEY (place_id, amenity_id),
     FOREIGN KEY (place_id)   REFERENCES places(id)    ON DELETE CASCADE,
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+-- =============================================================
+-- Index (synchronises avec les __table_args__ des modeles)
+-- =============================================================
+
+-- Cles etrangeres et recherches frequentes
+CREATE INDEX IF NOT EXISTS ix_places_owner_id ON places (owner_id);
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id_created_at ON reviews (place_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_reviews_user_id_created_at ON reviews (user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id ON place_amenity (amenity_id);
+-- amenities.name : deja indexe par sa contrainte UNIQUE
+
+-- Pagination par curseur : ORDER BY created_at, id
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_places_created_at_id ON places (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_reviews_created_at_id ON reviews (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_amenities_created_at_id ON amenities (created_at, id);
+
+-- Recherche de places (GET /places/ : prix, tri, bbox)
+CREATE INDEX IF NOT EXISTS ix_places_price_id ON places (price, id);
+CREATE INDEX IF NOT EXISTS ix_places_rating_average_id ON places (rating_average, id);
+CREATE INDEX IF NOT EXISTS ix_places_latitude_longitude ON places (latitude, longitude);
+
+-- =============================================================
+-- Recherche plein texte (FTS5) : synchronise avec
+-- app/persistence/fulltext.py (cree aussi au demarrage de l'app)
+-- =============================================================
+
+CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+    title, description,
+    content='places', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS places_fts_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts(rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS places_fts_ad AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS places_fts_au
+AFTER UPDATE OF title, description ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO places_fts(rowid, title, description)
+    VALUES (new.rowid, new.title, new.description);
+END;
+
+-- =============================================================
+-- Index spatial (R*Tree) : synchronise avec
+-- app/persistence/spatial.py (cree aussi au demarrage de l'app)
+-- =============================================================
+
+CREATE VIRTUAL TABLE IF NOT EXISTS places_rtree USING rtree(
+    id, min_lat, max_lat, min_lon, max_lon
+);
+
+CREATE TRIGGER IF NOT EXISTS places_rtree_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_rtree(id, min_lat, max_lat, min_lon, max_lon)
+    VALUES (new.rowid, new.latitude, new.latitude,
+            new.longitude, new.longitude);
+END;
+
+CREATE TRIGGER IF NOT EXISTS places_rtree_ad AFTER DELETE ON places BEGIN
+    DELETE FROM places_rtree WHERE id = old.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS places_rtree_au
+AFTER UPDATE OF latitude, longitude ON places BEGIN
+    UPDATE places_rtree
+    SET min_lat = new.latitude, max_lat = new.latitude,
+        min_lon = new.longitude, max_lon = new.longitude
+    WHERE id = new.rowid;
+END;
@@ -11,8 +11,13 @@ Lancer avec :
 """
 
 import unittest
+from contextlib import contextmanager
+
+from flask import request_finished
+from sqlalchemy import event
 from app import create_app, db
 from app.models.user import User
+from config import TestingConfig
 
 
 class TestBase(unittest.TestCase):
@@ -21,8 +26,11 @@ class TestBase(unittest.TestCase):
     Chaque test a sa propre DB vierge — aucune dépendance entre les tests.
     """
 
+    # Surchargeable par les sous-classes (variantes de configuration)
+    config_class = "config.TestingConfig"
+
     def setUp(self):
-        self.app = create_app("config.TestingConfig")
+        self.app = create_app(self.config_class)
         self.client = self.app.test_client()
         with self.app.app_context():
             db.create_all()
@@ -46,6 +54,45 @@ class TestBase(unittest.TestCase):
     # Helpers — réutilisés dans tous les tests
     # -------------------------------------------------------
 
+    @contextmanager
+    def assert_max_queries(self, n, status=None):
+        """
+        Échoue si le bloc exécute plus de n requêtes SQL (budget N+1).
+
+        Avec status, le bloc doit aussi envoyer au moins une réponse
+        HTTP, toutes avec ce code : une erreur qui sort tôt (400, 500)
+        ne passe pas pour une requête dans le budget.
+
+            with self.assert_max_queries(3, status=200):
+                self.client.get('/api/v1/places/')
+        """
+        statements = []
+        responses = []
+
+        def _count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        def _response(sender, response, **extra):
+            responses.append(response.status_code)
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", _count)
+        request_finished.connect(_response, self.app)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+            request_finished.disconnect(_response, self.app)
+        self.assertLessEqual(
+            len(statements), n,
+            f"{len(statements)} requêtes SQL (budget {n}) :\n"
+            + "\n".join(statements))
+        if status is not None:
+            self.assertTrue(responses, "aucune réponse HTTP dans le bloc")
+            self.assertEqual(set(responses), {status},
+                             f"codes HTTP {responses} (attendu {status})")
+
     def _login(self, email, password):
         """POST /auth/login → retourne le token JWT ou None."""
         r = self.client.post('/api/v1/auth/login',
@@ -521,6 +568,22 @@ class TestReviewsCreate(TestBase):
                                 text="Deuxième review", rating=3)
         self.assertEqual(r.status_code, 400)
 
+    def test_doublon_sans_charger_les_reviews(self):
+        """Doublon vérifié par (user_id, place_id) : reviews de la place non lues."""
+        _, gwen_token = self._create_user("gwen@test.com")
+        self._create_review(gwen_token, self.place_id)
+        self._create_review(self.jane_token, self.place_id)
+        with self.assert_max_queries(10, status=400) as statements:
+            r = self._create_review(self.jane_token, self.place_id,
+                                    text="Deuxième review", rating=3)
+            self.assertEqual(r.status_code, 400)
+        selects = [s for s in statements
+                   if s.startswith("SELECT") and "FROM reviews" in s]
+        self.assertEqual(len(selects), 1)
+        self.assertIn("reviews.user_id = ?", selects[0])
+        self.assertIn("reviews.place_id = ?", selects[0])
+        self.assertNotIn("reviews.rating", selects[0])
+
     def test_rating_trop_haut(self):
         """Rating > 5 → 400."""
         r = self._create_review(self.jane_token, self.place_id, rating=10)
@@ -730,5 +793,1947 @@ class TestRBAC(TestBase):
         self.assertEqual(r.status_code, 200)
 
 
+# =============================================================================
+# SECTION 8 — PAGINATION (curseur)
+# =============================================================================
+
+class TestPagination(TestBase):
+    """Pagination par curseur (limit + after) des endpoints de liste."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        self.place_ids = [
+            self._create_place(self.john_token, f"Place {i}")
+            for i in range(5)
+        ]
+
+    def _next_url(self, response):
+        """Extrait l'URL rel="next" du header Link (ou None)."""
+        link = response.headers.get("Link")
+        if not link:
+            return None
+        return link[link.index("<") + 1:link.index(">")]
+
+    def test_limit_respecte(self):
+        """GET /places/?limit=2 → 2 places + header Link rel=next."""
+        r = self.client.get('/api/v1/places/?limit=2')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.get_json()), 2)
+        self.assertIn('rel="next"', r.headers.get("Link", ""))
+
+    def test_parcours_complet_sans_doublon(self):
+        """Suivre les liens next parcourt toutes les places une seule fois."""
+        seen = []
+        url = '/api/v1/places/?limit=2'
+        while url:
+            r = self.client.get(url)
+            self.assertEqual(r.status_code, 200)
+            seen.extend(p["id"] for p in r.get_json())
+            url = self._next_url(r)
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(sorted(seen), sorted(self.place_ids))
+
+    def test_link_expose_en_cors(self):
+        """Le front (autre origine) peut lire le header Link."""
+        r = self.client.get('/api/v1/places/?limit=2',
+                            headers={"Origin": "http://localhost:8000"})
+        self.assertIn("Link", r.headers.get("Access-Control-Expose-Headers", ""))
+
+    def test_derniere_page_sans_link(self):
+        """Une page qui contient tout → pas de header Link."""
+        r = self.client.get('/api/v1/places/?limit=50')
+        self.assertEqual(len(r.get_json()), 5)
+        self.assertNotIn("Link", r.headers)
+
+    def test_curseur_invalide(self):
+        """Curseur illisible → 400."""
+        r = self.client.get('/api/v1/places/?after=pas-un-curseur')
+        self.assertEqual(r.status_code, 400)
+
+    def test_curseur_valeurs_invalides(self):
+        """Valeurs du curseur d'un mauvais type pour la clé de tri → 400."""
+        import base64
+        import json
+        for values in ([{"x": 1}, "x"], [[1], "x"], [None, None],
+                       ["abc", "x"], [{"dt": "2024-01-01"}, 1]):
+            after = base64.urlsafe_b64encode(
+                json.dumps(values).encode()).decode()
+            for url in ('/api/v1/users/', '/api/v1/places/',
+                        '/api/v1/reviews/', '/api/v1/amenities/',
+                        f'/api/v1/places/{self.place_ids[0]}/reviews'):
+                with self.subTest(url=url, values=values):
+                    r = self.client.get(f'{url}?after={after}')
+                    self.assertEqual(r.status_code, 400)
+                    self.assertEqual(r.get_json(), {"error": "Invalid cursor"})
+        # Tri par prix : le prix doit être un nombre fini
+        for values in (["NaN", "x"], [1e400, "x"], [True, "x"]):
+            after = base64.urlsafe_b64encode(
+                json.dumps(values).encode()).decode()
+            r = self.client.get(f'/api/v1/places/?sort=price&after={after}')
+            self.assertEqual(r.status_code, 400)
+
+    def test_limit_invalide(self):
+        """limit=0 ou non numérique → 400."""
+        self.assertEqual(
+            self.client.get('/api/v1/places/?limit=0').status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/v1/amenities/?limit=abc').status_code, 400)
+
+    def test_reviews_dune_place_paginees(self):
+        """GET /places/<id>/reviews accepte aussi limit/after."""
+        _, jane_token = self._create_user("jane@test.com")
+        _, gwen_token = self._create_user("gwen@test.com")
+        self._create_review(jane_token, self.place_ids[0])
+        self._create_review(gwen_token, self.place_ids[0], rating=4)
+
+        r = self.client.get(
+            f'/api/v1/places/{self.place_ids[0]}/reviews?limit=1')
+        self.assertEqual(len(r.get_json()), 1)
+        r2 = self.client.get(self._next_url(r))
+        self.assertEqual(len(r2.get_json()), 1)
+        self.assertNotEqual(r.get_json()[0]["id"], r2.get_json()[0]["id"])
+        self.assertIsNone(self._next_url(r2))
+
+
+# =============================================================================
+# SECTION 9 — INSERTION EN MASSE (facade)
+# =============================================================================
+
+class TestBulkInsert(TestBase):
+    """create_*_bulk : une seule requête INSERT + un COMMIT par chunk."""
+
+    def setUp(self):
+        super().setUp()
+        self.john_id, self.john_token = self._create_user("john@test.com")
+        self.jane_id, _ = self._create_user("jane@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+
+    def _place_row(self, i, **extra):
+        row = {"title": f"Bulk {i}", "price": 10 + i, "latitude": 45.0,
+               "longitude": 6.0, "owner_id": self.john_id}
+        row.update(extra)
+        return row
+
+    def test_places_bulk_avec_amenities(self):
+        """Les places et leurs liens place_amenity sont insérés."""
+        from app.services import facade
+        with self.app.app_context():
+            rows = [self._place_row(i, amenities=[self.amenity_id])
+                    for i in range(25)]
+            places = facade.create_places_bulk(rows, chunk_size=10)
+            self.assertEqual(len(places), 25)
+            self.assertTrue(all(p.id for p in places))
+            place = facade.get_place(places[3].id)
+            self.assertEqual(place.title, "Bulk 3")
+            self.assertEqual([a.id for a in place.amenities],
+                             [self.amenity_id])
+
+    def test_places_bulk_erreurs_par_index(self):
+        """Lignes invalides → BulkValidationError avec index, rien inséré."""
+        from app.services import facade, BulkValidationError
+        with self.app.app_context():
+            before = len(facade.get_all_places())
+            rows = [self._place_row(0), self._place_row(1, price=-5),
+                    self._place_row(2, owner_id="inconnu"),
+                    {"title": "Sans prix", "latitude": 1, "longitude": 1,
+                     "owner_id": self.john_id}]
+            with self.assertRaises(BulkValidationError) as ctx:
+                facade.create_places_bulk(rows)
+            self.assertEqual([e["index"] for e in ctx.exception.errors],
+                             [1, 2, 3])
+            self.assertEqual(len(facade.get_all_places()), before)
+
+    def test_reviews_et_amenities_bulk(self):
+        """Reviews et amenities en masse ; le propriétaire est refusé."""
+        from app.services import facade, BulkValidationError
+        place_id = self._create_place(self.john_token)
+        with self.app.app_context():
+            amenities = facade.create_amenities_bulk(
+                [{"name": f"Amenity {i}"} for i in range(5)])
+            self.assertEqual(len(amenities), 5)
+
+            reviews = facade.create_reviews_bulk([
+                {"text": "Top", "rating": 5, "user_id": self.jane_id,
+                 "place_id": place_id}])
+            self.assertEqual(
+                facade.get_review(reviews[0].id).place_id, place_id)
+
+            with self.assertRaises(BulkValidationError) as ctx:
+                facade.create_reviews_bulk([
+                    {"text": "Moi", "rating": 5, "user_id": self.john_id,
+                     "place_id": place_id}])
+            self.assertEqual(ctx.exception.errors[0]["index"], 0)
+
+
+# =============================================================================
+# SECTION 10 — UNIT OF WORK (un COMMIT par requête)
+# =============================================================================
+
+class NoUnitOfWorkConfig(TestingConfig):
+    """Configuration de test sans unit of work."""
+    UNIT_OF_WORK_PER_REQUEST = False
+
+
+class TestUnitOfWork(TestBase):
+    """Un seul COMMIT par requête HTTP, rollback si erreur."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        self.amenity_ids = [self._create_amenity(f"A{i}") for i in range(3)]
+
+    def _count_commits(self):
+        """Branche un compteur de COMMIT sur l'engine."""
+        commits = []
+        with self.app.app_context():
+            event.listen(db.engine, "commit",
+                         lambda conn: commits.append(1))
+        return commits
+
+    def test_creer_place_un_seul_commit(self):
+        """POST /places/ avec 3 amenities → 1 seul COMMIT."""
+        commits = self._count_commits()
+        self._create_place(self.john_token, amenities=self.amenity_ids)
+        self.assertEqual(len(commits), 1)
+
+    def test_lecture_sans_commit(self):
+        """GET /places/ → aucun COMMIT."""
+        commits = self._count_commits()
+        self.client.get('/api/v1/places/')
+        self.assertEqual(len(commits), 0)
+
+    def test_erreur_annule_tout(self):
+        """Amenity inconnue en fin de liste → 400 et rien n'est écrit."""
+        r = self.client.post('/api/v1/places/', json={
+            "title": "Partielle", "price": 50, "latitude": 45.0,
+            "longitude": 6.0,
+            "amenities": self.amenity_ids + ["inconnue"]
+        }, headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/').get_json(), [])
+
+    def test_context_manager_rollback(self):
+        """unit_of_work() : exception → rollback de tout le bloc."""
+        from app.persistence.unit_of_work import unit_of_work
+        from app.services import facade
+        with self.app.app_context():
+            with self.assertRaises(RuntimeError):
+                with unit_of_work():
+                    facade.create_amenity({"name": "Temp 1"})
+                    facade.create_amenity({"name": "Temp 2"})
+                    raise RuntimeError("boom")
+            names = [a.name for a in facade.get_all_amenities()]
+            self.assertNotIn("Temp 1", names)
+
+    def test_add_many_en_echec_dans_le_bloc(self):
+        """add_many en échec : pas de rollback des écritures du bloc."""
+        from sqlalchemy.exc import IntegrityError
+        from app.models.amenity import Amenity
+        from app.persistence.unit_of_work import unit_of_work
+        from app.services import facade
+        with self.app.app_context():
+            with unit_of_work():
+                avant = facade.create_amenity({"name": "Avant"})
+                with self.assertRaises(IntegrityError):
+                    facade.amenity_repo.add_many(
+                        [Amenity(name="Doublon", id=avant.id)])
+                self.assertEqual(facade.get_amenity(avant.id).name, "Avant")
+            db.session.expunge_all()
+            names = [a.name for a in facade.get_all_amenities()]
+            self.assertIn("Avant", names)
+            self.assertNotIn("Doublon", names)
+
+    def test_opt_out_commit_par_mutation(self):
+        """UNIT_OF_WORK_PER_REQUEST = False → un COMMIT par mutation."""
+        self.app = create_app(NoUnitOfWorkConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            admin = User(first_name="Admin", last_name="HBnB",
+                         email="admin@hbnb.io", is_admin=True)
+            admin.hash_password("admin1234")
+            db.session.add(admin)
+            db.session.commit()
+        _, token = self._create_user("jane@test.com")
+        amenity_ids = [self._create_amenity(f"B{i}") for i in range(3)]
+        commits = self._count_commits()
+        self._create_place(token, amenities=amenity_ids)
+        # La place et ses liens amenities : une seule mutation (un flush)
+        self.assertEqual(len(commits), 1)
+        self._create_amenity("B3")
+        self.assertEqual(len(commits), 2)
+
+
+# =============================================================================
+# SECTION 11 — CHARGEMENT ANTICIPÉ (pas de N+1)
+# =============================================================================
+
+class TestEagerLoading(TestBase):
+    """Le nombre de requêtes SQL ne dépend pas de la taille du résultat."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        _, self.gwen_token = self._create_user("gwen@test.com")
+
+    def _count_statements(self, url):
+        """Nombre de requêtes SQL exécutées pour un GET (header X-SQL-Queries)."""
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200)
+        return int(r.headers["X-SQL-Queries"])
+
+    def test_detail_place_constant(self):
+        """GET /places/<id> : même nombre de requêtes avec 0 ou 4 amenities."""
+        small = self._create_place(self.john_token, "Sans amenity")
+        amenity_ids = [self._create_amenity(f"A{i}") for i in range(4)]
+        big = self._create_place(self.john_token, "Avec amenities",
+                                 amenities=amenity_ids)
+        self.assertEqual(self._count_statements(f'/api/v1/places/{small}'),
+                         self._count_statements(f'/api/v1/places/{big}'))
+
+    def test_liste_reviews_constante(self):
+        """GET /reviews/ et /places/<id>/reviews : pas de lazy load par review."""
+        place_id = self._create_place(self.john_token)
+        self._create_review(self.jane_token, place_id)
+        one = self._count_statements('/api/v1/reviews/')
+        one_by_place = self._count_statements(
+            f'/api/v1/places/{place_id}/reviews')
+        self._create_review(self.gwen_token, place_id)
+        self.assertEqual(self._count_statements('/api/v1/reviews/'), one)
+        self.assertEqual(self._count_statements(
+            f'/api/v1/places/{place_id}/reviews'), one_by_place)
+
+
+# =============================================================================
+# SECTION 12 — BUDGET DE REQUÊTES SQL PAR ENDPOINT
+# =============================================================================
+
+class TestQueryBudget(TestBase):
+    """Chaque endpoint de lecture a un budget fixe de requêtes SQL."""
+
+    def setUp(self):
+        super().setUp()
+        self.john_id, self.john_token = self._create_user("john@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+        self.place_id = self._create_place(
+            self.john_token, amenities=[self.amenity_id])
+        self.review_id = self._create_review(
+            self.jane_token, self.place_id).get_json()["id"]
+
+    def test_headers_statistiques_sql(self):
+        """En mode test, X-SQL-Queries et X-SQL-Time-ms sont renvoyés."""
+        r = self.client.get('/api/v1/places/')
+        self.assertEqual(r.headers["X-SQL-Queries"], "2")
+        self.assertIn("X-SQL-Time-ms", r.headers)
+
+    def test_chronometre_instruction_en_echec(self):
+        """Une instruction en erreur ne laisse rien sur la connexion."""
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError
+        with self.app.app_context():
+            conn = db.session.connection()
+            info = dict(conn.info)
+            with self.assertRaises(OperationalError):
+                conn.execute(text("SELECT * FROM table_inconnue"))
+            self.assertEqual(conn.info, info)
+
+    def test_budget_listes(self):
+        """Listes paginées : 2 requêtes (version de la collection + page)."""
+        for url in ('/api/v1/places/', '/api/v1/users/',
+                    '/api/v1/reviews/', '/api/v1/amenities/'):
+            with self.subTest(url=url), self.assert_max_queries(2, status=200):
+                self.client.get(url)
+
+    def test_budget_details(self):
+        """Détails : place (owner + amenities) 2, review / user / amenity 1."""
+        budgets = {
+            f'/api/v1/places/{self.place_id}': 2,
+            f'/api/v1/places/{self.place_id}/reviews': 2,
+            f'/api/v1/reviews/{self.review_id}': 1,
+            f'/api/v1/users/{self.john_id}': 1,
+            f'/api/v1/amenities/{self.amenity_id}': 1,
+        }
+        for url, budget in budgets.items():
+            with self.subTest(url=url), \
+                    self.assert_max_queries(budget, status=200):
+                self.client.get(url)
+
+
+# =============================================================================
+# SECTION 13 — INDEX : AUCUN FULL SCAN (EXPLAIN QUERY PLAN)
+# =============================================================================
+
+class TestQueryPlans(TestBase):
+    """Chaque requête des repositories doit utiliser un index."""
+
+    def setUp(self):
+        super().setUp()
+        self.john_id, self.john_token = self._create_user("john@test.com")
+        self.jane_id, self.jane_token = self._create_user("jane@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+        self.place_ids = [
+            self._create_place(self.john_token, f"Place {i}",
+                               amenities=[self.amenity_id])
+            for i in range(2)
+        ]
+        self._create_review(self.jane_token, self.place_ids[0])
+
+    def _assert_no_full_scan(self, name, call):
+        """Exécute call() et vérifie le plan de chaque SELECT émis."""
+        captured = []
+
+        def _capture(conn, cursor, statement, parameters, *args):
+            if statement.lstrip().upper().startswith("SELECT"):
+                captured.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", _capture)
+        try:
+            call()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _capture)
+
+        self.assertTrue(captured, f"{name} : aucune requête capturée")
+        connection = db.session.connection()
+        for statement, parameters in captured:
+            plan = [row[3] for row in connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters)]
+            for detail in plan:
+                full_scan = (detail.startswith("SCAN ")
+                             and "USING" not in detail
+                             and detail != "SCAN CONSTANT ROW")
+                self.assertFalse(
+                    full_scan or "TEMP B-TREE FOR ORDER BY" in detail,
+                    f"{name} : {detail}\n{statement}")
+
+    def test_requetes_des_repositories(self):
+        """get, recherches par FK / email / nom, pages, relations."""
+        from app.services import facade
+        with self.app.app_context():
+            users = facade.user_repo
+            places = facade.place_repo
+            reviews = facade.review_repo
+            amenities = facade.amenity_repo
+            _, place_cursor = places.get_page(limit=1)
+            _, review_cursor = reviews.get_page(limit=1)
+            calls = {
+                "users.get": lambda: users.get(self.john_id),
+                "users.get_user_by_email":
+                    lambda: users.get_user_by_email("john@test.com"),
+                "users.get_page": lambda: users.get_page(limit=1),
+                "places.get_by_ids":
+                    lambda: places.get_by_ids(self.place_ids),
+                "places.get_places_by_owner":
+                    lambda: places.get_places_by_owner(self.john_id),
+                "places.get_page": lambda: places.get_page(limit=1),
+                "places.get_page(after)":
+                    lambda: places.get_page(after=place_cursor, limit=1),
+                "places.search(price, sort=price)": lambda: places.search(
+                    min_price=10, max_price=100, sort="price", limit=1),
+                "places.search(sort=rating)":
+                    lambda: places.search(sort="rating", limit=1),
+                "places.search(sort=newest)":
+                    lambda: places.search(sort="newest", limit=1),
+                "places.get(load)": lambda: places.get(
+                    self.place_ids[0], load=["owner", "amenities"]),
+                "reviews.get_reviews_by_place":
+                    lambda: reviews.get_reviews_by_place(self.place_ids[0]),
+                "reviews.get_reviews_by_user":
+                    lambda: reviews.get_reviews_by_user(self.jane_id),
+                "reviews.get_page(place_id)": lambda: reviews.get_page(
+                    after=review_cursor, limit=1,
+                    filters={"place_id": self.place_ids[0]}),
+                "amenities.get_amentiy_by_name":
+                    lambda: amenities.get_amentiy_by_name("WiFi"),
+                "amenities.get_page": lambda: amenities.get_page(limit=1),
+                "amenity.places (backref)":
+                    lambda: amenities.get(self.amenity_id).places,
+            }
+            for name, call in calls.items():
+                with self.subTest(query=name):
+                    # Plans of the queries run on a cache miss
+                    db.session.expire_all()
+                    facade.clear_caches()
+                    self._assert_no_full_scan(name, call)
+
+
+
+# =============================================================================
+# SECTION 14 — AGRÉGATS DES NOTES (dénormalisés sur la place)
+# =============================================================================
+
+class TestRatingAggregates(TestBase):
+    """review_count / average_rating / histogramme maintenus à l'écriture."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.owner_token = self._create_user("owner@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        _, self.bob_token = self._create_user("bob@test.com")
+        self.place_id = self._create_place(self.owner_token)
+
+    def _place(self):
+        return self.client.get(f'/api/v1/places/{self.place_id}').get_json()
+
+    def test_place_sans_review(self):
+        """Sans review : 0, moyenne null, histogramme à zéro."""
+        data = self._place()
+        self.assertEqual(data["review_count"], 0)
+        self.assertIsNone(data["average_rating"])
+        self.assertEqual(data["rating_histogram"],
+                         {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0})
+
+    def test_creation_review(self):
+        """Chaque review met à jour le compteur, la moyenne et l'histogramme."""
+        self._create_review(self.jane_token, self.place_id, rating=5)
+        self._create_review(self.bob_token, self.place_id, rating=2)
+        data = self._place()
+        self.assertEqual(data["review_count"], 2)
+        self.assertEqual(data["average_rating"], 3.5)
+        self.assertEqual(data["rating_histogram"]["5"], 1)
+        self.assertEqual(data["rating_histogram"]["2"], 1)
+
+    def test_liste_expose_les_agregats(self):
+        """GET /places/ expose review_count et average_rating."""
+        self._create_review(self.jane_token, self.place_id, rating=4)
+        places = self.client.get('/api/v1/places/').get_json()
+        place = next(p for p in places if p["id"] == self.place_id)
+        self.assertEqual(place["review_count"], 1)
+        self.assertEqual(place["average_rating"], 4.0)
+
+    def test_modification_note(self):
+        """Changer la note déplace la review dans l'histogramme."""
+        review_id = self._create_review(
+            self.jane_token, self.place_id, rating=5).get_json()["id"]
+        r = self.client.put(f'/api/v1/reviews/{review_id}',
+                            json={"rating": 1},
+                            headers=self._auth(self.jane_token))
+        self.assertEqual(r.status_code, 200)
+        data = self._place()
+        self.assertEqual(data["review_count"], 1)
+        self.assertEqual(data["average_rating"], 1.0)
+        self.assertEqual(data["rating_histogram"]["5"], 0)
+        self.assertEqual(data["rating_histogram"]["1"], 1)
+
+    def test_modification_texte_seul(self):
+        """Modifier le texte (même note) ne change pas les agrégats."""
+        review_id = self._create_review(
+            self.jane_token, self.place_id, rating=3).get_json()["id"]
+        self.client.put(f'/api/v1/reviews/{review_id}',
+                        json={"text": "Finalement correct", "rating": 3},
+                        headers=self._auth(self.jane_token))
+        data = self._place()
+        self.assertEqual(data["review_count"], 1)
+        self.assertEqual(data["rating_histogram"]["3"], 1)
+
+    def test_suppression_review(self):
+        """Supprimer une review retire sa note des agrégats."""
+        review_id = self._create_review(
+            self.jane_token, self.place_id, rating=5).get_json()["id"]
+        self._create_review(self.bob_token, self.place_id, rating=3)
+        self.client.delete(f'/api/v1/reviews/{review_id}',
+                           headers=self._auth(self.jane_token))
+        data = self._place()
+        self.assertEqual(data["review_count"], 1)
+        self.assertEqual(data["average_rating"], 3.0)
+        self.assertEqual(data["rating_histogram"]["5"], 0)
+
+    def test_detection_et_recalcul(self):
+        """check_place_ratings() détecte un compteur faux, recompute le répare."""
+        from app.services import facade
+        self._create_review(self.jane_token, self.place_id, rating=4)
+        with self.app.app_context():
+            self.assertEqual(facade.check_place_ratings(), [])
+
+            place = facade.get_place(self.place_id)
+            place.review_count = 7
+            place.rating_4_count = 0
+            db.session.commit()
+            self.assertEqual(facade.check_place_ratings(), [self.place_id])
+
+            facade.recompute_place_ratings([self.place_id])
+            self.assertEqual(facade.check_place_ratings(), [])
+            place = facade.get_place(self.place_id)
+            self.assertEqual(place.review_count, 1)
+            self.assertEqual(place.rating_histogram["4"], 1)
+
+    def test_insertion_en_masse(self):
+        """create_reviews_bulk recalcule les agrégats des places touchées."""
+        from app.services import facade
+        with self.app.app_context():
+            user_ids = [facade.get_user_by_email(email).id
+                        for email in ("jane@test.com", "bob@test.com")]
+            facade.create_reviews_bulk([
+                {"text": "Bien", "rating": rating, "user_id": user_id,
+                 "place_id": self.place_id}
+                for user_id, rating in zip(user_ids, (2, 4))
+            ])
+            self.assertEqual(facade.check_place_ratings(), [])
+        data = self._place()
+        self.assertEqual(data["review_count"], 2)
+        self.assertEqual(data["average_rating"], 3.0)
+
+
+
+# =============================================================================
+# SECTION 15 — RECHERCHE DE PLACES (filtres et tri côté SQL)
+# =============================================================================
+
+class TestPlaceSearch(TestBase):
+    """GET /places/ : min_price, max_price, amenities, bbox, sort."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        self.wifi_id = self._create_amenity("WiFi")
+        self.pool_id = self._create_amenity("Pool")
+        self.annecy = self._post_place("Annecy", 80, 45.9, 6.1,
+                                       [self.wifi_id, self.pool_id])
+        self.lyon = self._post_place("Lyon", 40, 45.7, 4.8, [self.wifi_id])
+        self.paris = self._post_place("Paris", 150, 48.8, 2.3, [])
+        self._create_review(self.jane_token, self.lyon, rating=5)
+        self._create_review(self.jane_token, self.annecy, rating=3)
+
+    def _post_place(self, title, price, latitude, longitude, amenities):
+        r = self.client.post('/api/v1/places/', json={
+            "title": title, "description": "", "price": price,
+            "latitude": latitude, "longitude": longitude,
+            "amenities": amenities
+        }, headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 201, r.get_json())
+        return r.get_json()["id"]
+
+    def _ids(self, query):
+        r = self.client.get('/api/v1/places/?' + query)
+        self.assertEqual(r.status_code, 200, r.get_json())
+        return [p["id"] for p in r.get_json()]
+
+    def test_fourchette_de_prix(self):
+        """min_price / max_price sont inclusifs."""
+        self.assertEqual(set(self._ids("min_price=40&max_price=80")),
+                         {self.annecy, self.lyon})
+        self.assertEqual(self._ids("min_price=100"), [self.paris])
+
+    def test_amenities_toutes_requises(self):
+        """amenities=a,b → seulement les places qui ont a ET b."""
+        self.assertEqual(set(self._ids(f"amenities={self.wifi_id}")),
+                         {self.annecy, self.lyon})
+        self.assertEqual(
+            self._ids(f"amenities={self.wifi_id},{self.pool_id}"),
+            [self.annecy])
+
+    def test_bbox(self):
+        """bbox=min_lon,min_lat,max_lon,max_lat (Alpes, sans Paris)."""
+        self.assertEqual(set(self._ids("bbox=4,45,7,46.5")),
+                         {self.annecy, self.lyon})
+
+    def test_tris(self):
+        """sort=price (croissant), rating (meilleure d'abord), newest."""
+        self.assertEqual(self._ids("sort=price"),
+                         [self.lyon, self.annecy, self.paris])
+        self.assertEqual(self._ids("sort=rating"),
+                         [self.lyon, self.annecy, self.paris])
+        self.assertEqual(self._ids("sort=newest")[0], self.paris)
+
+    def test_filtres_et_pagination(self):
+        """Les liens next conservent filtres et tri."""
+        r = self.client.get('/api/v1/places/?sort=price&max_price=100&limit=1')
+        seen = [p["id"] for p in r.get_json()]
+        link = r.headers["Link"]
+        next_url = link[link.index("<") + 1:link.index(">")]
+        self.assertIn("max_price=100", next_url)
+        r2 = self.client.get(next_url)
+        seen += [p["id"] for p in r2.get_json()]
+        self.assertEqual(seen, [self.lyon, self.annecy])
+        self.assertNotIn("Link", r2.headers)
+
+    def test_parametres_invalides(self):
+        """Tri inconnu, prix non numérique, bbox mal formée → 400."""
+        for query in ("sort=cheapest", "min_price=abc", "max_price=-1",
+                      "min_price=nan", "max_price=inf", "max_price=-inf",
+                      "min_price=50&max_price=10", "bbox=1,2,3",
+                      "bbox=0,50,10,40", "bbox=a,b,c,d"):
+            with self.subTest(query=query):
+                r = self.client.get('/api/v1/places/?' + query)
+                self.assertEqual(r.status_code, 400)
+
+
+
+# =============================================================================
+# SECTION 16 — RECHERCHE PLEIN TEXTE (FTS5, repli LIKE)
+# =============================================================================
+
+class TestFullTextSearch(TestBase):
+    """GET /places/search?q= : classement BM25, extraits surlignés."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        self.chalet = self._post_place(
+            "Chalet vue sur le lac", "Calme, au bord de l'eau.", 120)
+        self.studio = self._post_place(
+            "Studio Genève", "Studio moderne à deux pas du lac Léman.", 60)
+        self.loft = self._post_place(
+            "Loft industriel", "Grand loft en centre-ville.", 90)
+
+    def _post_place(self, title, description, price):
+        r = self.client.post('/api/v1/places/', json={
+            "title": title, "description": description, "price": price,
+            "latitude": 45.0, "longitude": 6.0, "amenities": []
+        }, headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 201, r.get_json())
+        return r.get_json()["id"]
+
+    def _search(self, query):
+        r = self.client.get('/api/v1/places/search?' + query)
+        self.assertEqual(r.status_code, 200, r.get_json())
+        return r.get_json()
+
+    def test_classement_titre_avant_description(self):
+        """'lac' : le titre pèse plus que la description."""
+        ids = [p["id"] for p in self._search("q=lac")]
+        self.assertEqual(ids, [self.chalet, self.studio])
+
+    def test_surlignage_et_extrait(self):
+        """title_highlight et snippet entourent les termes de <mark>."""
+        result = self._search("q=moderne")[0]
+        self.assertEqual(result["id"], self.studio)
+        self.assertEqual(result["title_highlight"], "Studio Genève")
+        self.assertIn("<mark>moderne</mark>", result["snippet"])
+
+    def test_tous_les_mots_prefixes_sans_accents(self):
+        """Tous les mots requis, en préfixe, accents ignorés."""
+        self.assertEqual([p["id"] for p in self._search("q=geneve")],
+                         [self.studio])
+        self.assertEqual([p["id"] for p in self._search("q=indus")],
+                         [self.loft])
+        self.assertEqual(self._search("q=lac+loft"), [])
+
+    def test_index_synchronise(self):
+        """Modification et suppression d'une place mettent l'index à jour."""
+        self.client.put(f'/api/v1/places/{self.loft}',
+                        json={"title": "Loft avec sauna"},
+                        headers=self._auth(self.john_token))
+        self.assertEqual([p["id"] for p in self._search("q=sauna")],
+                         [self.loft])
+        self.assertEqual(self._search("q=industriel"), [])
+
+        self.client.delete(f'/api/v1/places/{self.loft}',
+                           headers=self._auth(self.john_token))
+        self.assertEqual(self._search("q=sauna"), [])
+
+    def test_pagination_et_prix(self):
+        """limit / after suivent le classement, max_price filtre."""
+        r = self.client.get('/api/v1/places/search?q=lac&limit=1')
+        self.assertEqual([p["id"] for p in r.get_json()], [self.chalet])
+        link = r.headers["Link"]
+        r2 = self.client.get(link[link.index("<") + 1:link.index(">")])
+        self.assertEqual([p["id"] for p in r2.get_json()], [self.studio])
+        self.assertNotIn("Link", r2.headers)
+        self.assertEqual([p["id"] for p in self._search("q=lac&max_price=100")],
+                         [self.studio])
+
+    def test_q_obligatoire_et_syntaxe_neutralisee(self):
+        """q vide → 400 ; la syntaxe FTS5 saisie est traitée comme du texte."""
+        r = self.client.get('/api/v1/places/search?q=')
+        self.assertEqual(r.status_code, 400)
+        for query in ('lac"', 'NEAR(lac', 'title:lac', 'lac OR', '*'):
+            with self.subTest(q=query):
+                r = self.client.get('/api/v1/places/search',
+                                    query_string={"q": query})
+                self.assertEqual(r.status_code, 200)
+
+
+class NoFullTextConfig(TestingConfig):
+    """Sans index FTS5 : repli sur un scan LIKE."""
+    FULLTEXT_SEARCH = False
+
+
+class TestFullTextSearchFallback(TestFullTextSearch):
+    """Mêmes tests avec le repli LIKE (FTS5 indisponible)."""
+
+    config_class = NoFullTextConfig
+
+    def test_tous_les_mots_prefixes_sans_accents(self):
+        """LIKE : sous-chaînes, tous les mots requis, accents NON ignorés."""
+        self.assertEqual([p["id"] for p in self._search("q=genève")],
+                         [self.studio])
+        self.assertEqual(self._search("q=geneve"), [])
+        self.assertEqual([p["id"] for p in self._search("q=indus")],
+                         [self.loft])
+        self.assertEqual(self._search("q=lac+loft"), [])
+
+    def test_pas_dindex_fts(self):
+        """FULLTEXT_SEARCH = False → places_fts n'est pas créée."""
+        with self.app.app_context():
+            self.assertFalse(db.inspect(db.engine).has_table("places_fts"))
+
+
+# =============================================================================
+# SECTION 17 — RECHERCHE DE PROXIMITÉ (R*Tree + haversine)
+# =============================================================================
+
+class TestNearbySearch(TestBase):
+    """GET /places/nearby?lat=&lon=&radius_km=&limit= : plus proches d'abord."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        self.annecy = self._post_place("Annecy", 45.8992, 6.1294)
+        self.geneve = self._post_place("Genève", 46.2044, 6.1432)
+        self.lyon = self._post_place("Lyon", 45.7640, 4.8357)
+        self.fidji = self._post_place("Fidji", -17.7, 179.9)
+
+    def _post_place(self, title, latitude, longitude):
+        r = self.client.post('/api/v1/places/', json={
+            "title": title, "description": "", "price": 50,
+            "latitude": latitude, "longitude": longitude, "amenities": []
+        }, headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 201, r.get_json())
+        return r.get_json()["id"]
+
+    def _nearby(self, query):
+        r = self.client.get('/api/v1/places/nearby?' + query)
+        self.assertEqual(r.status_code, 200, r.get_json())
+        return r.get_json()
+
+    def test_classement_par_distance(self):
+        """Rayon 50 km autour d'Annecy : Annecy puis Genève (~34 km)."""
+        results = self._nearby("lat=45.90&lon=6.13&radius_km=50")
+        self.assertEqual([p["id"] for p in results],
+                         [self.annecy, self.geneve])
+        self.assertLess(results[0]["distance_km"], 1)
+        self.assertAlmostEqual(results[1]["distance_km"], 33.9, delta=0.5)
+
+    def test_rayon_et_limit(self):
+        """Lyon (~100 km) n'entre qu'avec un rayon suffisant ; limit coupe."""
+        self.assertEqual(len(self._nearby("lat=45.90&lon=6.13&radius_km=150")),
+                         3)
+        self.assertEqual([p["id"] for p in self._nearby(
+            "lat=45.90&lon=6.13&radius_km=150&limit=1")], [self.annecy])
+
+    def test_antimeridien(self):
+        """Un cercle qui traverse le 180e méridien trouve la place."""
+        results = self._nearby("lat=-17.7&lon=-179.95&radius_km=20")
+        self.assertEqual([p["id"] for p in results], [self.fidji])
+
+    def test_index_synchronise(self):
+        """Déplacer ou supprimer une place met l'index à jour."""
+        self.client.put(f'/api/v1/places/{self.lyon}',
+                        json={"latitude": 45.91, "longitude": 6.12},
+                        headers=self._auth(self.john_token))
+        ids = [p["id"] for p in self._nearby("lat=45.90&lon=6.13&radius_km=5")]
+        self.assertEqual(set(ids), {self.annecy, self.lyon})
+
+        self.client.delete(f'/api/v1/places/{self.annecy}',
+                           headers=self._auth(self.john_token))
+        ids = [p["id"] for p in self._nearby("lat=45.90&lon=6.13&radius_km=5")]
+        self.assertEqual(ids, [self.lyon])
+
+    def test_parametres_invalides(self):
+        """lat/lon manquants ou hors bornes, rayon nul ou trop grand → 400."""
+        for query in ("lon=6", "lat=45", "lat=95&lon=6", "lat=45&lon=181",
+                      "lat=45&lon=6&radius_km=0", "lat=45&lon=6&radius_km=x",
+                      "lat=45&lon=6&radius_km=100000",
+                      "lat=45&lon=6&radius_km=nan", "lat=45&lon=6&radius_km=inf",
+                      "lat=nan&lon=6", "lat=45&lon=-inf"):
+            with self.subTest(query=query):
+                r = self.client.get('/api/v1/places/nearby?' + query)
+                self.assertEqual(r.status_code, 400)
+
+        # La facade refuse aussi un rayon non fini, sans maximum
+        from app.services import facade
+        with self.app.app_context():
+            for radius in (float("nan"), float("inf")):
+                with self.assertRaises(ValueError):
+                    facade.get_places_nearby(45.0, 6.0, radius)
+
+
+class NoSpatialIndexConfig(TestingConfig):
+    """Sans R*Tree : boîte englobante lue via l'index (latitude, longitude)."""
+    SPATIAL_INDEX = False
+
+
+class TestNearbySearchFallback(TestNearbySearch):
+    """Mêmes tests sans index R*Tree."""
+
+    config_class = NoSpatialIndexConfig
+
+    def test_pas_de_rtree(self):
+        """SPATIAL_INDEX = False → places_rtree n'est pas créée."""
+        with self.app.app_context():
+            self.assertFalse(db.inspect(db.engine).has_table("places_rtree"))
+
+
+# =============================================================================
+# SECTION 18 — CACHE DES REPOSITORIES (lecture LRU + TTL)
+# =============================================================================
+
+class TestRepositoryCache(TestBase):
+    """get() lit à travers un cache LRU/TTL invalidé à chaque écriture."""
+
+    def setUp(self):
+        super().setUp()
+        self.john_id, self.john_token = self._create_user("john@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+        self.place_id = self._create_place(
+            self.john_token, "Studio", amenities=[self.amenity_id])
+        self.admin_token = self._login("admin@hbnb.io", "admin1234")
+
+    def _get_place(self):
+        r = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(r.status_code, 200)
+        return r.get_json()
+
+    def _stats(self, model):
+        from app.services import facade
+        return facade.get_cache_stats()[model]
+
+    def test_lecture_depuis_le_cache(self):
+        """2e GET : place, owner et amenities servis sans SELECT."""
+        self._get_place()
+        hits = self._stats("Place")["hits"]
+        with self.assert_max_queries(0, status=200):
+            data = self._get_place()
+        self.assertEqual(data["owner"]["email"], "john@test.com")
+        self.assertEqual([a["name"] for a in data["amenities"]], ["WiFi"])
+        self.assertEqual(self._stats("Place")["hits"], hits + 1)
+
+    def test_invalidation_par_update_et_delete(self):
+        """PUT puis GET → nouvelle valeur ; DELETE puis GET → 404."""
+        self._get_place()
+        self.client.put(f'/api/v1/places/{self.place_id}',
+                        json={"title": "Loft"},
+                        headers=self._auth(self.john_token))
+        self.assertEqual(self._get_place()["title"], "Loft")
+
+        self.client.put(f'/api/v1/users/{self.john_id}',
+                        json={"first_name": "Johnny"},
+                        headers=self._auth(self.john_token))
+        self.assertEqual(self._get_place()["owner"]["first_name"], "Johnny")
+
+        self.client.delete(f'/api/v1/places/{self.place_id}',
+                           headers=self._auth(self.john_token))
+        r = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(r.status_code, 404)
+
+    def test_invalidation_par_update_en_masse(self):
+        """Une review (UPDATE des agrégats) invalide la place en cache."""
+        self._get_place()
+        _, jane_token = self._create_user("jane@test.com")
+        self._create_review(jane_token, self.place_id, rating=4)
+        data = self._get_place()
+        self.assertEqual(data["review_count"], 1)
+        self.assertEqual(data["average_rating"], 4)
+
+    def test_invalidation_par_save(self):
+        """BaseModel.update() / save() invalident l'entrée."""
+        from app.services import facade
+        self._get_place()
+        with self.app.app_context():
+            facade.get_place(self.place_id).update({"price": 75})
+        self.assertEqual(self._get_place()["price"], 75)
+
+    def test_modification_non_sauvegardee_ignoree(self):
+        """Les entrées sont des snapshots : un objet modifié sans save()
+        ne change pas ce que lisent les requêtes suivantes."""
+        from app.services import facade
+        self._get_place()
+        with self.app.app_context():
+            facade.get_place(self.place_id).title = "Brouillon"
+            db.session.rollback()
+        self.assertEqual(self._get_place()["title"], "Studio")
+
+    def test_lru_et_ttl(self):
+        """Éviction du moins récemment utilisé, expiration après ttl."""
+        from app.persistence.cache import LRUCache
+        now = [0.0]
+        cache = LRUCache(max_size=2, ttl=10, clock=lambda: now[0])
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        now[0] = 11
+        self.assertIsNone(cache.get("c"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"],
+                          stats["size"]), (2, 2, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_statistiques_admin(self):
+        """GET /stats/cache : admin seulement ; DELETE vide les caches."""
+        r = self.client.get('/api/v1/stats/cache',
+                            headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 403)
+
+        self._get_place()
+        r = self.client.get('/api/v1/stats/cache',
+                            headers=self._auth(self.admin_token))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(set(r.get_json()), {"User", "Place", "Amenity"})
+        self.assertGreaterEqual(r.get_json()["Place"]["size"], 1)
+
+        r = self.client.delete('/api/v1/stats/cache',
+                               headers=self._auth(self.admin_token))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self._stats("Place")["size"], 0)
+
+
+# =============================================================================
+# SECTION 19 — INDEX DE HACHAGE DE L'INMEMORYREPOSITORY (repli)
+# =============================================================================
+
+class TestInMemoryIndexes(TestBase):
+    """InMemoryRepository(indexes=[...]) : recherches O(1) par attribut."""
+
+    def setUp(self):
+        super().setUp()
+        from app.persistence import InMemoryRepository
+        self.repo = InMemoryRepository(indexes=["email"])
+        self.john = User(first_name="John", last_name="Doe",
+                         email="john@test.com")
+        self.jane = User(first_name="Jane", last_name="Doe",
+                         email="jane@test.com")
+        self.repo.add(self.john)
+        self.repo.add(self.jane)
+
+    def test_recherche_indexee(self):
+        """get_by_attribute / get_all_by_attribute, indexé ou non."""
+        self.assertIs(self.repo.get_by_attribute("email", "jane@test.com"),
+                      self.jane)
+        self.assertIsNone(self.repo.get_by_attribute("email", "x@test.com"))
+        self.assertEqual(self.repo.get_all_by_attribute("last_name", "Doe"),
+                         [self.john, self.jane])
+
+    def test_index_suit_les_ecritures(self):
+        """Setter (validé), update() et delete() mettent l'index à jour."""
+        self.john.email = "johnny@test.com"
+        self.assertIsNone(self.repo.get_by_attribute("email", "john@test.com"))
+        self.assertIs(self.repo.get_by_attribute("email", "johnny@test.com"),
+                      self.john)
+
+        with self.assertRaises(ValueError):
+            self.john.email = "invalide"
+        self.assertIs(self.repo.get_by_attribute("email", "johnny@test.com"),
+                      self.john)
+
+        with self.app.app_context():
+            self.repo.update(self.jane.id, {"email": "j@test.com"})
+        self.assertIs(self.repo.get_by_attribute("email", "j@test.com"),
+                      self.jane)
+
+        self.repo.delete(self.jane.id)
+        self.assertEqual(self.repo.get_all_by_attribute("email", "j@test.com"),
+                         [])
+
+
+
+# =============================================================================
+# SECTION 20 — AMENITIES D'UNE PLACE (une requête IN, diff des liens)
+# =============================================================================
+
+class TestPlaceAmenities(TestBase):
+    """create_place / update_place : amenities résolues en une requête."""
+
+    def setUp(self):
+        super().setUp()
+        from app.services import facade
+        self.john_id, self.john_token = self._create_user("john@test.com")
+        with self.app.app_context():
+            self.amenity_ids = [a.id for a in facade.create_amenities_bulk(
+                [{"name": f"Amenity {i}"} for i in range(20)])]
+
+    def _amenity_ids(self, place_id):
+        r = self.client.get(f'/api/v1/places/{place_id}')
+        return {a["id"] for a in r.get_json()["amenities"]}
+
+    def test_get_many(self):
+        """get_many : une requête, ordre conservé, ids manquants signalés."""
+        from app.services import facade
+        ids = [self.amenity_ids[3], "inconnue", self.amenity_ids[1],
+               self.amenity_ids[3]]
+        with self.app.app_context(), self.assert_max_queries(1):
+            found, missing = facade.amenity_repo.get_many(ids)
+            self.assertEqual([a.id for a in found],
+                             [self.amenity_ids[3], self.amenity_ids[1]])
+            self.assertEqual(missing, ["inconnue"])
+        with self.app.app_context(), self.assert_max_queries(0):
+            self.assertEqual(facade.amenity_repo.get_many([]), ([], []))
+
+    def test_creation_avec_20_amenities(self):
+        """POST /places/ avec 20 amenities : 4 requêtes, sans SAWarning."""
+        import warnings
+        from sqlalchemy.exc import SAWarning
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", SAWarning)
+            with self.assert_max_queries(4, status=201):
+                place_id = self._create_place(self.john_token,
+                                              amenities=self.amenity_ids)
+        self.assertEqual(self._amenity_ids(place_id), set(self.amenity_ids))
+
+    def test_amenity_inconnue(self):
+        """Amenity inconnue → 400, rien n'est créé ni modifié."""
+        r = self.client.post('/api/v1/places/', json={
+            "title": "Studio", "price": 50, "latitude": 45.0,
+            "longitude": 6.0,
+            "amenities": [self.amenity_ids[0], "inconnue", "absente"],
+        }, headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 400)
+        # Toutes les amenities manquantes sont nommées
+        self.assertEqual(r.get_json()["error"],
+                         "Amenities inconnue, absente not found")
+
+        place_id = self._create_place(self.john_token,
+                                      amenities=self.amenity_ids[:2])
+        r = self.client.put(f'/api/v1/places/{place_id}',
+                            json={"title": "Renommé",
+                                  "amenities": ["inconnue"]},
+                            headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(self._amenity_ids(place_id),
+                         set(self.amenity_ids[:2]))
+
+    def test_mise_a_jour_ecrit_le_diff(self):
+        """PUT amenities : seuls les liens retirés / ajoutés sont écrits."""
+        place_id = self._create_place(self.john_token,
+                                      amenities=self.amenity_ids[:10])
+        wanted = self.amenity_ids[5:15]
+        with self.assert_max_queries(6, status=200) as statements:
+            r = self.client.put(f'/api/v1/places/{place_id}',
+                                json={"amenities": wanted},
+                                headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self._amenity_ids(place_id), set(wanted))
+        writes = [s for s in statements if "place_amenity" in s
+                  and s.lstrip().upper().startswith(("INSERT", "DELETE"))]
+        # Un DELETE et un INSERT groupés (executemany), rien pour les 5 gardées
+        self.assertEqual(len(writes), 2, writes)
+
+
+# =============================================================================
+# SECTION 21 — RELATIONS WRITE-ONLY (aucune collection chargée en entier)
+# =============================================================================
+
+class TestWriteOnlyRelations(TestBase):
+    """User.places, User.reviews, Place.reviews : ajout sans chargement."""
+
+    def setUp(self):
+        super().setUp()
+        from app.services import facade
+        self.john_id, _ = self._create_user("john@test.com")
+        self.jane_id, self.jane_token = self._create_user("jane@test.com")
+        with self.app.app_context():
+            self.place_ids = [p.id for p in facade.create_places_bulk([
+                {"title": f"Place {i}", "price": 10, "latitude": 45.0,
+                 "longitude": 6.0, "owner_id": self.john_id}
+                for i in range(25)])]
+        for place_id in self.place_ids[:3]:
+            self._create_review(self.jane_token, place_id)
+
+    def test_ajout_sans_charger_la_collection(self):
+        """add_place / add_review : aucun SELECT des places ou reviews."""
+        from app.models.place import Place
+        from app.models.review import Review
+        from app.persistence.unit_of_work import unit_of_work
+        from app.services import facade
+        with self.app.app_context(), unit_of_work():
+            john = facade.get_user(self.john_id)
+            jane = facade.get_user(self.jane_id)
+            place = facade.get_place(self.place_ids[10])
+            with self.assert_max_queries(6) as statements:
+                john.add_place(Place(title="Nouvelle", price=20,
+                                     latitude=0, longitude=0))
+                review = Review(text="Bien", rating=4, place_id=place.id)
+                jane.add_review(review)
+                place.add_review(review)
+            selects = [s for s in statements
+                       if s.lstrip().upper().startswith("SELECT")]
+            self.assertEqual(selects, [])
+            self.assertEqual(len(john.places_page(limit=100)[0]), 26)
+
+    def test_pages(self):
+        """places_page / reviews_page : pagination par curseur en SQL."""
+        from app.services import facade
+        with self.app.app_context():
+            john = facade.get_user(self.john_id)
+            first, cursor = john.places_page(limit=20)
+            second, end = john.places_page(after=cursor, limit=20)
+            self.assertEqual(len(first), 20)
+            self.assertEqual(len(second), 5)
+            self.assertIsNone(end)
+            self.assertEqual({p.id for p in first + second},
+                             set(self.place_ids))
+
+            jane = facade.get_user(self.jane_id)
+            reviews, _ = jane.reviews_page()
+            self.assertEqual({r.place_id for r in reviews},
+                             set(self.place_ids[:3]))
+            place = facade.get_place(self.place_ids[0])
+            self.assertEqual([r.user_id for r in place.reviews_page()[0]],
+                             [self.jane_id])
+
+    def test_suppression_sans_charger_les_reviews(self):
+        """DELETE place : les reviews partent par ON DELETE CASCADE."""
+        john_token = self._login("john@test.com", "pass1234")
+        with self.assert_max_queries(20, status=200) as statements:
+            r = self.client.delete(f'/api/v1/places/{self.place_ids[0]}',
+                                   headers=self._auth(john_token))
+        self.assertEqual(r.status_code, 200)
+        self.assertFalse([s for s in statements if "FROM reviews" in s],
+                         statements)
+        with self.app.app_context():
+            jane = db.session.get(User, self.jane_id)
+            self.assertEqual(len(jane.reviews_page()[0]), 2)
+
+
+# =============================================================================
+# SECTION 22 — SUPPRESSIONS EN CASCADE CÔTÉ BASE (passive_deletes)
+# =============================================================================
+
+class TestPassiveDeletes(TestBase):
+    """ON DELETE CASCADE : les enfants ne sont jamais chargés par l'ORM."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin_token = self._login("admin@hbnb.io", "admin1234")
+        self.john_id, self.john_token = self._create_user("john@test.com")
+        self.jane_id, self.jane_token = self._create_user("jane@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+        self.john_place = self._create_place(
+            self.john_token, "Loft de John", amenities=[self.amenity_id])
+        self.jane_place = self._create_place(self.jane_token, "Chalet")
+        self._create_review(self.jane_token, self.john_place, rating=2)
+        self._create_review(self.john_token, self.jane_place, rating=4)
+
+    def _rows(self, table):
+        with self.app.app_context():
+            return db.session.execute(
+                db.text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+    def test_supprimer_user_supprime_places_et_reviews(self):
+        """DELETE user : ses places, leurs reviews et ses reviews partent."""
+        with self.assert_max_queries(12, status=200) as statements:
+            r = self.client.delete(f'/api/v1/users/{self.john_id}',
+                                   headers=self._auth(self.admin_token))
+        self.assertEqual(r.status_code, 200)
+        # Seuls les place_id des reviews de John sont lus
+        loads = [s for s in statements if "reviews.text" in s
+                 or "places.title" in s or "FROM place_amenity" in s]
+        self.assertEqual(loads, [])
+        self.assertEqual(self._rows("places"), 1)
+        self.assertEqual(self._rows("reviews"), 0)
+        self.assertEqual(self._rows("place_amenity"), 0)
+
+    def test_notes_recalculees_apres_suppression_user(self):
+        """Les agrégats des places notées par le user supprimé sont remis à zéro."""
+        self.client.delete(f'/api/v1/users/{self.john_id}',
+                           headers=self._auth(self.admin_token))
+        data = self.client.get(f'/api/v1/places/{self.jane_place}').get_json()
+        self.assertEqual(data["review_count"], 0)
+        self.assertIsNone(data["average_rating"])
+
+    def test_supprimer_place_et_amenity(self):
+        """DELETE place / amenity : liens et reviews supprimés par la base."""
+        with self.assert_max_queries(10, status=200) as statements:
+            r = self.client.delete(f'/api/v1/places/{self.john_place}',
+                                   headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 200)
+        self.assertFalse([s for s in statements if "FROM reviews" in s
+                          or "FROM place_amenity" in s], statements)
+        self.assertEqual(self._rows("reviews"), 1)
+        self.assertEqual(self._rows("place_amenity"), 0)
+
+        place_id = self._create_place(self.jane_token, "Studio",
+                                      amenities=[self.amenity_id])
+        r = self.client.delete(f'/api/v1/amenities/{self.amenity_id}',
+                               headers=self._auth(self.admin_token))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self._rows("place_amenity"), 0)
+        r = self.client.get(f'/api/v1/places/{place_id}')
+        self.assertEqual(r.get_json()["amenities"], [])
+
+
+# =============================================================================
+# SECTION 23 — PROJECTIONS DES LISTES ET COLONNES DIFFÉRÉES
+# =============================================================================
+
+class TestProjections(TestBase):
+    """Les listes ne lisent que leurs colonnes, jamais d'entités complètes."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        self.place_id = self._create_place(self.john_token, "Loft")
+        self.review_id = self._create_review(
+            self.jane_token, self.place_id, rating=4).get_json()["id"]
+
+    def test_listes_sans_colonnes_inutiles(self):
+        """Ni mot de passe, ni description lus par les listes."""
+        unread = {
+            '/api/v1/users/': "users.password",
+            '/api/v1/places/?sort=rating': "places.description",
+            '/api/v1/places/?min_price=10': "places.rating_sum",
+        }
+        for url, column in unread.items():
+            with self.subTest(url=url), \
+                    self.assert_max_queries(2, status=200) as statements:
+                r = self.client.get(url)
+            self.assertEqual(r.status_code, 200)
+            self.assertNotIn(column, " ".join(statements))
+
+        data = self.client.get('/api/v1/places/').get_json()
+        self.assertEqual(data[0]["title"], "Loft")
+        self.assertEqual(data[0]["average_rating"], 4.0)
+        reviews = self.client.get(
+            f'/api/v1/places/{self.place_id}/reviews').get_json()
+        self.assertEqual(reviews[0]["text"], "Super endroit !")
+
+    def test_pagination_des_projections(self):
+        """Le curseur des lignes projetées donne la page suivante."""
+        self._create_place(self.jane_token, "Chalet", price=80)
+        seen = []
+        url = '/api/v1/places/?sort=rating&limit=1'
+        while url:
+            r = self.client.get(url)
+            seen += [p["title"] for p in r.get_json()]
+            link = r.headers.get("Link")
+            url = link[1:link.index(">")] if link else None
+        self.assertEqual(seen, ["Loft", "Chalet"])
+
+    def test_colonnes_differees(self):
+        """description / text : chargées à l'accès, ou avec load=[...]."""
+        from app.models.place import Place
+        from app.models.review import Review
+        from app.services import facade
+        with self.app.app_context():
+            db.session.expunge_all()
+            place = facade.get_place(self.place_id)
+            self.assertNotIn("description", place.__dict__)
+            with self.assert_max_queries(1):
+                self.assertEqual(place.description, "Nice place for testing")
+
+            db.session.expunge_all()
+            with self.assert_max_queries(1):
+                review = facade.get_review(self.review_id, load=["text"])
+                self.assertEqual(review.text, "Super endroit !")
+            self.assertIsInstance(review, Review)
+            self.assertIsInstance(place, Place)
+
+        with self.assert_max_queries(2, status=200):
+            r = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(r.get_json()["description"], "Nice place for testing")
+
+    def test_projection_en_memoire(self):
+        """InMemoryRepository.get_all_columns : tuples nommés paginés."""
+        from app.persistence import InMemoryRepository
+        repo = InMemoryRepository()
+        users = [User(first_name=name, last_name="Doe",
+                      email=f"{name.lower()}@test.com")
+                 for name in ("John", "Jane")]
+        repo.add_many(users)
+        rows, cursor = repo.get_all_columns(("id", "first_name"), limit=1)
+        self.assertEqual(rows[0]._fields, ("id", "first_name"))
+        rows, cursor = repo.get_all_columns(
+            ("id", "first_name"), after=cursor, limit=1)
+        self.assertEqual([r.first_name for r in rows], ["Jane"])
+        self.assertIsNone(cursor)
+
+
+# =============================================================================
+# SECTION 24 — GET CONDITIONNELS (ETag / Last-Modified, 304)
+# =============================================================================
+
+class TestConditionalGet(TestBase):
+    """If-None-Match / If-Modified-Since : 304 sans charger la ressource."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin_token = self._login("admin@hbnb.io", "admin1234")
+        self.john_id, self.john_token = self._create_user("john@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+        self.place_id = self._create_place(
+            self.john_token, "Loft", amenities=[self.amenity_id])
+
+    def _revalidate(self, url, response):
+        """Renvoie les validateurs d'une réponse, comme un navigateur."""
+        return self.client.get(
+            url, headers={'If-None-Match': response.headers['ETag']})
+
+    def test_details_304_sans_chargement(self):
+        """Place / user / amenity / review : 304 vide, au plus 1 requête."""
+        review_id = self._create_review(
+            self.jane_token, self.place_id).get_json()["id"]
+        for url, table in ((f'/api/v1/places/{self.place_id}', "places"),
+                           (f'/api/v1/users/{self.john_id}', "users"),
+                           (f'/api/v1/amenities/{self.amenity_id}', "amenities"),
+                           (f'/api/v1/reviews/{review_id}', "reviews")):
+            with self.subTest(url=url):
+                r = self.client.get(url)
+                self.assertEqual(r.status_code, 200)
+                self.assertEqual(r.headers['Cache-Control'], 'no-cache')
+                self.assertIn('Last-Modified', r.headers)
+                with self.assert_max_queries(1, status=304) as statements:
+                    cached = self._revalidate(url, r)
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached.data, b'')
+                self.assertEqual(cached.headers['ETag'], r.headers['ETag'])
+                # Seuls des updated_at sont lus
+                self.assertFalse([s for s in statements
+                                  if f"{table}.id AS" in s], statements)
+                r = self.client.get(url, headers={
+                    'If-Modified-Since': r.headers['Last-Modified']})
+                self.assertEqual(r.status_code, 304)
+
+    def test_etag_place_suit_ses_dependances(self):
+        """Review, amenity renommée, owner modifié : nouvel ETag."""
+        url = f'/api/v1/places/{self.place_id}'
+        r = self.client.get(url)
+        writes = [
+            lambda: self._create_review(self.jane_token, self.place_id),
+            lambda: self.client.put(
+                f'/api/v1/amenities/{self.amenity_id}', json={"name": "Fibre"},
+                headers=self._auth(self.admin_token)),
+            lambda: self.client.put(
+                f'/api/v1/users/{self.john_id}', json={"first_name": "Jo"},
+                headers=self._auth(self.john_token)),
+        ]
+        for write in writes:
+            write()
+            changed = self._revalidate(url, r)
+            self.assertEqual(changed.status_code, 200)
+            self.assertNotEqual(changed.headers['ETag'], r.headers['ETag'])
+            r = changed
+        self.assertEqual(r.get_json()["owner"]["first_name"], "Jo")
+
+    def test_collections(self):
+        """Listes : ETag par URL, changé par un ajout ou une suppression."""
+        r = self.client.get('/api/v1/places/')
+        self.assertEqual(self._revalidate('/api/v1/places/', r).status_code,
+                         304)
+        other = self.client.get('/api/v1/places/?limit=5')
+        self.assertNotEqual(other.headers['ETag'], r.headers['ETag'])
+
+        place_id = self._create_place(self.jane_token, "Chalet")
+        self.assertEqual(self._revalidate('/api/v1/places/', r).status_code,
+                         200)
+        r = self.client.get('/api/v1/places/')
+        self.client.delete(f'/api/v1/places/{place_id}',
+                           headers=self._auth(self.jane_token))
+        changed = self._revalidate('/api/v1/places/', r)
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.get_json()), 1)
+
+    def test_ressource_absente(self):
+        """If-None-Match: * sur une ressource absente : 404, pas 304."""
+        for url in ('/api/v1/places/inconnu', '/api/v1/users/inconnu'):
+            with self.subTest(url=url):
+                r = self.client.get(url, headers={'If-None-Match': '*'})
+                self.assertEqual(r.status_code, 404)
+
+
+
+# =============================================================================
+# SECTION 25 — CACHE DE RÉPONSES (JSON sérialisé, invalidé par tags)
+# =============================================================================
+
+class ResponseCacheConfig(TestingConfig):
+    """Cache de réponses activé (désactivé dans TestingConfig)."""
+    RESPONSE_CACHE_MAX_BYTES = 1024 * 1024
+
+
+class TestConditionalGetCached(TestConditionalGet):
+    """Mêmes tests, réponses servies par le cache."""
+
+    config_class = ResponseCacheConfig
+
+
+class TestResponseCache(TestBase):
+    """GET publics servis depuis des octets en cache, sans SQL."""
+
+    config_class = ResponseCacheConfig
+
+    def setUp(self):
+        super().setUp()
+        self.admin_token = self._login("admin@hbnb.io", "admin1234")
+        self.john_id, self.john_token = self._create_user("john@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+        self.place_id = self._create_place(
+            self.john_token, "Loft", amenities=[self.amenity_id])
+
+    def _stats(self):
+        r = self.client.get('/api/v1/stats/response-cache',
+                            headers=self._auth(self.admin_token))
+        self.assertEqual(r.status_code, 200)
+        return r.get_json()
+
+    def test_miss_puis_hit_sans_requete(self):
+        """1er GET : MISS ; suivants : HIT, mêmes octets, 0 requête."""
+        for url in (f'/api/v1/places/{self.place_id}',
+                    f'/api/v1/places/{self.place_id}/reviews',
+                    '/api/v1/places/?sort=price',
+                    '/api/v1/amenities/'):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.headers['X-Cache'], 'MISS')
+                with self.assert_max_queries(0, status=200):
+                    hit = self.client.get(url)
+                self.assertEqual(hit.status_code, 200)
+                self.assertEqual(hit.headers['X-Cache'], 'HIT')
+                self.assertEqual(hit.data, first.data)
+                self.assertEqual(hit.headers['ETag'], first.headers['ETag'])
+
+    def test_hit_conditionnel_304(self):
+        """ETag encore valide : 304 vide depuis le cache."""
+        url = f'/api/v1/places/{self.place_id}'
+        r = self.client.get(url)
+        with self.assert_max_queries(0, status=304):
+            cached = self.client.get(
+                url, headers={'If-None-Match': r.headers['ETag']})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.data, b'')
+
+    def test_invalidation_par_tags(self):
+        """Review, place, amenity, owner modifiés : réponse reconstruite."""
+        detail = f'/api/v1/places/{self.place_id}'
+        writes = [
+            (lambda: self._create_review(self.jane_token, self.place_id),
+             lambda p: p["review_count"] == 1),
+            (lambda: self.client.put(
+                detail, json={"title": "Grand Loft"},
+                headers=self._auth(self.john_token)),
+             lambda p: p["title"] == "Grand Loft"),
+            (lambda: self.client.put(
+                f'/api/v1/amenities/{self.amenity_id}', json={"name": "Fibre"},
+                headers=self._auth(self.admin_token)),
+             lambda p: p["amenities"][0]["name"] == "Fibre"),
+            (lambda: self.client.put(
+                f'/api/v1/users/{self.john_id}', json={"first_name": "Jo"},
+                headers=self._auth(self.john_token)),
+             lambda p: p["owner"]["first_name"] == "Jo"),
+        ]
+        for write, check in writes:
+            self.client.get(detail)
+            self.assertEqual(self.client.get(detail).headers['X-Cache'], 'HIT')
+            write()
+            r = self.client.get(detail)
+            self.assertEqual(r.headers['X-Cache'], 'MISS')
+            self.assertTrue(check(r.get_json()), r.get_json())
+
+    def test_listes_invalidees(self):
+        """Ajout / suppression : les pages de liste sont reconstruites."""
+        reviews = f'/api/v1/places/{self.place_id}/reviews'
+        self.client.get('/api/v1/places/')
+        self.client.get(reviews)
+        place_id = self._create_place(self.jane_token, "Chalet")
+        self.assertEqual(len(self.client.get('/api/v1/places/').get_json()), 2)
+        review_id = self._create_review(
+            self.jane_token, self.place_id).get_json()["id"]
+        self.assertEqual(len(self.client.get(reviews).get_json()), 1)
+        self.client.delete(f'/api/v1/reviews/{review_id}',
+                           headers=self._auth(self.jane_token))
+        self.assertEqual(self.client.get(reviews).get_json(), [])
+        self.client.delete(f'/api/v1/places/{place_id}',
+                           headers=self._auth(self.jane_token))
+        self.assertEqual(len(self.client.get('/api/v1/places/').get_json()), 1)
+
+    def test_suppression_owner(self):
+        """Owner supprimé : ses places disparaissent du cache."""
+        detail = f'/api/v1/places/{self.place_id}'
+        self.client.get(detail)
+        self.client.get(f'{detail}/reviews')
+        self.client.delete(f'/api/v1/users/{self.john_id}',
+                           headers=self._auth(self.admin_token))
+        self.assertEqual(self.client.get(detail).status_code, 404)
+        self.assertEqual(self.client.get(f'{detail}/reviews').status_code, 404)
+
+    def test_rollback_ne_cache_pas_de_donnees_fantomes(self):
+        """Écriture refusée : le cache resservira les données inchangées."""
+        detail = f'/api/v1/places/{self.place_id}'
+        self.client.get(detail)
+        r = self.client.put(detail, json={"price": -5},
+                            headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(self.client.get(detail).get_json()["price"], 50.0)
+
+    def test_eviction_et_stats(self):
+        """Cache borné en octets : les entrées les plus anciennes sortent."""
+        from app.services import response_cache
+        self.app.config['RESPONSE_CACHE_MAX_BYTES'] = 2048
+        response_cache.init_app(self.app)
+        for limit in range(1, 21):
+            self.client.get(f'/api/v1/amenities/?limit={limit}')
+        stats = self._stats()
+        self.assertLessEqual(stats["size_bytes"], 2048)
+        self.assertGreater(stats["evictions"], 0)
+        self.assertEqual(stats["misses"], 20)
+        self.assertEqual(
+            self.client.get('/api/v1/amenities/?limit=20').headers['X-Cache'],
+            'HIT')
+        self.assertEqual(
+            self.client.get('/api/v1/amenities/?limit=1').headers['X-Cache'],
+            'MISS')
+
+        r = self.client.delete('/api/v1/stats/response-cache',
+                               headers=self._auth(self.admin_token))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self._stats()["entries"], 0)
+        r = self.client.get('/api/v1/stats/response-cache',
+                            headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 403)
+
+
+
+# =============================================================================
+# SECTION 26 — DÉTAIL COMPOSÉ (?include=reviews,review_authors)
+# =============================================================================
+
+class TestPlaceInclude(TestBase):
+    """Une seule requête HTTP pour la page place, requêtes SQL en nombre fixe."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+        self.place_id = self._create_place(
+            self.john_token, "Loft", amenities=[self.amenity_id])
+        self.url = (f'/api/v1/places/{self.place_id}'
+                    '?include=reviews,owner,amenities,review_authors')
+
+    def _add_reviews(self, n, start=0):
+        reviewers = []
+        for i in range(start, start + n):
+            user_id, token = self._create_user(
+                f"guest{i}@test.com", first_name=f"Guest{i}")
+            self._create_review(token, self.place_id, f"Avis {i}", 4)
+            reviewers.append((user_id, token))
+        return reviewers
+
+    def test_tout_en_une_reponse(self):
+        """Place, owner, amenities, reviews et noms des auteurs."""
+        self._add_reviews(2)
+        r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 200)
+        data = r.get_json()
+        self.assertEqual(data["owner"]["email"], "john@test.com")
+        self.assertEqual([a["name"] for a in data["amenities"]], ["WiFi"])
+        self.assertEqual([rv["text"] for rv in data["reviews"]],
+                         ["Avis 0", "Avis 1"])
+        self.assertEqual([rv["user"]["first_name"] for rv in data["reviews"]],
+                         ["Guest0", "Guest1"])
+        # Pas d'email des auteurs dans un endpoint public
+        self.assertNotIn("email", data["reviews"][0]["user"])
+        self.assertIsNone(data["reviews_next"])
+
+        # Sans review_authors : reviews seules ; sans include : inchangé
+        data = self.client.get(
+            f'/api/v1/places/{self.place_id}?include=reviews').get_json()
+        self.assertNotIn("user", data["reviews"][0])
+        data = self.client.get(f'/api/v1/places/{self.place_id}').get_json()
+        self.assertNotIn("reviews", data)
+        self.assertEqual(data["owner"]["email"], "john@test.com")
+
+    def test_nombre_de_requetes_fixe(self):
+        """1 ou 12 reviews : même nombre de requêtes SQL (pas de N+1)."""
+        self._add_reviews(1)
+        with self.assert_max_queries(5, status=200) as few:
+            self.client.get(self.url)
+        self._add_reviews(11, start=1)
+        with self.assert_max_queries(5, status=200) as many:
+            r = self.client.get(self.url + '&reviews_limit=20')
+        self.assertEqual(len(r.get_json()["reviews"]), 12)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(
+            len([s for s in many if "FROM users" in s and " IN (" in s]), 1)
+
+    def test_reviews_paginees(self):
+        """reviews_limit / reviews_next : toutes les reviews, sans doublon."""
+        self._add_reviews(5)
+        texts, url = [], self.url + '&reviews_limit=2'
+        while url:
+            data = self.client.get(url).get_json()
+            self.assertLessEqual(len(data["reviews"]), 2)
+            self.assertEqual(data["title"], "Loft")
+            texts += [rv["text"] for rv in data["reviews"]]
+            url = data["reviews_next"]
+        self.assertEqual(texts, [f"Avis {i}" for i in range(5)])
+
+    def test_parametres_invalides(self):
+        """include inconnu, reviews_limit ou curseur invalide : 400."""
+        base = f'/api/v1/places/{self.place_id}'
+        for query in ('?include=reviews,photos', '?include=reviews&reviews_limit=0',
+                      '?include=reviews&reviews_after=pas-un-curseur'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(base + query).status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/v1/places/inconnu?include=reviews').status_code,
+            404)
+
+    def test_etag_suit_reviews_et_auteurs(self):
+        """Texte d'une review ou nom d'un auteur modifié : nouvel ETag."""
+        (user_id, token), = self._add_reviews(1)
+        review_id = self.client.get(self.url).get_json()["reviews"][0]["id"]
+        r = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, headers={
+            'If-None-Match': r.headers['ETag']}).status_code, 304)
+        other_page = self.client.get(self.url + '&reviews_limit=1')
+        self.assertNotEqual(other_page.headers['ETag'], r.headers['ETag'])
+
+        writes = [
+            (lambda: self.client.put(
+                f'/api/v1/reviews/{review_id}', json={"text": "Mis à jour", "rating": 4},
+                headers=self._auth(token)),
+             lambda data: data["reviews"][0]["text"] == "Mis à jour"),
+            (lambda: self.client.put(
+                f'/api/v1/users/{user_id}', json={"first_name": "Renamed"},
+                headers=self._auth(token)),
+             lambda data: data["reviews"][0]["user"]["first_name"] == "Renamed"),
+        ]
+        for write, check in writes:
+            self.assertEqual(write().status_code, 200)
+            changed = self.client.get(self.url, headers={
+                'If-None-Match': r.headers['ETag']})
+            self.assertEqual(changed.status_code, 200)
+            self.assertTrue(check(changed.get_json()), changed.get_json())
+            r = changed
+
+
+class TestPlaceIncludeCached(TestPlaceInclude):
+    """Mêmes tests, réponses servies par le cache."""
+
+    config_class = ResponseCacheConfig
+
+
+
+# =============================================================================
+# SECTION 27 — CHAMPS À LA CARTE (?fields=)
+# =============================================================================
+
+class TestSparseFieldsets(TestBase):
+    """?fields= : clés de la réponse ET colonnes / relations lues en SQL."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin_token = self._login("admin@hbnb.io", "admin1234")
+        _, self.john_token = self._create_user("john@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        self.amenity_id = self._create_amenity("WiFi")
+        self.place_id = self._create_place(
+            self.john_token, "Loft lac", amenities=[self.amenity_id])
+        self.review_id = self._create_review(
+            self.jane_token, self.place_id).get_json()["id"]
+
+    def _get(self, url):
+        with self.assert_max_queries(5, status=200) as statements:
+            r = self.client.get(url)
+        self.assertEqual(r.status_code, 200, r.get_json())
+        return r.get_json(), " ".join(statements)
+
+    def test_listes_projetees(self):
+        """Listes : seules les colonnes demandées (+ clés de tri) sont lues."""
+        cases = [
+            ('/api/v1/places/?fields=id,title,price', ["id", "title", "price"],
+             ["places.latitude", "places.description", "rating_average"]),
+            ('/api/v1/places/?fields=average_rating', ["average_rating"],
+             ["places.title", "places.price"]),
+            ('/api/v1/users/?fields=first_name', ["first_name"],
+             ["users.email", "users.password"]),
+            ('/api/v1/reviews/?fields=rating', ["rating"], ["reviews.text"]),
+            (f'/api/v1/places/{self.place_id}/reviews?fields=id,user_id',
+             ["id", "user_id"], ["reviews.text", "reviews.rating"]),
+            ('/api/v1/amenities/?fields=name', ["name"],
+             ["amenities.description"]),
+        ]
+        for url, keys, unread in cases:
+            with self.subTest(url=url):
+                data, sql = self._get(url)
+                self.assertTrue(data)
+                self.assertEqual(list(data[0]), keys)
+                for column in unread:
+                    self.assertNotIn(column, sql)
+
+    def test_detail_place_sans_relations(self):
+        """Détail place : owner, amenities, description chargés à la demande."""
+        from app.services import facade
+        facade.clear_caches()
+        data, sql = self._get(
+            f'/api/v1/places/{self.place_id}?fields=id,title,price')
+        self.assertEqual(data, {"id": self.place_id, "title": "Loft lac",
+                                "price": 50.0})
+        self.assertNotIn("place_amenity", sql)
+        self.assertNotIn("users", sql)
+        self.assertNotIn("places.description", sql)
+
+        data, sql = self._get(
+            f'/api/v1/places/{self.place_id}?fields=title,amenities')
+        self.assertEqual(data["amenities"][0]["name"], "WiFi")
+        self.assertNotIn("owner", data)
+        self.assertNotIn("users", sql)
+
+        data, _ = self._get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(data["owner"]["email"], "john@test.com")
+        self.assertEqual(data["description"], "Nice place for testing")
+
+    def test_details_et_recherches(self):
+        """Autres détails, recherche plein texte et nearby."""
+        data, sql = self._get(
+            f'/api/v1/reviews/{self.review_id}?fields=id,rating')
+        self.assertEqual(data, {"id": self.review_id, "rating": 5})
+        self.assertNotIn("reviews.text", sql)
+        data, _ = self._get(f'/api/v1/amenities/{self.amenity_id}?fields=name')
+        self.assertEqual(data, {"name": "WiFi"})
+
+        data, sql = self._get('/api/v1/places/search?q=loft&fields=id,snippet')
+        self.assertEqual(list(data[0]), ["id", "snippet"])
+        self.assertNotIn("places.title", sql)
+        data, sql = self._get(
+            '/api/v1/places/nearby?lat=45&lon=6&fields=title,distance_km')
+        self.assertEqual(data, [{"title": "Loft lac", "distance_km": 0.0}])
+        self.assertNotIn("places.price", sql)
+
+    def test_champs_invalides(self):
+        """Champ inconnu ou liste vide : 400 sur chaque endpoint."""
+        for url in ('/api/v1/places/', f'/api/v1/places/{self.place_id}',
+                    '/api/v1/places/search?q=loft', '/api/v1/users/',
+                    f'/api/v1/reviews/{self.review_id}', '/api/v1/amenities/',
+                    f'/api/v1/places/{self.place_id}/reviews'):
+            for fields in ('password', ',,'):
+                with self.subTest(url=url, fields=fields):
+                    separator = '&' if '?' in url else '?'
+                    r = self.client.get(f'{url}{separator}fields={fields}')
+                    self.assertEqual(r.status_code, 400)
+                    self.assertIn("error", r.get_json())
+
+    def test_etag_par_jeu_de_champs(self):
+        """Chaque jeu de champs a son ETag ; 304 quand il est inchangé."""
+        url = f'/api/v1/places/{self.place_id}'
+        full = self.client.get(url)
+        light = self.client.get(url + '?fields=id,title')
+        self.assertNotEqual(light.headers['ETag'], full.headers['ETag'])
+        self.assertEqual(self.client.get(url + '?fields=id,title', headers={
+            'If-None-Match': light.headers['ETag']}).status_code, 304)
+        # Sans owner dans les champs, modifier l'owner ne change rien
+        owner_id = full.get_json()["owner"]["id"]
+        self.client.put(f'/api/v1/users/{owner_id}', json={"first_name": "Jo"},
+                        headers=self._auth(self.john_token))
+        self.assertEqual(self.client.get(url + '?fields=id,title', headers={
+            'If-None-Match': light.headers['ETag']}).status_code, 304)
+        self.assertEqual(self.client.get(url, headers={
+            'If-None-Match': full.headers['ETag']}).status_code, 200)
+
+
+
+# =============================================================================
+# SECTION 28 — SÉRIALISEURS COMPILÉS (registre, orjson / json)
+# =============================================================================
+
+class TestSerializers(TestBase):
+    """Registre (modèle, vue) : fonctions de dump générées, encodeur commun."""
+
+    def setUp(self):
+        super().setUp()
+        _, self.john_token = self._create_user("john@test.com")
+        _, self.jane_token = self._create_user("jane@test.com")
+        self.place_id = self._create_place(self.john_token, "Loft lac")
+
+    def test_registre(self):
+        """Chaque vue est enregistrée une fois ; doublon refusé."""
+        from app.api.v1 import serializers
+        from app.api.v1.fieldsets import Fieldset, column
+        views = serializers.views()
+        for view in [('Place', 'list'), ('Place', 'detail'),
+                     ('Place', 'created'), ('Review', 'embedded'),
+                     ('User', 'detail'), ('Amenity', 'detail')]:
+            self.assertIn(view, views)
+        with self.assertRaises(ValueError):
+            serializers.register('Place', 'list', Fieldset({'id': column('id')}))
+        with self.assertRaises(KeyError):
+            serializers.get('Place', 'inconnue')
+
+    def test_dump_compile(self):
+        """Le code généré donne le même résultat que les getters des champs."""
+        from collections import namedtuple
+        from app.api.v1.fieldsets import Field, Fieldset, column
+        Row = namedtuple("Row", ["id", "price", "inner"])
+        fieldset = Fieldset({
+            'id': column('id'),
+            'price': column('price'),
+            'double': Field(('price',), lambda r: r.price * 2),
+            'nested': column('nested', 'inner.id'),
+        })
+        rows = [Row("a", 10, Row("x", 0, None)), Row("b", 20, Row("y", 0, None))]
+        expected = [{name: field.get(row)
+                     for name, field in fieldset.fields.items()}
+                    for row in rows]
+        self.assertEqual(fieldset.dump_many(rows), expected)
+        self.assertEqual(fieldset.dump(rows[0]), expected[0])
+        self.assertEqual(fieldset.dump_many(rows, ('double',)),
+                         [{'double': 20}, {'double': 40}])
+        # Une seule compilation par jeu de champs
+        self.assertIs(fieldset.dumper(('id',)), fieldset.dumper(('id',)))
+        with self.assertRaises(ValueError):
+            column('id', 'id; import os')
+
+    def test_dumps_orjson_et_json(self):
+        """orjson ou json (repli) : même JSON, compact, UTF-8."""
+        import json
+        from unittest import mock
+        from app.api.v1 import serializers
+        data = [{"title": "Chalet été", "price": 50.5, "tags": None,
+                 "histogram": {1: 0, 5: 2}}]
+        with mock.patch.object(serializers, "orjson", None):
+            fallback = serializers.dumps(data)
+        self.assertEqual(json.loads(serializers.dumps(data)),
+                         json.loads(fallback))
+        self.assertIn("été".encode(), fallback)
+        self.assertNotIn(b", ", fallback)
+
+    def test_dumps_valeurs_non_finies(self):
+        """NaN / infini → null, avec orjson comme avec le repli json."""
+        from unittest import mock
+        from app.api.v1 import serializers
+        data = {"price": float("nan"), "scores": [float("inf"), 1.5],
+                "place": {"rating": -float("inf")}}
+        expected = b'{"price":null,"scores":[null,1.5],"place":{"rating":null}}'
+        with mock.patch.object(serializers, "orjson", None):
+            self.assertEqual(serializers.dumps(data), expected)
+        if serializers.orjson is not None:
+            self.assertEqual(serializers.dumps(data), expected)
+
+    def test_reponses(self):
+        """Réponses d'écriture et reviews intégrées : mêmes clés qu'avant."""
+        r = self.client.post('/api/v1/places/', json={
+            "title": "Studio", "price": 80, "latitude": 1.0,
+            "longitude": 2.0, "amenities": []},
+            headers=self._auth(self.john_token))
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual(r.content_type, "application/json")
+        self.assertEqual(list(r.get_json()), [
+            "id", "title", "description", "price", "latitude", "longitude",
+            "owner_id"])
+
+        r = self._create_review(self.jane_token, self.place_id)
+        self.assertEqual(list(r.get_json()),
+                         ["id", "text", "rating", "user_id", "place_id"])
+
+        url = f'/api/v1/places/{self.place_id}?include=reviews'
+        review = self.client.get(url).get_json()["reviews"][0]
+        self.assertEqual(list(review), ["id", "text", "rating", "user_id"])
+        review = self.client.get(
+            url + ',review_authors').get_json()["reviews"][0]
+        self.assertEqual(list(review["user"]), ["id", "first_name", "last_name"])
+
+        r = self.client.get('/api/v1/places/inconnu')
+        self.assertEqual(r.status_code, 404)
+        self.assertEqual(r.get_json(), {"error": "Place not found"})
+
+
 if __name__ == "__main__":
-    unittest.main(verbosity=2)
\ No newline at end of file
+    unittest.main(verbosity=2)
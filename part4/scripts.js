@@ -17,9 +17,19 @@
 
 const API_URL = 'http://127.0.0.1:5000/api/v1';
 
-/* Toutes les places chargées — pour filtre local sans re-fetch */
+/* Places chargées (filtrées et recherchées côté API) */
 let allPlaces = [];
 
+/* Taille des pages demandées aux listes de l'API (son maximum) */
+const PAGE_SIZE = 100;
+
+/* URL de la page suivante des places (header Link), null sur la dernière */
+let nextPlacesUrl = null;
+
+/* Délai avant d'interroger l'API pendant la saisie de la recherche */
+const SEARCH_DEBOUNCE_MS = 250;
+let searchTimer = null;
+
 // ============================================================
 // ICÔNES DES AMENITIES — Emoji par nom
 // ============================================================
@@ -85,6 +95,31 @@ function getPlacePhoto(placeId) {
   getCookie(name)
   Lit un cookie par son nom depuis document.cookie.
 */
+/*
+  nextPageUrl(response)
+  URL de la page suivante d'une liste (header Link rel="next"), ou null.
+*/
+function nextPageUrl(response) {
+    const match = (response.headers.get('Link') || '').match(/<([^>]+)>;\s*rel="next"/);
+    return match ? match[1] : null;
+}
+
+/*
+  fetchAllPages(url, headers)
+  Suit les liens rel="next" et renvoie tous les éléments de la liste,
+  ou null si une page échoue.
+*/
+async function fetchAllPages(url, headers) {
+    const items = [];
+    while (url) {
+        const res = await fetch(url, { headers });
+        if (!res.ok) return null;
+        items.push(...await res.json());
+        url = nextPageUrl(res);
+    }
+    return items;
+}
+
 function getCookie(name) {
     const cookies = document.cookie.split('; ');
     for (const cookie of cookies) {
@@ -234,18 +269,30 @@ function setupPriceFilter() {
 /*
   fetchPlaces(token)
   GET /api/v1/places/ — public, token optionnel.
+  Prix et texte sont filtrés par l'API, pas dans le navigateur :
+  ?max_price= et, si une recherche est saisie, /places/search?q= (FTS5).
+  Une page de PAGE_SIZE places ; le bouton "Load more" charge la suivante.
 */
 async function fetchPlaces(token) {
     const list = document.getElementById('places-list');
     if (list) list.innerHTML = '<p class="loading-msg">Loading places...</p>';
+    setNextPlacesUrl(null);
+
+    const maxPrice   = document.getElementById('price-filter')?.value || 'all';
+    const searchText = (document.getElementById('search-input')?.value || '').trim();
+    const params     = new URLSearchParams({ limit: PAGE_SIZE });
+    if (maxPrice !== 'all') params.set('max_price', maxPrice);
+    if (searchText) params.set('q', searchText);
+    const endpoint = searchText ? 'places/search' : 'places/';
 
     const headers = token ? { 'Authorization': `Bearer ${token}` } : {};
     try {
-        const res = await fetch(`${API_URL}/places/`, { headers });
+        const res = await fetch(`${API_URL}/${endpoint}?${params}`, { headers });
         if (res.ok) {
             const places = await res.json();
             allPlaces = places;
             displayPlaces(places);
+            setNextPlacesUrl(nextPageUrl(res));
         } else {
             if (list) list.innerHTML = '<p class="no-places-msg">Unable to load places. Is the API running?</p>';
         }
@@ -254,6 +301,37 @@ async function fetchPlaces(token) {
     }
 }
 
+/*
+  loadMorePlaces(token)
+  Ajoute la page suivante des places (lien rel="next" de la précédente).
+*/
+async function loadMorePlaces(token) {
+    const url = nextPlacesUrl;
+    if (!url) return;
+    const headers = token ? { 'Authorization': `Bearer ${token}` } : {};
+    try {
+        const res = await fetch(url, { headers });
+        /* Filtres changés entre-temps : cette page ne compte plus */
+        if (url !== nextPlacesUrl) return;
+        if (!res.ok) { showToast('Unable to load more places.', 'error'); return; }
+        allPlaces = allPlaces.concat(await res.json());
+        displayPlaces(allPlaces);
+        setNextPlacesUrl(nextPageUrl(res));
+    } catch {
+        showToast('Cannot reach the API.', 'error');
+    }
+}
+
+/*
+  setNextPlacesUrl(url)
+  Mémorise la page suivante et affiche le bouton "Load more" s'il en reste une.
+*/
+function setNextPlacesUrl(url) {
+    nextPlacesUrl = url;
+    const button = document.getElementById('load-more');
+    if (button) button.style.display = url ? 'block' : 'none';
+}
+
 /*
   displayPlaces(places)
   Crée les div.place-card avec photo.
@@ -264,7 +342,10 @@ function displayPlaces(places) {
     list.innerHTML = '';
 
     if (places.length === 0) {
-        list.innerHTML = '<p class="no-places-msg">No places available.</p>';
+        const filtered = document.getElementById('search-input')?.value.trim()
+            || (document.getElementById('price-filter')?.value || 'all') !== 'all';
+        list.innerHTML = `<p class="no-places-msg">${filtered
+            ? 'No places match your criteria.' : 'No places available.'}</p>`;
         return;
     }
 
@@ -292,40 +373,8 @@ function displayPlaces(places) {
     });
 }
 
-/*
-  applyFilters()
-  Filtre par prix ET par texte — sans re-fetch.
-*/
-function applyFilters() {
-    const maxPrice   = document.getElementById('price-filter')?.value || 'all';
-    const searchText = (document.getElementById('search-input')?.value || '').toLowerCase().trim();
-    const cards      = document.querySelectorAll('.place-card');
-    let visible      = 0;
-
-    cards.forEach(card => {
-        const priceOk  = maxPrice === 'all' || parseFloat(card.dataset.price) <= parseFloat(maxPrice);
-        const searchOk = !searchText || (card.dataset.title || '').includes(searchText);
-        const show     = priceOk && searchOk;
-        card.style.display = show ? 'flex' : 'none';
-        if (show) visible++;
-    });
-
-    const list   = document.getElementById('places-list');
-    const oldMsg = list?.querySelector('.filter-empty');
-    if (visible === 0 && cards.length > 0) {
-        if (!oldMsg) {
-            const msg       = document.createElement('p');
-            msg.className   = 'no-places-msg filter-empty';
-            msg.textContent = 'No places match your criteria.';
-            list.appendChild(msg);
-        }
-    } else {
-        oldMsg?.remove();
-    }
-}
-
 /* Alias requis par certains correcteurs */
-function filterByPrice(maxPrice) { applyFilters(); }
+function filterByPrice(maxPrice) { fetchPlaces(getCookie('token')); }
 
 // ============================================================
 // TASK 3 — PLACE DETAILS
@@ -341,11 +390,10 @@ function checkAuthForPlacePage(placeId) {
 
 async function fetchPlaceDetails(token, placeId) {
     const headers = token ? { 'Authorization': `Bearer ${token}` } : {};
+    // One request: place, owner, amenities, reviews and their authors
+    const include = 'include=reviews,owner,amenities,review_authors&reviews_limit=100';
     try {
-        const [placeRes, reviewsRes] = await Promise.all([
-            fetch(`${API_URL}/places/${placeId}`,         { headers }),
-            fetch(`${API_URL}/places/${placeId}/reviews`, { headers })
-        ]);
+        const placeRes = await fetch(`${API_URL}/places/${placeId}?${include}`, { headers });
 
         if (!placeRes.ok) {
             const s = document.getElementById('place-details');
@@ -353,9 +401,8 @@ async function fetchPlaceDetails(token, placeId) {
             return;
         }
 
-        const place   = await placeRes.json();
-        const reviews = reviewsRes.ok ? await reviewsRes.json() : [];
-        displayPlaceDetails(place, reviews);
+        const place = await placeRes.json();
+        displayPlaceDetails(place, place.reviews || []);
     } catch {
         const s = document.getElementById('place-details');
         if (s) s.innerHTML = '<p style="color:#999;text-align:center;padding:40px">&#9888; Cannot reach the API.</p>';
@@ -410,19 +457,20 @@ function displayPlaceDetails(place, reviews) {
     `;
 
     if (reviewsSection) {
-        reviewsSection.innerHTML = `<h2>&#11088; Reviews (${reviews.length})</h2>`;
+        reviewsSection.innerHTML = `<h2>&#11088; Reviews (${place.review_count ?? reviews.length})</h2>`;
         if (reviews.length === 0) {
             reviewsSection.innerHTML += '<p style="color:#999;padding:10px 0">No reviews yet. Be the first!</p>';
         } else {
             reviews.forEach(r => {
                 const stars   = '&#9733;'.repeat(r.rating) + '&#9734;'.repeat(5 - r.rating);
-                const initial = (r.user_id || 'G').charAt(0).toUpperCase();
+                const author  = r.user ? `${r.user.first_name} ${r.user.last_name}` : 'Guest';
+                const initial = author.charAt(0).toUpperCase();
                 const card    = document.createElement('div');
                 card.className = 'review-card'; /* CLASSE OBLIGATOIRE */
                 card.innerHTML = `
                     <p class="reviewer-name">
                         <span class="reviewer-avatar" aria-hidden="true">${initial}</span>
-                        Guest
+                        ${author}
                     </p>
                     <p class="review-text">${r.text}</p>
                     <span class="stars" aria-label="${r.rating} stars">${stars}</span>
@@ -488,12 +536,12 @@ async function loadAmenitiesCheckboxes(token) {
 
     const headers = token ? { 'Authorization': `Bearer ${token}` } : {};
     try {
-        const res = await fetch(`${API_URL}/amenities/`, { headers });
-        if (!res.ok) {
+        /* Toutes les pages : une amenity absente ne pourrait pas être cochée */
+        const amenities = await fetchAllPages(`${API_URL}/amenities/?limit=${PAGE_SIZE}`, headers);
+        if (!amenities) {
             container.innerHTML = '<span class="field-hint">Could not load amenities.</span>';
             return;
         }
-        const amenities = await res.json();
 
         if (amenities.length === 0) {
             container.innerHTML = '<span class="field-hint">No amenities available.</span>';
@@ -583,8 +631,12 @@ document.addEventListener('DOMContentLoaded', () => {
         setupPriceFilter();
         fetchPlaces(token);
 
-        document.getElementById('price-filter')?.addEventListener('change', applyFilters);
-        document.getElementById('search-input')?.addEventListener('input',  applyFilters);
+        document.getElementById('load-more')?.addEventListener('click', () => loadMorePlaces(token));
+        document.getElementById('price-filter')?.addEventListener('change', () => fetchPlaces(token));
+        document.getElementById('search-input')?.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => fetchPlaces(token), SEARCH_DEBOUNCE_MS);
+        });
 
         /* Smooth scroll vers #search-section quand lien Search cliqué sur index.html */
         document.querySelectorAll('a[href="index.html#search-section"]').forEach(link => {